@@ -1,10 +1,171 @@
+import asyncio
 import sys
 import json
-import pandas as pd
 import os
-from phase2.recommender_core import filter_restaurants
-from phase4.ranking_engine import rank_restaurants
-from phase3.llm_engine import RecommendationEngine
+from phase1.data_loader import load_zomato_data
+from phase4.result_cube import load_result_cube, top_k_restaurants
+from phase7_serving.query_cache import QueryResultCache
+from phase3.llm_engine import get_shared_engine
+from phase3.blurb_store import load_blurb_store
+
+def load_dataset():
+    """
+    Loads the Zomato dataset (memory-mapped snapshot when available),
+    or returns None if Phase 1 has not been run.
+    """
+    return load_zomato_data(fetch_if_missing=False)
+
+def _rank(preferences, df, cube=None):
+    """Filter and rank (row ids only; only the top 5 shown to the LLM are ever sorted)."""
+    price = preferences.get('price')
+    location = preferences.get('location')
+    cuisine = preferences.get('cuisine')
+    rating = float(preferences.get('rating', 0))
+    return top_k_restaurants(df, 5, price=price, place=location, rating=rating, cuisine=cuisine, cube=cube)
+
+def format_results(ranked, blurbs=None):
+    """
+    Top 3 rows under the names the frontend expects (only the rendered rows are materialized).
+    Card descriptions come from the precomputed BlurbStore when one is available.
+    """
+    formatted_results = []
+    for res in ranked.head(3).to_records():
+        blurb = blurbs.get(res.get('restaurant name'), res.get('area')) if blurbs is not None else None
+        formatted_results.append({
+            "name": res.get('restaurant name'),
+            "location": res.get('area'),
+            "cuisines": res.get('cuisines type'),
+            "rate": f"{res.get('rate (out of 5)')}/5",
+            "approx_cost": str(res.get('avg cost (two people)')),
+            "description": blurb["text"] if blurb else "Recommended based on your preferences.", # Placeholder if no blurb
+            "description_source": blurb["source"] if blurb else "placeholder"
+        })
+    return formatted_results
+
+def _cache_key(preferences, df, cache):
+    if cache is None or df is None:
+        return None
+    return cache.make_key(preferences, df.attrs.get('dataset_version'))
+
+def _cache_response(cache, cache_key, ranked, response):
+    # Template fallbacks are not cached so the next request retries the LLM
+    if cache_key and response.get("ai_source") != "fallback":
+        cache.put(cache_key, ranked.row_ids if ranked is not None else [], response)
+
+def recommend(preferences, df, engine, cube=None, cache=None, blurbs=None):
+    """
+    Runs the filter -> rank -> LLM pipeline for a single preferences payload.
+    Returns the JSON-serializable response dict shared by the CLI and the warm server.
+    With a precomputed result `cube`, dropdown combinations skip filtering and ranking entirely;
+    with a `QueryResultCache`, repeated preferences skip the whole pipeline; with a `BlurbStore`,
+    cards get precomputed descriptions and the live LLM call is only the overall verdict.
+    """
+    cache_key = _cache_key(preferences, df, cache)
+    if cache_key:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached["response"]
+
+    # 1. Load Data
+    if df is None:
+        return {"error": "Dataset not found. Please run Phase 1."}
+
+    # 2 + 3. Filter and rank
+    ranked = _rank(preferences, df, cube)
+
+    if ranked.empty:
+        response = {"recommendations": [], "message": "No restaurants found matching your criteria."}
+        _cache_response(cache, cache_key, None, response)
+        return response
+
+    # 4. Get AI Insight (Top 3); "ai_source" says whether the LLM, its cache or the local template served it
+    insight = engine.explain(preferences, ranked.to_frame())
+
+    # 5. Format Output
+    # For simplicity, we return the formatted results and the raw AI insight as a separate field
+    response = {
+        "recommendations": format_results(ranked, blurbs),
+        "ai_insight": insight["text"],
+        "ai_source": insight["source"]
+    }
+    _cache_response(cache, cache_key, ranked, response)
+    return response
+
+async def recommend_async(preferences, df, engine, cube=None, cache=None, blurbs=None, timeout=None):
+    """
+    Async form of `recommend` for the serving layer, with an `AsyncRecommendationEngine`:
+    ranking runs on a worker thread, the LLM call is awaited under the engine's concurrency
+    limit and single-flight, and `timeout` is the per-request LLM deadline in seconds.
+    """
+    cache_key = _cache_key(preferences, df, cache)
+    if cache_key:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached["response"]
+
+    if df is None:
+        return {"error": "Dataset not found. Please run Phase 1."}
+
+    ranked = await asyncio.to_thread(_rank, preferences, df, cube)
+    if ranked.empty:
+        response = {"recommendations": [], "message": "No restaurants found matching your criteria."}
+        _cache_response(cache, cache_key, None, response)
+        return response
+
+    insight = await engine.explain(preferences, ranked.to_frame(), timeout=timeout)
+    response = {
+        "recommendations": format_results(ranked, blurbs),
+        "ai_insight": insight["text"],
+        "ai_source": insight["source"]
+    }
+    _cache_response(cache, cache_key, ranked, response)
+    return response
+
+def recommend_stream(preferences, df, engine, cube=None, cache=None, blurbs=None):
+    """
+    Streaming form of `recommend`. Yields (event, data) pairs:
+    "recommendations" as soon as ranking is done, one "token" per LLM chunk,
+    then "done" with the same dict `recommend` returns (or a single "error").
+    """
+    cache_key = _cache_key(preferences, df, cache)
+    cached = cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        response = cached["response"]
+        yield "recommendations", {"recommendations": response.get("recommendations", [])}
+        if response.get("ai_insight"):
+            yield "token", {"text": response["ai_insight"]}
+        yield "done", response
+        return
+
+    if df is None:
+        yield "error", {"error": "Dataset not found. Please run Phase 1."}
+        return
+
+    ranked = _rank(preferences, df, cube)
+    if ranked.empty:
+        response = {"recommendations": [], "message": "No restaurants found matching your criteria."}
+        _cache_response(cache, cache_key, None, response)
+        yield "done", response
+        return
+
+    # The cards can render before the first LLM token arrives
+    formatted_results = format_results(ranked, blurbs)
+    yield "recommendations", {"recommendations": formatted_results}
+
+    parts, source = [], "llm"
+    for chunk in engine.explain_stream(preferences, ranked.to_frame()):
+        parts.append(chunk["text"])
+        # Any fallback chunk means the text is not a complete LLM answer
+        source = chunk["source"] if source != "fallback" else source
+        yield "token", {"text": chunk["text"]}
+
+    response = {
+        "recommendations": formatted_results,
+        "ai_insight": "".join(parts),
+        "ai_source": source
+    }
+    _cache_response(cache, cache_key, ranked, response)
+    yield "done", response
 
 def main():
     # Read input from stdin (Next.js will pass preferences as JSON)
@@ -13,55 +174,16 @@ def main():
         if not input_data:
             print(json.dumps({"error": "No input data received"}))
             return
-            
-        preferences = json.loads(input_data)
-        price = preferences.get('price')
-        location = preferences.get('location')
-        cuisine = preferences.get('cuisine')
-        rating = float(preferences.get('rating', 0))
-
-        # 1. Load Data
-        if not os.path.exists("zomato_data.csv"):
-            print(json.dumps({"error": "Dataset not found. Please run Phase 1."}))
-            return
-        
-        df = pd.read_csv("zomato_data.csv")
-
-        # 2. Filter
-        filtered_df = filter_restaurants(df, price=price, place=location, rating=rating, cuisine=cuisine)
-        
-        if filtered_df.empty:
-            print(json.dumps({"recommendations": [], "message": "No restaurants found matching your criteria."}))
-            return
 
-        # 3. Rank
-        ranked_df = rank_restaurants(filtered_df)
-
-        # 4. Get AI Insight (Top 3)
-        engine = RecommendationEngine()
-        llm_response = engine.get_recommendations(str(preferences), ranked_df)
-
-        # 5. Format Output
-        top_results = ranked_df.head(3).to_dict(orient='records')
-        
-        # Mapping back to the names the frontend expects
-        formatted_results = []
-        for res in top_results:
-            formatted_results.append({
-                "name": res.get('restaurant name'),
-                "location": res.get('area'),
-                "cuisines": res.get('cuisines type'),
-                "rate": f"{res.get('rate (out of 5)')}/5",
-                "approx_cost": str(res.get('avg cost (two people)')),
-                "description": "Recommended based on your preferences." # Placeholder if LLM fails
-            })
-
-        # If LLM response is valid, we could potentially parse it or just include it as a separate field
-        # For simplicity, we'll return the formatted results and the raw AI insight
-        print(json.dumps({
-            "recommendations": formatted_results,
-            "ai_insight": llm_response
-        }))
+        preferences = json.loads(input_data)
+        # Created first so the Groq connection warms up while the dataset loads and ranking runs
+        engine = get_shared_engine()
+        df = load_dataset()
+        cube = load_result_cube(df) if df is not None else None
+        # One-shot processes can only share entries through the on-disk tier
+        cache_dir = os.getenv("RECOMMEND_CACHE_DIR")
+        cache = QueryResultCache(disk_dir=cache_dir) if cache_dir else None
+        print(json.dumps(recommend(preferences, df, engine, cube, cache, load_blurb_store())))
 
     except Exception as e:
         print(json.dumps({"error": str(e)}))
@@ -1,13 +1,24 @@
-import kagglehub
-from kagglehub import KaggleDatasetAdapter
 import pandas as pd
 import os
 
+try:
+    from phase1.normalize import normalize_dataset
+    from phase1.snapshot import SNAPSHOT_DIR, is_snapshot_fresh, load_snapshot, write_snapshot
+except ImportError:  # Running from inside phase1/
+    from normalize import normalize_dataset
+    from snapshot import SNAPSHOT_DIR, is_snapshot_fresh, load_snapshot, write_snapshot
+
+CSV_PATH = "zomato_data.csv"
+
 def load_zomato_data_kaggle():
     """
     Fetches the Zomato dataset from Kaggle using kagglehub.
-    Saves it as a CSV locally for Phase 2.
+    Saves it as a CSV locally for Phase 2, plus a columnar snapshot for fast loading.
     """
+    # Imported lazily so snapshot/CSV loaders don't pay for kagglehub at startup
+    import kagglehub
+    from kagglehub import KaggleDatasetAdapter
+
     print("Fetching dataset from Kaggle: abhijitdahatonde/zomato-restaurants-dataset...")
     try:
         # Load the latest version
@@ -16,11 +27,13 @@ def load_zomato_data_kaggle():
             "abhijitdahatonde/zomato-restaurants-dataset",
             "zomato.csv",  # Specifically looking for the main csv file
         )
-        
+
         # Save to current directory for consistency with previous phases
-        output_path = os.path.join(os.getcwd(), "zomato_data.csv")
+        output_path = os.path.join(os.getcwd(), CSV_PATH)
         df.to_csv(output_path, index=False)
-        
+        df = normalize_dataset(df)
+        write_snapshot(df, os.path.join(os.getcwd(), SNAPSHOT_DIR), source_csv=output_path)
+
         print(f"Dataset successfully saved to {output_path}")
         print(f"Total records loaded: {len(df)}")
         return df
@@ -33,11 +46,43 @@ def load_zomato_data_kaggle():
                 "abhijitdahatonde/zomato-restaurants-dataset",
                 "",
             )
-             output_path = os.path.join(os.getcwd(), "zomato_data.csv")
+             output_path = os.path.join(os.getcwd(), CSV_PATH)
              df.to_csv(output_path, index=False)
+             df = normalize_dataset(df)
+             write_snapshot(df, os.path.join(os.getcwd(), SNAPSHOT_DIR), source_csv=output_path)
              return df
         except:
             return None
 
+def read_zomato_csv(csv_path=CSV_PATH):
+    # Use encoding='utf-8' or 'latin-1' and handle errors to fix the garbage text
+    try:
+        return pd.read_csv(csv_path, encoding='utf-8')
+    except UnicodeDecodeError:
+        return pd.read_csv(csv_path, encoding='latin-1')
+
+def load_zomato_data(csv_path=CSV_PATH, snapshot_dir=SNAPSHOT_DIR, fetch_if_missing=True):
+    """
+    Shared loader for every consumer of the dataset.
+    Prefers the memory-mapped columnar snapshot; falls back to parsing the CSV once
+    (and writing the snapshot), and finally to fetching from Kaggle.
+    The returned frame is always normalized (see `phase1.normalize`).
+    """
+    if is_snapshot_fresh(snapshot_dir, source_csv=csv_path):
+        return normalize_dataset(load_snapshot(snapshot_dir))
+
+    if os.path.exists(csv_path):
+        df = normalize_dataset(read_zomato_csv(csv_path))
+        try:
+            write_snapshot(df, snapshot_dir, source_csv=csv_path)
+            return normalize_dataset(load_snapshot(snapshot_dir))
+        except OSError as e:
+            print(f"WARNING: Could not write dataset snapshot: {e}")
+            return df
+
+    if fetch_if_missing:
+        return load_zomato_data_kaggle()
+    return None
+
 if __name__ == "__main__":
     load_zomato_data_kaggle()
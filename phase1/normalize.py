@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Kaggle dataset columns
+COL_NAME = 'restaurant name'
+COL_RATE = 'rate (out of 5)'
+COL_VOTES = 'num of ratings'
+COL_COST = 'avg cost (two people)'
+COL_CUISINES = 'cuisines type'
+COL_AREA = 'area'
+
+# Derived column added at ingest (the price filter reads its codes)
+COL_PRICE_BUCKET = 'price bucket'
+
+# Simple price categories (Budget < 500, Mid 500-1500, Premium > 1500)
+PRICE_BUCKETS = ['budget', 'mid', 'premium']
+
+def clean_text(text):
+    """
+    Fixes garbage characters like CafÃ© and other encoding artifacts.
+    """
+    if not isinstance(text, str): return text
+    try:
+        if 'Ã' in text:
+            return text.encode('latin-1').decode('utf-8')
+    except: pass
+    return text.replace('ï¿½', '').strip()
+
+def split_cuisines(text):
+    if not isinstance(text, str):
+        return []
+    return [c.strip() for c in text.split(',') if c.strip()]
+
+def price_bucket(cost):
+    """
+    Maps cost-for-two values to the budget/mid/premium categories used by the filters.
+    """
+    cost = np.asarray(cost, dtype=float)
+    codes = np.where(cost < 500, 0, np.where(cost <= 1500, 1, 2))
+    return pd.Categorical.from_codes(codes, PRICE_BUCKETS)
+
+def _repair_text(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Repair each distinct value once instead of every row
+        return series.map(clean_text)
+    return series.map(clean_text, na_action='ignore')
+
+def is_normalized(df):
+    return bool(df.attrs.get('normalized')) and COL_PRICE_BUCKET in df.columns
+
+def normalize_dataset(df):
+    """
+    One-time ingest normalization so per-request code paths do no type coercion or text repair:
+    - numeric rating, cost and vote columns (missing/'NEW' values become 0)
+    - mojibake repair on restaurant names and cuisines
+    - precomputed price bucket (budget/mid/premium)
+    Cuisines are split per distinct value by `phase2.indexes.CuisineIndex`, not stored per row.
+    Frames that are already normalized (including loaded snapshots) are returned unchanged.
+    """
+    if is_normalized(df):
+        return df
+
+    out = df.copy(deep=False)
+    out[COL_RATE] = pd.to_numeric(out[COL_RATE], errors='coerce').fillna(0.0).astype(float)
+    cost = pd.to_numeric(out[COL_COST], errors='coerce').fillna(0.0).astype(float)
+    # Whole-rupee costs stay integers so they render as "700", not "700.0"
+    out[COL_COST] = cost.astype('int64') if (cost == cost.round()).all() else cost
+    if COL_VOTES in out.columns:
+        out[COL_VOTES] = pd.to_numeric(out[COL_VOTES], errors='coerce').fillna(0).astype('int64')
+    for col in [COL_NAME, COL_CUISINES]:
+        if col in out.columns:
+            out[col] = _repair_text(out[col])
+    out[COL_PRICE_BUCKET] = price_bucket(out[COL_COST].to_numpy())
+    out.attrs['normalized'] = True
+    return out
@@ -0,0 +1,120 @@
+import glob
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = "zomato_snapshot"
+META_FILE = "meta.json"
+
+def _source_signature(csv_path):
+    """
+    Size + mtime of the source CSV, used to detect a stale snapshot.
+    """
+    if not csv_path or not os.path.exists(csv_path):
+        return None
+    stat = os.stat(csv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def dataset_version(df):
+    """
+    Stable content hash of a DataFrame (used as the dataset version for caches).
+    """
+    hasher = hashlib.sha1()
+    hasher.update(json.dumps([str(c) for c in df.columns]).encode("utf-8"))
+    hasher.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return hasher.hexdigest()[:16]
+
+def write_snapshot(df, snapshot_dir=SNAPSHOT_DIR, source_csv=None, exclude=()):
+    """
+    Writes a typed columnar snapshot of the dataset.
+    Numeric columns are stored as raw `.npy` arrays; text columns are dictionary-encoded
+    (`.npy` integer codes + a JSON string dictionary) so they can be memory-mapped too.
+    Columns in `exclude` (e.g. derived list columns) are left out.
+    Column files are named after the dataset version and never rewritten in place: processes
+    that still map an older snapshot keep reading its (unlinked) files instead of crashing.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    names = [name for name in df.columns if name not in exclude]
+    version = dataset_version(df[names])
+    previous = read_snapshot_meta(snapshot_dir)
+    columns = []
+    for i, name in enumerate(df.columns):
+        if name in exclude:
+            continue
+        series = df[name]
+        entry = {"name": str(name), "file": f"col_{i:03d}-{version}.npy"}
+        if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+            entry["kind"] = "numeric"
+            values = series.to_numpy()
+        else:
+            entry["kind"] = "dict"
+            categorical = pd.Categorical(series.map(str, na_action='ignore'))
+            entry["dictionary"] = [str(c) for c in categorical.categories]
+            values = categorical.codes
+        # Same version means same bytes, but truncating a mapped file would still crash its readers
+        column_path = os.path.join(snapshot_dir, entry["file"])
+        with open(column_path + ".tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(values))
+        os.replace(column_path + ".tmp", column_path)
+        columns.append(entry)
+
+    meta = {
+        "rows": len(df),
+        "version": version,
+        "source": _source_signature(source_csv),
+        "attrs": {k: v for k, v in df.attrs.items() if isinstance(v, (str, int, float, bool))},
+        "columns": columns,
+    }
+    # meta.json is written last (atomically) so a half-written snapshot is never loaded
+    tmp_path = os.path.join(snapshot_dir, META_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(snapshot_dir, META_FILE))
+
+    # Keep the previous generation for readers that read its meta.json just before the swap
+    keep = {c["file"] for c in columns + (previous or {}).get("columns", [])}
+    for path in glob.glob(os.path.join(snapshot_dir, "col_*.npy")):
+        if os.path.basename(path) not in keep:
+            os.remove(path)
+    return meta
+
+def read_snapshot_meta(snapshot_dir=SNAPSHOT_DIR):
+    meta_path = os.path.join(snapshot_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def is_snapshot_fresh(snapshot_dir=SNAPSHOT_DIR, source_csv=None):
+    meta = read_snapshot_meta(snapshot_dir)
+    if meta is None:
+        return False
+    # A snapshot without a reachable source CSV is trusted as-is
+    current = _source_signature(source_csv)
+    return current is None or meta.get("source") == current
+
+def load_snapshot(snapshot_dir=SNAPSHOT_DIR, mmap=True):
+    """
+    Loads the columnar snapshot as a DataFrame backed by memory-mapped arrays.
+    Processes that load the same snapshot share its pages through the OS page cache.
+    Returns None if no snapshot exists.
+    """
+    meta = read_snapshot_meta(snapshot_dir)
+    if meta is None:
+        return None
+
+    mmap_mode = "r" if mmap else None
+    data = {}
+    for entry in meta["columns"]:
+        values = np.load(os.path.join(snapshot_dir, entry["file"]), mmap_mode=mmap_mode)
+        if entry["kind"] == "dict":
+            data[entry["name"]] = pd.Categorical.from_codes(values, entry["dictionary"], validate=False)
+        else:
+            data[entry["name"]] = values
+
+    df = pd.DataFrame(data, copy=False)
+    df.attrs.update(meta.get("attrs", {}))
+    df.attrs["dataset_version"] = meta["version"]
+    return df
@@ -1,7 +1,11 @@
 import unittest
 import os
+import tempfile
+import numpy as np
 import pandas as pd
 from data_loader import load_zomato_data
+from snapshot import read_snapshot_meta, write_snapshot, load_snapshot
+from normalize import normalize_dataset
 
 class TestPhase1(unittest.TestCase):
     def test_data_loading(self):
@@ -15,5 +19,56 @@ class TestPhase1(unittest.TestCase):
         self.assertGreater(len(df_loaded), 0, "Dataset should have records")
         print("Phase 1 Test Passed: Data loaded and verified.")
 
+    def test_snapshot_round_trip(self):
+        """Test that the columnar snapshot reloads the same data via memory-mapping."""
+        df = pd.DataFrame({
+            'restaurant name': ['Empire', 'Truffles', None],
+            'rate (out of 5)': ['4.1', 'NEW', '3.9'],
+            'num of ratings': [1200, 15, 300],
+        })
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            write_snapshot(df, snapshot_dir)
+            loaded = load_snapshot(snapshot_dir)
+            self.assertEqual(list(loaded.columns), list(df.columns))
+            column_file = read_snapshot_meta(snapshot_dir)["columns"][2]["file"]
+            self.assertIsInstance(np.load(os.path.join(snapshot_dir, column_file), mmap_mode="r"), np.memmap)
+            self.assertEqual(loaded['num of ratings'].tolist(), [1200, 15, 300])
+            self.assertEqual(loaded['rate (out of 5)'].astype(object).tolist(), ['4.1', 'NEW', '3.9'])
+            self.assertTrue(pd.isna(loaded['restaurant name'].iloc[2]))
+            self.assertIn('dataset_version', loaded.attrs)
+
+            # Rewriting the snapshot leaves mapped arrays of the old one readable
+            write_snapshot(df.assign(**{'num of ratings': [1, 2, 3]}), snapshot_dir)
+            write_snapshot(df.assign(**{'num of ratings': [4, 5, 6]}), snapshot_dir)
+            self.assertEqual(loaded['num of ratings'].tolist(), [1200, 15, 300])
+            self.assertEqual(load_snapshot(snapshot_dir)['num of ratings'].tolist(), [4, 5, 6])
+            self.assertEqual(len([f for f in os.listdir(snapshot_dir) if f.endswith(".npy")]), 6)
+            del loaded
+        print("Phase 1 Test Passed: Snapshot round trip verified.")
+
+    def test_normalization(self):
+        """Test the one-time ingest normalization stage."""
+        df = pd.DataFrame({
+            'restaurant name': ['CafÃ© Noir', 'Empire'],
+            'rate (out of 5)': ['NEW', '4.1'],
+            'num of ratings': ['12', None],
+            'avg cost (two people)': ['450', '1600'],
+            'cuisines type': ['CafÃ©, Desserts', 'North Indian, Kebab'],
+        })
+        normalized = normalize_dataset(df)
+        self.assertEqual(normalized['rate (out of 5)'].tolist(), [0.0, 4.1])
+        self.assertEqual(normalized['num of ratings'].tolist(), [12, 0])
+        self.assertEqual(normalized['restaurant name'].tolist(), ['Café Noir', 'Empire'])
+        self.assertEqual(normalized['price bucket'].astype(str).tolist(), ['budget', 'premium'])
+        self.assertIs(normalize_dataset(normalized), normalized)
+        # The snapshot keeps every derived column, so a loaded snapshot needs no per-call work
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            write_snapshot(normalized, snapshot_dir)
+            loaded = load_snapshot(snapshot_dir)
+            self.assertIs(normalize_dataset(loaded), loaded)
+            self.assertEqual(loaded['price bucket'].astype(str).tolist(), ['budget', 'premium'])
+            del loaded
+        print("Phase 1 Test Passed: Normalization verified.")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,238 @@
+import weakref
+import numpy as np
+import pandas as pd
+from phase1.normalize import COL_AREA, COL_CUISINES, COL_PRICE_BUCKET, PRICE_BUCKETS, split_cuisines
+
+ROW_ID_DTYPE = np.int32
+EMPTY_ROWS = np.empty(0, dtype=ROW_ID_DTYPE)
+
+def normalize_token(text):
+    return " ".join(str(text).lower().split())
+
+def _rows_by_value(series):
+    """
+    Groups row positions by distinct value of `series`.
+    Returns (distinct values, list of sorted row-id arrays), factorizing once.
+    """
+    categorical = pd.Categorical(series)
+    codes = np.asarray(categorical.codes)
+    order = np.argsort(codes, kind="stable").astype(ROW_ID_DTYPE)
+    bounds = np.searchsorted(codes[order], np.arange(len(categorical.categories) + 1))
+    groups = [order[bounds[i]:bounds[i + 1]] for i in range(len(categorical.categories))]
+    return list(categorical.categories), groups
+
+class CuisineIndex:
+    """
+    Inverted index from each normalized cuisine token to a sorted row-id array.
+    Cuisine lookups become set operations instead of a regex scan over every row.
+    """
+
+    def __init__(self, cuisines_series):
+        postings = {}
+        self.display_names = {}
+        values, groups = _rows_by_value(cuisines_series)
+        for value, rows in zip(values, groups):
+            for cuisine in split_cuisines(value):
+                token = normalize_token(cuisine)
+                self.display_names.setdefault(token, cuisine)
+                postings.setdefault(token, []).append(rows)
+        self.postings = {token: np.sort(np.concatenate(parts)) for token, parts in postings.items()}
+
+    @property
+    def vocabulary(self):
+        """Sorted display names of every cuisine in the index."""
+        return sorted(self.display_names.values())
+
+    def resolve(self, cuisine):
+        """
+        Maps a user cuisine string to every index token containing it, so "Chinese" also
+        matches "Indo Chinese" (the old case-insensitive substring semantics, over the vocabulary only).
+        """
+        token = normalize_token(cuisine)
+        return [t for t in self.postings if token in t]
+
+    def posting_groups(self, cuisines, mode="any"):
+        """
+        The sorted posting arrays behind `lookup(cuisines, mode)`, unmerged: a row matches when it
+        is in some posting of every group. Lets a planner probe candidates without a merge.
+        """
+        if isinstance(cuisines, str):
+            cuisines = split_cuisines(cuisines)
+        groups = [[self.postings[t] for t in self.resolve(c)] for c in cuisines]
+        if mode == "all":
+            return groups
+        return [[rows for group in groups for rows in group]]
+
+    def rows(self, cuisine):
+        tokens = self.resolve(cuisine)
+        if not tokens:
+            return EMPTY_ROWS
+        if len(tokens) == 1:
+            return self.postings[tokens[0]]
+        return np.unique(np.concatenate([self.postings[t] for t in tokens]))
+
+    def estimate(self, cuisines, mode="any"):
+        """Upper bound on matching rows, from posting sizes alone."""
+        if isinstance(cuisines, str):
+            cuisines = split_cuisines(cuisines)
+        sizes = [sum(len(self.postings[t]) for t in self.resolve(c)) for c in cuisines]
+        if not sizes:
+            return 0
+        return min(sizes) if mode == "all" else sum(sizes)
+
+    def lookup(self, cuisines, mode="any"):
+        """
+        Sorted row ids serving any (OR) or all (AND) of the given cuisines.
+        `cuisines` may be a single name, a comma-separated string or a list.
+        """
+        if isinstance(cuisines, str):
+            cuisines = split_cuisines(cuisines)
+        row_sets = [self.rows(c) for c in cuisines]
+        if not row_sets:
+            return EMPTY_ROWS
+        result = row_sets[0]
+        for rows in row_sets[1:]:
+            if mode == "all":
+                result = np.intersect1d(result, rows, assume_unique=True)
+            else:
+                result = np.union1d(result, rows)
+        return result
+
+def _ngrams(text, n=3):
+    padded = f"  {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+class LocationIndex:
+    """
+    Index over the distinct `area` values.
+    Resolves a place by exact name, then by prefix (trie), then by trigram fuzzy match,
+    and maps each area to its sorted row-id array so the raw column is never scanned.
+    """
+
+    def __init__(self, area_series, fuzzy_threshold=0.5):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.areas, self.area_rows = _rows_by_value(area_series)
+        self.exact = {}
+        self.trie = {}
+        self.gram_postings = {}
+        self.gram_counts = []
+        for area_id, area in enumerate(self.areas):
+            token = normalize_token(area)
+            self.exact[token] = area_id
+            node = self.trie
+            for ch in token:
+                node = node.setdefault(ch, {})
+                node.setdefault("", []).append(area_id)
+            grams = _ngrams(token)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.gram_postings.setdefault(gram, []).append(area_id)
+
+    def prefix(self, text):
+        node = self.trie
+        for ch in normalize_token(text):
+            node = node.get(ch)
+            if node is None:
+                return []
+        return list(node.get("", []))
+
+    def fuzzy(self, text):
+        """Area ids with the best trigram Dice similarity above the threshold (typo tolerance)."""
+        grams = _ngrams(normalize_token(text))
+        shared = {}
+        for gram in grams:
+            for area_id in self.gram_postings.get(gram, ()):
+                shared[area_id] = shared.get(area_id, 0) + 1
+        scores = {a: 2.0 * n / (len(grams) + self.gram_counts[a]) for a, n in shared.items()}
+        if not scores:
+            return []
+        best = max(scores.values())
+        if best < self.fuzzy_threshold:
+            return []
+        return [a for a, s in scores.items() if s == best]
+
+    def _area_ids(self, place):
+        token = normalize_token(place)
+        if token in self.exact:
+            return [self.exact[token]]
+        return self.prefix(token) or self.fuzzy(token)
+
+    def estimate(self, place):
+        return sum(len(self.area_rows[a]) for a in self._area_ids(place))
+
+    def resolve(self, place):
+        """Matching area names for a user-supplied place string."""
+        return [self.areas[a] for a in self._area_ids(place)]
+
+    def postings(self, place):
+        """Sorted row-id arrays of every area matching `place` (their union is `rows(place)`)."""
+        return [self.area_rows[a] for a in self._area_ids(place)]
+
+    def rows(self, place):
+        area_ids = self._area_ids(place)
+        if not area_ids:
+            return EMPTY_ROWS
+        if len(area_ids) == 1:
+            return self.area_rows[area_ids[0]]
+        return np.sort(np.concatenate([self.area_rows[a] for a in area_ids]))
+
+class SortedColumnIndex:
+    """
+    Presorted copy of a numeric column.
+    Range predicates become two binary searches (`np.searchsorted`) over the sorted values,
+    and the selectivity of any range is known exactly in O(log N).
+    """
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=float)
+        self.order = np.argsort(self.values, kind="stable").astype(ROW_ID_DTYPE)
+        self.sorted_values = self.values[self.order]
+
+    def _bounds(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        start = 0 if low is None else np.searchsorted(self.sorted_values, low, "left" if low_inclusive else "right")
+        stop = len(self.sorted_values) if high is None else np.searchsorted(self.sorted_values, high, "right" if high_inclusive else "left")
+        return start, max(start, stop)
+
+    def count(self, **bounds):
+        start, stop = self._bounds(**bounds)
+        return stop - start
+
+    def rows(self, **bounds):
+        """Sorted row ids whose value lies in the range."""
+        start, stop = self._bounds(**bounds)
+        return np.sort(self.order[start:stop])
+
+    def probe(self, rows, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        """Subset of `rows` whose value lies in the range (cheaper than `rows()` for small inputs)."""
+        values = self.values[rows]
+        keep = np.ones(len(rows), dtype=bool)
+        if low is not None:
+            keep &= values >= low if low_inclusive else values > low
+        if high is not None:
+            keep &= values <= high if high_inclusive else values < high
+        return rows[keep]
+
+# Indexes are built once per base frame and dropped when the frame is garbage collected
+_INDEX_CACHE = {}
+
+def _cached(df, kind, build):
+    key = (id(df), kind)
+    entry = _INDEX_CACHE.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    index = build()
+    _INDEX_CACHE[key] = (weakref.ref(df, lambda _: _INDEX_CACHE.pop(key, None)), index)
+    return index
+
+def get_cuisine_index(df):
+    return _cached(df, "cuisine", lambda: CuisineIndex(df[COL_CUISINES]))
+
+def get_location_index(df):
+    return _cached(df, "location", lambda: LocationIndex(df[COL_AREA]))
+
+def get_sorted_index(df, column):
+    return _cached(df, ("sorted", column), lambda: SortedColumnIndex(df[column].to_numpy()))
+
+def get_price_bucket_index(df):
+    """Sorted index over the ingest-time price bucket codes (positions in PRICE_BUCKETS)."""
+    return _cached(df, "price bucket", lambda: SortedColumnIndex(pd.Categorical(df[COL_PRICE_BUCKET], categories=PRICE_BUCKETS).codes))
@@ -0,0 +1,94 @@
+import numpy as np
+from phase1.normalize import COL_RATE, PRICE_BUCKETS
+from phase2.indexes import ROW_ID_DTYPE, get_cuisine_index, get_location_index, get_price_bucket_index, get_sorted_index
+
+def price_bucket_bounds(bucket):
+    """Range over the price bucket index selecting one bucket ('budget', 'mid' or 'premium')."""
+    code = PRICE_BUCKETS.index(bucket)
+    return dict(low=code, high=code)
+
+def _contains(sorted_rows, candidates):
+    """Mask of the `candidates` present in `sorted_rows`: one binary search per candidate."""
+    if not len(sorted_rows):
+        return np.zeros(len(candidates), dtype=bool)
+    pos = np.minimum(np.searchsorted(sorted_rows, candidates), len(sorted_rows) - 1)
+    return sorted_rows[pos] == candidates
+
+class SetPredicate:
+    """Predicate answered by an inverted index (place, cuisine)."""
+
+    def __init__(self, name, estimate, fetch, posting_groups):
+        self.name = name
+        self.estimate = estimate
+        self._fetch = fetch
+        # Groups of sorted postings: a row matches if it is in some posting of every group
+        self._posting_groups = posting_groups
+
+    def rows(self):
+        return self._fetch()
+
+    def apply(self, candidates):
+        # Probing the candidates is O(k log n); intersecting with the postings would be O(posting size)
+        keep = np.ones(len(candidates), dtype=bool)
+        for group in self._posting_groups():
+            found = np.zeros(len(candidates), dtype=bool)
+            for rows in group:
+                found |= _contains(rows, candidates)
+            keep &= found
+        return candidates[keep]
+
+class RangePredicate:
+    """Predicate answered by a presorted numeric column (rating, cost)."""
+
+    def __init__(self, name, index, bounds):
+        self.name = name
+        self.index = index
+        self.bounds = bounds
+        self.estimate = index.count(**bounds)
+
+    def rows(self):
+        return self.index.rows(**self.bounds)
+
+    def apply(self, candidates):
+        # Probing the candidates is O(k); fetching the whole range would be O(range size)
+        return self.index.probe(candidates, **self.bounds)
+
+def plan_query(df, price=None, place=None, rating=0.0, cuisine=None, cuisine_match='any'):
+    """
+    Builds the predicates for a query and orders them by estimated selectivity
+    (most selective first), using the precomputed index statistics.
+    `df` must be the normalized base frame.
+    """
+    predicates = []
+    if place:
+        location_index = get_location_index(df)
+        predicates.append(SetPredicate('place', location_index.estimate(place), lambda: location_index.rows(place),
+                                       lambda: [location_index.postings(place)]))
+    if cuisine:
+        cuisine_index = get_cuisine_index(df)
+        predicates.append(SetPredicate('cuisine', cuisine_index.estimate(cuisine, cuisine_match),
+                                       lambda: cuisine_index.lookup(cuisine, mode=cuisine_match),
+                                       lambda: cuisine_index.posting_groups(cuisine, mode=cuisine_match)))
+    if rating > 0:
+        predicates.append(RangePredicate('rating', get_sorted_index(df, COL_RATE), dict(low=rating)))
+    if price and price.lower() in PRICE_BUCKETS:
+        predicates.append(RangePredicate('price', get_price_bucket_index(df), price_bucket_bounds(price.lower())))
+    return sorted(predicates, key=lambda p: p.estimate)
+
+def execute_plan(predicates, n_rows):
+    """
+    Evaluates the plan as row-id set intersections, starting from the most selective
+    predicate and stopping early once the candidate set is empty.
+    Returns sorted row ids.
+    """
+    if not predicates:
+        return np.arange(n_rows, dtype=ROW_ID_DTYPE)
+    candidates = predicates[0].rows()
+    for predicate in predicates[1:]:
+        if len(candidates) == 0:
+            break
+        candidates = predicate.apply(candidates)
+    return candidates
+
+def query_row_ids(df, price=None, place=None, rating=0.0, cuisine=None, cuisine_match='any'):
+    return execute_plan(plan_query(df, price, place, rating, cuisine, cuisine_match), len(df))
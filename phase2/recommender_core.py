@@ -1,68 +1,53 @@
-import pandas as pd
-import os
+import numpy as np
+from phase1.normalize import normalize_dataset
+from phase2.indexes import get_sorted_index
+from phase2.query_planner import query_row_ids
+from phase2.result_set import ResultSet
 
-def filter_restaurants(df, price=None, place=None, rating=0.0, cuisine=None):
+def query_restaurants(df, price=None, place=None, rating=0.0, cuisine=None, cuisine_match='any'):
     """
-    Filters the Zomato dataset (Kaggle version) based on user preferences.
+    Copy-free filtering: returns a ResultSet of matching row ids over the shared base table.
+    Expects a frame normalized at ingest (see `phase1.normalize`); raw frames are normalized first.
+    `cuisine` may be one cuisine, a comma-separated string or a list, combined with
+    `cuisine_match='any'` (OR) or `'all'` (AND).
     """
-    filtered_df = df.copy()
-    
-    # Mapping for Kaggle dataset columns
-    col_rate = 'rate (out of 5)'
-    col_cost = 'avg cost (two people)'
-    col_location = 'area'
-    col_cuisines = 'cuisines type'
-    col_name = 'restaurant name'
+    base_df = normalize_dataset(df)
 
-    # Ensure numerical columns are clean (Kaggle dataset is already cleaner)
-    # But we'll handle any NAs just in case
-    filtered_df[col_rate] = pd.to_numeric(filtered_df[col_rate], errors='coerce').fillna(0.0)
-    filtered_df[col_cost] = pd.to_numeric(filtered_df[col_cost], errors='coerce').fillna(0.0)
+    # The planner applies the most selective index first and intersects row-id sets
+    rows = query_row_ids(base_df, price=price, place=place, rating=rating, cuisine=cuisine, cuisine_match=cuisine_match)
+    return ResultSet(base_df, rows)
 
-    # Apply Filters
-    if place:
-        filtered_df = filtered_df[filtered_df[col_location].str.contains(place, case=False, na=False)]
-    
-    if cuisine:
-        filtered_df = filtered_df[filtered_df[col_cuisines].str.contains(cuisine, case=False, na=False)]
-        
-    if rating > 0:
-        filtered_df = filtered_df[filtered_df[col_rate] >= rating]
-        
-    if price:
-        # Simple price categories (Budget < 500, Mid 500-1500, Premium > 1500)
-        if price.lower() == 'budget':
-            filtered_df = filtered_df[filtered_df[col_cost] < 500]
-        elif price.lower() == 'mid':
-            filtered_df = filtered_df[(filtered_df[col_cost] >= 500) & (filtered_df[col_cost] <= 1500)]
-        elif price.lower() == 'premium':
-            filtered_df = filtered_df[filtered_df[col_cost] > 1500]
-
-    return filtered_df
+def filter_restaurants(df, price=None, place=None, rating=0.0, cuisine=None, cuisine_match='any'):
+    """
+    Filters the Zomato dataset (Kaggle version) based on user preferences.
+    DataFrame wrapper around `query_restaurants`; the frame is materialized once, for the final rows.
+    """
+    return query_restaurants(df, price, place, rating, cuisine, cuisine_match).to_frame()
 
-def get_trending_restaurants(df, top_n=10, min_ratings=500):
+def query_trending_restaurants(df, top_n=10, min_ratings=500):
     """
     Identifies trending restaurants based on high ratings and a significant number of votes.
+    Returns a ResultSet; only the candidate rows' rating/vote values are gathered.
     """
-    trending_df = df.copy()
+    base_df = normalize_dataset(df)
     col_rate = 'rate (out of 5)'
     col_votes = 'num of ratings'
     
-    # Ensure numeric types
-    trending_df[col_rate] = pd.to_numeric(trending_df[col_rate], errors='coerce').fillna(0.0)
-    trending_df[col_votes] = pd.to_numeric(trending_df[col_votes], errors='coerce').fillna(0)
-    
     # Filter for minimum votes to ensure popularity
-    trending_df = trending_df[trending_df[col_votes] >= min_ratings]
-    
-    # Sort by rating and then by votes
-    trending_df = trending_df.sort_values(by=[col_rate, col_votes], ascending=[False, False])
+    candidates = ResultSet(base_df, get_sorted_index(base_df, col_votes).rows(low=min_ratings))
     
-    return trending_df.head(top_n)
+    # Sort by rating and then by votes (stable, so ties keep dataset order)
+    order = np.lexsort((-candidates.column(col_votes), -candidates.column(col_rate)))
+    return candidates.take(order[:top_n])
+
+def get_trending_restaurants(df, top_n=10, min_ratings=500):
+    return query_trending_restaurants(df, top_n, min_ratings).to_frame()
 
 if __name__ == "__main__":
-    if os.path.exists("zomato_data.csv"):
-        df = pd.read_csv("zomato_data.csv")
+    from phase1.data_loader import load_zomato_data
+
+    df = load_zomato_data(fetch_if_missing=False)
+    if df is not None:
         results = filter_restaurants(df, place="BTM", cuisine="North Indian", rating=4.0)
         print(f"Found {len(results)} restaurants matching criteria.")
         if not results.empty:
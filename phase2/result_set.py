@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from phase2.indexes import ROW_ID_DTYPE
+
+class ResultSet:
+    """
+    Lightweight query result over a shared base table.
+    Carries row ids plus any computed per-row arrays (e.g. scores); base-table columns
+    are only gathered, and a DataFrame only built, for the rows actually rendered.
+    """
+
+    def __init__(self, base, row_ids, arrays=None):
+        self.base = base
+        self.row_ids = np.asarray(row_ids, dtype=ROW_ID_DTYPE)
+        self.arrays = arrays or {}
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    @property
+    def empty(self):
+        return len(self.row_ids) == 0
+
+    def column(self, name):
+        """Values of a base or computed column for the rows in this set."""
+        if name in self.arrays:
+            return self.arrays[name]
+        return self.base[name].to_numpy()[self.row_ids]
+
+    def with_arrays(self, **arrays):
+        return ResultSet(self.base, self.row_ids, {**self.arrays, **arrays})
+
+    def take(self, positions):
+        """Subset (or reordering) by position within this set."""
+        positions = np.asarray(positions)
+        return ResultSet(self.base, self.row_ids[positions],
+                         {name: values[positions] for name, values in self.arrays.items()})
+
+    def head(self, k):
+        return self.take(np.arange(min(k, len(self))))
+
+    def to_frame(self, columns=None):
+        """Materializes the rows (and computed arrays) as a DataFrame indexed by base row labels."""
+        if len(self.row_ids) == len(self.base) and (self.row_ids == np.arange(len(self.base))).all():
+            # Whole table: shallow copy, no data is copied and the base frame can't be mutated
+            frame = self.base.copy(deep=False)
+        else:
+            frame = self.base.iloc[self.row_ids]
+        if columns is not None:
+            frame = frame[[c for c in columns if c in frame.columns]]
+        if self.arrays:
+            frame = frame.assign(**{name: values for name, values in self.arrays.items()})
+        return frame
+
+    def to_records(self, columns=None):
+        return self.to_frame(columns).to_dict(orient='records')
+
+    def __repr__(self):
+        return f"ResultSet(rows={len(self)}, arrays={list(self.arrays)})"
+
+def as_result_set(obj):
+    """Accepts either a ResultSet or a DataFrame (wrapped as a set over all of its rows)."""
+    if isinstance(obj, pd.DataFrame):
+        return ResultSet(obj, np.arange(len(obj), dtype=ROW_ID_DTYPE))
+    return obj
@@ -1,14 +1,12 @@
 import unittest
-import pandas as pd
-import os
+from phase1.data_loader import load_zomato_data
 from recommender_core import filter_restaurants, get_trending_restaurants
 
 class TestPhase2(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        if os.path.exists("zomato_data.csv"):
-            cls.df = pd.read_csv("zomato_data.csv")
-        else:
+        cls.df = load_zomato_data(fetch_if_missing=False)
+        if cls.df is None:
             raise FileNotFoundError("Run Phase 1 test first to generate data.")
 
     def test_filtering_by_place(self):
@@ -0,0 +1,68 @@
+import unittest
+import pandas as pd
+from indexes import CuisineIndex, LocationIndex
+from recommender_core import filter_restaurants
+from query_planner import plan_query, query_row_ids
+from phase1.normalize import normalize_dataset
+
+class TestIndexes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = pd.DataFrame([
+            {'restaurant name': 'Empire', 'area': 'Koramangala 5th Block', 'cuisines type': 'North Indian, Kebab', 'rate (out of 5)': 4.1, 'num of ratings': 900, 'avg cost (two people)': 700},
+            {'restaurant name': 'Truffles', 'area': 'Koramangala 7th Block', 'cuisines type': 'Cafe, Burger', 'rate (out of 5)': 4.6, 'num of ratings': 1500, 'avg cost (two people)': 900},
+            {'restaurant name': 'Meghana', 'area': 'Indiranagar', 'cuisines type': 'Biryani, North Indian', 'rate (out of 5)': 4.4, 'num of ratings': 3000, 'avg cost (two people)': 600},
+            {'restaurant name': 'Third Wave', 'area': 'Bellandur', 'cuisines type': 'Cafe', 'rate (out of 5)': 'NEW', 'num of ratings': 0, 'avg cost (two people)': 400},
+        ])
+
+    def test_cuisine_index_set_operations(self):
+        index = CuisineIndex(self.df['cuisines type'])
+        self.assertEqual(index.lookup('cafe').tolist(), [1, 3])
+        self.assertEqual(index.lookup(['North Indian', 'Cafe']).tolist(), [0, 1, 2, 3])
+        self.assertEqual(index.lookup(['North Indian', 'Biryani'], mode='all').tolist(), [2])
+        # Partial names still resolve through the vocabulary, but never to unrelated rows
+        self.assertEqual(index.lookup('Indian').tolist(), [0, 2])
+        self.assertEqual(index.lookup('MarsFood').tolist(), [])
+        # An exact cuisine still matches the cuisines that contain it, like str.contains did
+        chinese = CuisineIndex(pd.Series(['Chinese', 'Indo Chinese, Momos', 'Cafe']))
+        self.assertEqual(chinese.lookup('Chinese').tolist(), [0, 1])
+        self.assertEqual(chinese.lookup('Indo Chinese').tolist(), [1])
+        self.assertIn('Kebab', index.vocabulary)
+
+    def test_location_index_matching(self):
+        index = LocationIndex(self.df['area'])
+        self.assertEqual(index.resolve('indiranagar'), ['Indiranagar'])
+        self.assertEqual(index.resolve('Koramangala'), ['Koramangala 5th Block', 'Koramangala 7th Block'])
+        self.assertEqual(index.rows('Koramangala').tolist(), [0, 1])
+        # Typo tolerance through trigram similarity
+        self.assertEqual(index.resolve('Indranagar'), ['Indiranagar'])
+        # No more arbitrary substring matches
+        self.assertEqual(index.resolve('Block'), [])
+        self.assertEqual(index.rows('NonExistentPlace').tolist(), [])
+
+    def test_planner_orders_by_selectivity(self):
+        df = normalize_dataset(self.df)
+        plan = plan_query(df, place='Indiranagar', rating=4.0, price='mid')
+        self.assertEqual([p.name for p in plan], ['place', 'rating', 'price'])
+        self.assertEqual(query_row_ids(df, place='Koramangala', rating=4.0, price='mid').tolist(), [0, 1])
+        self.assertEqual(query_row_ids(df, price='budget').tolist(), [3])
+        self.assertEqual(query_row_ids(df).tolist(), [0, 1, 2, 3])
+        # Later set predicates probe the candidates against their postings
+        plan = plan_query(df, price='mid', cuisine='Cafe, Indian')
+        self.assertEqual([p.name for p in plan], ['price', 'cuisine'])
+        self.assertEqual(plan[1].apply(plan[0].rows()).tolist(), [0, 1, 2])
+        self.assertEqual(query_row_ids(df, place='Indiranagar', cuisine='North Indian, Biryani', cuisine_match='all').tolist(), [2])
+        self.assertEqual(query_row_ids(df, place='Indiranagar', cuisine='North Indian, Kebab', cuisine_match='all').tolist(), [])
+        self.assertEqual(query_row_ids(df, price='budget', place='Koramangala').tolist(), [])
+
+    def test_filter_uses_cuisine_index(self):
+        results = filter_restaurants(self.df, cuisine='Cafe', rating=4.0)
+        self.assertEqual(results['restaurant name'].tolist(), ['Truffles'])
+        results = filter_restaurants(self.df, cuisine='North Indian, Kebab', cuisine_match='all')
+        self.assertEqual(results['restaurant name'].tolist(), ['Empire'])
+        results = filter_restaurants(self.df, place='Koramangala', cuisine='Cafe')
+        self.assertEqual(results['restaurant name'].tolist(), ['Truffles'])
+        print("Phase 2 Test Passed: Cuisine and location indexes verified.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,18 @@
-import pandas as pd
 import os
 import sys
 
 # Add project root to path to import local modules
 sys.path.append(os.getcwd())
 
+from phase1.data_loader import load_zomato_data
 from phase2.recommender_core import filter_restaurants
 
 def run_verification():
     print("--- Phase 2: Robust Filter Verification ---")
-    if not os.path.exists("zomato_data.csv"):
+    df = load_zomato_data(fetch_if_missing=False)
+    if df is None:
         print("FAIL: zomato_data.csv missing!")
         return
-
-    df = pd.read_csv("zomato_data.csv")
     
     test_cases = [
         {"place": "Bellandur", "cuisine": "North Indian", "rating": 4.0, "price": "mid"},
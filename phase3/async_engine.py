@@ -0,0 +1,120 @@
+import asyncio
+import os
+from groq import AsyncGroq, DefaultAsyncHttpxClient
+
+try:
+    from phase3.llm_engine import MODEL, RecommendationEngine, connection_limits
+except ImportError:
+    from llm_engine import MODEL, RecommendationEngine, connection_limits
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+class AsyncRecommendationEngine:
+    """
+    asyncio front end for RecommendationEngine, for the serving layer.
+    - at most `max_concurrency` Groq calls are in flight at once (the rest queue on a semaphore)
+    - identical in-flight prompts are coalesced: N concurrent waiters share one upstream call
+    - every request carries a deadline (by default the engine's LLM_LATENCY_BUDGET); a waiter that runs out of time gets the local template
+      explanation without cancelling the shared call, so the other waiters (and the response
+      cache) still get it
+    Prompt building and the persistent response cache are shared with the sync engine.
+    """
+
+    def __init__(self, engine=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, default_timeout=None, client=None):
+        self.engine = engine if engine is not None else RecommendationEngine()
+        self.client = client if client is not None else self._default_client(self.engine.base_url)
+        # One latency budget for the sync and async paths unless a caller overrides it
+        self.default_timeout = self.engine.latency_budget if default_timeout is None else default_timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.inflight = {}
+        self.stats = {"upstream_calls": 0, "coalesced": 0, "cache_hits": 0, "timeouts": 0, "errors": 0}
+
+    @staticmethod
+    def _default_client(base_url=None):
+        api_key = os.getenv("GROQ_API_KEY") or ("local" if base_url else None)
+        if not api_key:
+            return None
+        try:
+            return AsyncGroq(api_key=api_key, base_url=base_url,
+                             http_client=DefaultAsyncHttpxClient(limits=connection_limits()))
+        except Exception as e:
+            print(f"WARNING: Failed to initialize async Groq client: {e}")
+            return None
+
+    async def warm_up(self, timeout=3.0):
+        """Opens a pooled connection before the first request (see RecommendationEngine.warm_up)."""
+        if not self.client:
+            return False
+        try:
+            await self.client.with_options(timeout=timeout, max_retries=0).models.list()
+            return True
+        except Exception as e:
+            print(f"WARNING: Async LLM connection warm-up failed: {e}")
+            return False
+
+    async def explain(self, user_preferences, filtered_restaurants, timeout=None):
+        """
+        Async counterpart of `RecommendationEngine.explain` ({"text", "source"}).
+        `timeout` (seconds) is this caller's latency budget, including time queued for a slot;
+        when it runs out the local template explanation is returned.
+        """
+        if filtered_restaurants.empty:
+            return {"text": "No recommendations returned. Try relaxing filters.", "source": "fallback"}
+
+        prepared = self.engine._prepare(user_preferences, filtered_restaurants)
+        # SQLite reads are quick but may wait on another thread's write, so keep them off the loop
+        cached = await asyncio.to_thread(self.engine._cached, prepared)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return {"text": cached[0], "source": cached[1]}
+
+        if not self.client:
+            return self.engine._fallback(user_preferences, filtered_restaurants, "missing API key")
+
+        cache_key = prepared.cache_key
+        task = self.inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._complete(prepared))
+            self.inflight[cache_key] = task
+            task.add_done_callback(lambda t: self._finished(cache_key, t))
+        else:
+            self.stats["coalesced"] += 1
+
+        timeout = self.default_timeout if timeout is None else timeout
+        try:
+            # shield: a waiter hitting its deadline must not cancel the call other waiters share
+            response = await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            return self.engine._fallback(user_preferences, filtered_restaurants, f"no LLM response within {timeout:g}s")
+        except Exception as e:
+            self.stats["errors"] += 1
+            return self.engine._fallback(user_preferences, filtered_restaurants, f"LLM call failed: {e}")
+        if not response:
+            return self.engine._fallback(user_preferences, filtered_restaurants, "empty LLM response")
+        return {"text": response, "source": "llm"}
+
+    async def get_recommendations(self, user_preferences, filtered_restaurants, timeout=None):
+        return (await self.explain(user_preferences, filtered_restaurants, timeout))["text"]
+
+    def _finished(self, cache_key, task):
+        self.inflight.pop(cache_key, None)
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved even if every waiter already timed out
+
+    async def _complete(self, prepared):
+        async with self.semaphore:
+            self.stats["upstream_calls"] += 1
+            # No SDK retries: a retried call would outlive every waiter's deadline
+            client = self.client.with_options(timeout=self.default_timeout, max_retries=0)
+            chat_completion = await client.chat.completions.create(
+                messages=prepared.messages,
+                model=MODEL,
+            )
+            response = chat_completion.choices[0].message.content
+        self.engine.metrics.record_completion(prepared.messages, response, getattr(chat_completion, "usage", None))
+        await asyncio.to_thread(self.engine._store, prepared, response)
+        return response
+
+    def snapshot_stats(self):
+        return {**self.stats, "inflight": len(self.inflight)}
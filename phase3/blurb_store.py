@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+
+BLURB_PATH = "zomato_blurbs.json"
+
+def restaurant_key(name, area):
+    """Chains repeat across areas, so blurbs are keyed on name + area (case/space-insensitive)."""
+    return f"{' '.join(str(name).lower().split())}|{' '.join(str(area or '').lower().split())}"
+
+class BlurbStore:
+    """
+    Precomputed per-restaurant card descriptions, loaded once into a dict for O(1) reads.
+    Entries are {"tagline", "best_for", "text", "source"}; `source` is "llm", or "fallback"
+    for template text that a later batch run should retry.
+    """
+
+    def __init__(self, path=BLURB_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.blurbs = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.blurbs = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"WARNING: Could not read blurb store {path}: {e}")
+
+    def count(self):
+        return len(self.blurbs)
+
+    def get(self, name, area):
+        return self.blurbs.get(restaurant_key(name, area))
+
+    def needs_blurb(self, name, area):
+        entry = self.get(name, area)
+        return entry is None or entry.get("source") != "llm"
+
+    def put(self, name, area, blurb):
+        with self.lock:
+            self.blurbs[restaurant_key(name, area)] = blurb
+
+    def save(self):
+        # Write-then-rename so a serving process never reads a half-written file
+        with self.lock:
+            data = json.dumps(self.blurbs, ensure_ascii=False)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+def load_blurb_store(path=BLURB_PATH):
+    """The store at `path`, or None if the batch job has not been run."""
+    return BlurbStore(path) if os.path.exists(path) else None
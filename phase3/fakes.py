@@ -0,0 +1,26 @@
+# Stand-ins for the `groq` client used by the phase 3 tests (no network, no API key)
+
+def chunk(text):
+    delta = type("Delta", (), {"content": text})
+    return type("Chunk", (), {"choices": [type("Choice", (), {"delta": delta})]})
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, messages, model, stream=False):
+        self.calls += 1
+        if stream:
+            return iter([chunk(text) for text in ["Streamed ", f"response #{self.calls}"]])
+        message = type("Message", (), {"content": f"Response #{self.calls}"})
+        choice = type("Choice", (), {"message": message})
+        return type("Completion", (), {"choices": [choice]})
+
+class FakeClient:
+    def __init__(self, completions):
+        self.chat = type("Chat", (), {"completions": completions})
+        self.options = {}
+
+    def with_options(self, **options):
+        self.options = options
+        return self
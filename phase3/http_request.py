@@ -0,0 +1,42 @@
+from collections import namedtuple
+
+# One parsed HTTP/1.1 request; `path` has the query string removed, header names are lower-case
+HttpRequest = namedtuple("HttpRequest", ["method", "path", "version", "headers", "body"])
+
+class BadRequest(ValueError):
+    """The client sent a request line, header or body that cannot be parsed (answer with a 400)."""
+
+async def read_request(reader):
+    """
+    Reads the next request from an asyncio stream: request line, headers and a
+    Content-Length body. Shared by the warm recommendation server and the mock Groq API.
+    Returns None once the client has closed the connection; raises BadRequest for a malformed
+    request line, Content-Length or body, and asyncio.IncompleteReadError for a truncated body.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise BadRequest("Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0) or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise BadRequest("Invalid Content-Length")
+    try:
+        body = (await reader.readexactly(length)).decode("utf-8") if length else ""
+    except UnicodeDecodeError:
+        raise BadRequest("Request body is not UTF-8")
+    return HttpRequest(method, path.split("?", 1)[0], version, headers, body)
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+LLM_CACHE_PATH = "llm_cache.sqlite3"
+
+def make_cache_key(model, system_message, user_preferences, restaurants, prompt_version=1):
+    """
+    Stable hash of everything that determines the completion: model, system message, prompt
+    template version and a canonical (key-sorted, whitespace-free) form of the preferences
+    and restaurant records.
+    """
+    canonical = json.dumps(
+        {
+            "model": model,
+            "system": system_message,
+            "prompt_version": prompt_version,
+            "preferences": user_preferences,
+            "restaurants": restaurants,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class LLMResponseCache:
+    """
+    Persistent SQLite cache of LLM completions.
+    Entries expire after `ttl_seconds`; above `max_entries` the least recently used rows are
+    evicted. The file survives restarts, so it can be pre-warmed offline and shared by processes.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl_seconds=7 * 24 * 3600, max_entries=50000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        with self.lock:
+            # WAL lets the server and CLI runs read while another process writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+
+    def get(self, key):
+        now = time.time()
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] <= now:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"WARNING: LLM cache read failed: {e}")
+            return None
+
+    def put(self, key, response, model=None):
+        now = time.time()
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, created_at, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, now, now + self.ttl_seconds, now),
+                )
+                self.writes += 1
+                if self.writes % 100 == 0:
+                    self._evict(now)
+        except sqlite3.Error as e:
+            print(f"WARNING: LLM cache write failed: {e}")
+
+    def _evict(self, now):
+        self.conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self.conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def purge(self):
+        """Drops expired entries and trims the cache to `max_entries`."""
+        with self.lock:
+            self._evict(time.time())
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+if __name__ == "__main__":
+    cache = LLMResponseCache(os.getenv("LLM_CACHE_PATH", LLM_CACHE_PATH))
+    cache.purge()
+    print(f"LLM cache at {cache.path}: {cache.count()} live entries")
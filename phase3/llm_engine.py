@@ -1,73 +1,327 @@
+import json
 import os
-from groq import Groq
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import httpx
+from groq import DefaultHttpxClient, Groq
 from dotenv import load_dotenv
 
+try:
+    from phase3.llm_cache import LLM_CACHE_PATH, LLMResponseCache, make_cache_key
+    from phase3.prompt_builder import PROMPT_COLUMNS, PROMPT_TOKEN_BUDGET, TokenMetrics, build_blurb_prompt, build_prompt, format_preferences, prompt_records
+    from phase3.semantic_cache import DEFAULT_THRESHOLD, SemanticResponseCache, candidate_key
+    from phase3.template_fallback import describe_locally, explain_locally
+except ImportError:
+    from llm_cache import LLM_CACHE_PATH, LLMResponseCache, make_cache_key
+    from prompt_builder import PROMPT_COLUMNS, PROMPT_TOKEN_BUDGET, TokenMetrics, build_blurb_prompt, build_prompt, format_preferences, prompt_records
+    from semantic_cache import DEFAULT_THRESHOLD, SemanticResponseCache, candidate_key
+    from template_fallback import describe_locally, explain_locally
+
 # Load environment variables from .env
 load_dotenv()
 
+MODEL = "llama-3.1-8b-instant"
+# Bump when the prompt template changes so cached completions for the old wording are not reused
+PROMPT_VERSION = 2
+# Seconds a request may wait on Groq before the local template explanation is served
+DEFAULT_LATENCY_BUDGET = float(os.getenv("LLM_LATENCY_BUDGET", "8"))
+# HTTP connection pool shared by every call of an engine: bounded sockets, long-lived keep-alive
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "16"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "120"))
+SYSTEM_MESSAGE = "You are a helpful Zomato food expert providing restaurant recommendations."
+
+# Chat messages plus everything needed to look the request up in (and store it to) the caches
+PreparedPrompt = namedtuple("PreparedPrompt", ["messages", "cache_key", "query_text", "candidates"])
+
+def connection_limits():
+    return httpx.Limits(max_connections=LLM_POOL_SIZE, max_keepalive_connections=LLM_POOL_SIZE,
+                        keepalive_expiry=LLM_KEEPALIVE_EXPIRY)
+
 class RecommendationEngine:
-    def __init__(self):
-        api_key = os.getenv("GROQ_API_KEY")
+    def __init__(self, cache=None, latency_budget=DEFAULT_LATENCY_BUDGET, prompt_token_budget=PROMPT_TOKEN_BUDGET, semantic_cache=None, base_url=None, http_client=None):
+        """
+        `cache` is an LLMResponseCache; by default one is opened at LLM_CACHE_PATH
+        (env var, empty to disable). Pass `cache=False` to always call the API.
+        `semantic_cache` reuses answers for paraphrased preferences over the same candidates;
+        by default one is created with LLM_SEMANTIC_THRESHOLD (env var, 0 to disable).
+        `base_url` (or GROQ_BASE_URL) points the client at another Groq-compatible API,
+        e.g. phase3/mock_groq_server.py for offline load tests; no real API key is needed then.
+        Calls share one pooled `http_client` (LLM_POOL_SIZE connections, LLM_KEEPALIVE_EXPIRY s keep-alive).
+        """
+        self.base_url = base_url or os.getenv("GROQ_BASE_URL")
+        self.latency_budget = latency_budget
+        self.prompt_token_budget = prompt_token_budget
+        self.metrics = TokenMetrics()
+        # Runs blocking Groq calls so `explain` can stop waiting at its deadline
+        self.executor = ThreadPoolExecutor(max_workers=LLM_POOL_SIZE, thread_name_prefix="llm")
+        self.cache = self._default_cache() if cache is None else (None if cache is False else cache)
+        if semantic_cache is None:
+            threshold = float(os.getenv("LLM_SEMANTIC_THRESHOLD", DEFAULT_THRESHOLD))
+            semantic_cache = SemanticResponseCache(threshold) if threshold > 0 else False
+        self.semantic_cache = None if semantic_cache is False else semantic_cache
+        api_key = os.getenv("GROQ_API_KEY") or ("local" if self.base_url else None)
         if not api_key:
             self.client = None
             print("WARNING: GROQ_API_KEY not found. LLM features will be disabled.")
         else:
             try:
-                self.client = Groq(api_key=api_key)
+                self.client = Groq(api_key=api_key, base_url=self.base_url,
+                                   http_client=http_client or DefaultHttpxClient(limits=connection_limits()))
             except Exception as e:
                 self.client = None
                 print(f"WARNING: Failed to initialize Groq client: {e}")
 
-    def get_recommendations(self, user_preferences, filtered_restaurants):
+    @staticmethod
+    def _default_cache():
+        path = os.getenv("LLM_CACHE_PATH", LLM_CACHE_PATH)
+        if not path:
+            return None
+        try:
+            return LLMResponseCache(path)
+        except Exception as e:
+            print(f"WARNING: LLM response cache disabled: {e}")
+            return None
+
+    def _prepare(self, user_preferences, filtered_restaurants):
         """
-        Uses Groq LLM to generate natural language recommendations from filtered restaurants (Kaggle schema).
+        Builds the chat messages and cache lookup keys (a PreparedPrompt) for a request.
+        """
+        records = prompt_records(filtered_restaurants)
+        prompt, rows, _ = build_prompt(user_preferences, records, self.prompt_token_budget)
+        if len(rows) < len(records):
+            self.metrics.record_dropped(len(records) - len(rows))
+
+        # Also identifies identical in-flight requests for the async engine's single-flight
+        cache_key = make_cache_key(MODEL, SYSTEM_MESSAGE, user_preferences, rows, PROMPT_VERSION)
+
+        messages = [
+            {
+                "role": "system",
+                "content": SYSTEM_MESSAGE
+            },
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ]
+        return PreparedPrompt(messages, cache_key, format_preferences(user_preferences), candidate_key(rows))
+
+    def _cached(self, prepared):
+        """
+        (text, source) from the exact-match cache ("cache") or, for a paraphrase over the
+        same candidate restaurants, the semantic cache ("semantic"); None on a miss.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(prepared.cache_key)
+            if cached is not None:
+                return cached, "cache"
+        if self.semantic_cache is not None:
+            match = self.semantic_cache.lookup(prepared.query_text, prepared.candidates)
+            if match is not None:
+                return match[0], "semantic"
+        return None
+
+    def _store(self, prepared, response):
+        if not response:
+            return
+        if self.cache is not None:
+            self.cache.put(prepared.cache_key, response, model=MODEL)
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(prepared.query_text, prepared.candidates, response)
+
+    def warm_up(self, timeout=3.0):
+        """
+        Opens a pooled connection ahead of the first real call (TCP + TLS handshakes done once),
+        using the cheap models endpoint. Returns True if the API answered.
+        """
+        if not self.client:
+            return False
+        try:
+            self.client.with_options(timeout=timeout, max_retries=0).models.list()
+            return True
+        except Exception as e:
+            print(f"WARNING: LLM connection warm-up failed: {e}")
+            return False
+
+    def _budgeted_client(self, budget):
+        # One attempt within the budget: SDK retries would multiply the worst case
+        return self.client.with_options(timeout=budget, max_retries=0)
+
+    def _fallback(self, user_preferences, filtered_restaurants, reason):
+        print(f"WARNING: Serving template explanation ({reason}).")
+        return {"text": explain_locally(user_preferences, filtered_restaurants), "source": "fallback"}
+
+    def explain(self, user_preferences, filtered_restaurants, budget=None):
+        """
+        Natural language recommendations plus which path produced them:
+        {"text": ..., "source": "cache" | "semantic" | "llm" | "fallback"}.
+        The Groq call gets `budget` seconds (default LLM_LATENCY_BUDGET); a slow, failing or
+        unconfigured LLM is answered instantly with a deterministic local explanation instead.
         """
         if filtered_restaurants.empty:
-            return "No recommendations returned. Try relaxing filters."
-
-        # Mapping for display in prompt
-        col_mapping = {
-            'restaurant name': 'name',
-            'area': 'location',
-            'rate (out of 5)': 'rating',
-            'avg cost (two people)': 'cost_for_two',
-            'cuisines type': 'cuisines'
-        }
-        
-        # Limit to top 5 and rename columns for LLM clarity
-        top_restaurants = filtered_restaurants.head(5).rename(columns=col_mapping)[list(col_mapping.values())].to_dict(orient='records')
-        
-        prompt = f"""
-        User Preferences: {user_preferences}
-        
-        Available Restaurants:
-        {top_restaurants}
-        
-        Task: Based on the user preferences and the available restaurants, provide 3 clear and concise recommendations. 
-        For each restaurant, explain why it matches the user's preferences. 
-        Format the response clearly with restaurant names and descriptions.
+            return {"text": "No recommendations returned. Try relaxing filters.", "source": "fallback"}
+
+        prepared = self._prepare(user_preferences, filtered_restaurants)
+        messages = prepared.messages
+        # Identical (or paraphrased) preferences + restaurants are answered without a network call
+        cached = self._cached(prepared)
+        if cached is not None:
+            return {"text": cached[0], "source": cached[1]}
+
+        if not self.client:
+            return self._fallback(user_preferences, filtered_restaurants, "missing API key")
+
+        # The HTTP timeout applies per connect/read phase, so the wall-clock budget is enforced here
+        budget = budget or self.latency_budget
+        future = self.executor.submit(self._complete, prepared, budget, time.monotonic() + budget)
+        try:
+            response = future.result(timeout=budget)
+        except FutureTimeoutError:
+            # A call still queued behind busy workers is dropped instead of being sent late
+            future.cancel()
+            return self._fallback(user_preferences, filtered_restaurants, f"no LLM answer within {budget}s")
+        except Exception as e:
+            return self._fallback(user_preferences, filtered_restaurants, f"LLM call failed: {e}")
+        if not response:
+            return self._fallback(user_preferences, filtered_restaurants, "empty LLM response")
+        return {"text": response, "source": "llm"}
+
+    def _complete(self, prepared, budget, deadline):
+        """
+        One blocking Groq call (run on `self.executor`), skipped if it only starts after the
+        caller's `deadline`. A completion that arrives after its caller gave up is still
+        cached, so the next identical request is answered from it.
+        """
+        if time.monotonic() >= deadline:
+            return None
+        chat_completion = self._budgeted_client(budget).chat.completions.create(
+            messages=prepared.messages,
+            model=MODEL,
+        )
+        response = chat_completion.choices[0].message.content
+        self.metrics.record_completion(prepared.messages, response, getattr(chat_completion, "usage", None))
+        if response:
+            self._store(prepared, response)
+        return response
+
+    def get_recommendations(self, user_preferences, filtered_restaurants, budget=None):
+        """
+        Uses Groq LLM to generate natural language recommendations from filtered restaurants (Kaggle schema).
         """
+        return self.explain(user_preferences, filtered_restaurants, budget)["text"]
+
+    def explain_stream(self, user_preferences, filtered_restaurants, budget=None):
+        """
+        Streaming variant of `explain`: yields {"text", "source"} chunks as Groq produces them,
+        so callers can render the first tokens instead of waiting for the whole completion.
+        The stream is abandoned for the local explanation once `budget` seconds have passed.
+        """
+        if filtered_restaurants.empty:
+            yield {"text": "No recommendations returned. Try relaxing filters.", "source": "fallback"}
+            return
+
+        prepared = self._prepare(user_preferences, filtered_restaurants)
+        messages = prepared.messages
+        cached = self._cached(prepared)
+        if cached is not None:
+            yield {"text": cached[0], "source": cached[1]}
+            return
 
         if not self.client:
-            return "AI Insight is currently unavailable (Missing API Key). However, you can see the top matches below!"
+            yield self._fallback(user_preferences, filtered_restaurants, "missing API key")
+            return
+
+        parts = []
+        budget = budget or self.latency_budget
+        deadline = time.monotonic() + budget
+        try:
+            stream = self._budgeted_client(budget).chat.completions.create(
+                messages=messages,
+                model=MODEL,
+                stream=True,
+            )
+            for chunk in stream:
+                if time.monotonic() > deadline:
+                    if hasattr(stream, "close"):
+                        stream.close()
+                    raise TimeoutError(f"stream not finished within {budget}s")
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    parts.append(text)
+                    yield {"text": text, "source": "llm"}
+        except Exception as e:
+            fallback = self._fallback(user_preferences, filtered_restaurants, f"LLM stream failed: {e}")
+            if parts:
+                # Chunks already shown stay on screen; the local explanation follows them
+                fallback["text"] = "\n\n" + fallback["text"]
+            yield fallback
+            return
+
+        if not parts:
+            yield self._fallback(user_preferences, filtered_restaurants, "empty LLM response")
+            return
+        self.metrics.record_completion(messages, "".join(parts))
+        # Only complete streams are cached
+        self._store(prepared, "".join(parts))
+
+    def get_recommendations_stream(self, user_preferences, filtered_restaurants, budget=None):
+        """
+        Text-only form of `explain_stream`; joining the chunks gives the same text
+        `get_recommendations` would return.
+        """
+        for chunk in self.explain_stream(user_preferences, filtered_restaurants, budget):
+            yield chunk["text"]
 
+    def describe_restaurant(self, restaurant, budget=None):
+        """
+        Short structured card description for one restaurant row (Kaggle schema dict):
+        {"tagline", "best_for", "text", "source"}. Used by the offline blurb batch job;
+        falls back to the local template when the LLM is unavailable or returns bad JSON.
+        """
+        if not self.client:
+            return describe_locally(restaurant)
+        record = {PROMPT_COLUMNS[c]: restaurant.get(c) for c in PROMPT_COLUMNS if c in restaurant}
+        messages = [
+            {"role": "system", "content": SYSTEM_MESSAGE},
+            {"role": "user", "content": build_blurb_prompt(record)},
+        ]
         try:
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful Zomato food expert providing restaurant recommendations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-                model="llama-3.1-8b-instant",
+            chat_completion = self._budgeted_client(budget or self.latency_budget).chat.completions.create(
+                messages=messages,
+                model=MODEL,
+                response_format={"type": "json_object"},
             )
-            return chat_completion.choices[0].message.content
+            content = chat_completion.choices[0].message.content
+            blurb = json.loads(content)
+            tagline = str(blurb.get("tagline") or "").strip()
+            best_for = str(blurb.get("best_for") or "").strip()
         except Exception as e:
-            return f"Error calling LLM: {str(e)}"
+            print(f"WARNING: Blurb generation failed for {restaurant.get('restaurant name')}: {e}")
+            return describe_locally(restaurant)
+        if not tagline:
+            return describe_locally(restaurant)
+        self.metrics.record_completion(messages, content, getattr(chat_completion, "usage", None))
+        text = f"{tagline} Best for: {best_for}." if best_for else tagline
+        return {"tagline": tagline, "best_for": best_for, "text": text, "source": "llm"}
+
+_shared_engine = None
+_shared_engine_lock = threading.Lock()
+
+def get_shared_engine(warm_up=True):
+    """
+    The process-wide engine (one Groq client and connection pool for every caller:
+    Streamlit sessions, server workers, the CLI). The first call creates it and, with
+    `warm_up`, opens a connection on a background thread so startup is not blocked.
+    """
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            _shared_engine = RecommendationEngine()
+            if warm_up:
+                threading.Thread(target=_shared_engine.warm_up, daemon=True).start()
+        return _shared_engine
 
 if __name__ == "__main__":
     import pandas as pd
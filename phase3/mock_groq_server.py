@@ -0,0 +1,222 @@
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+
+try:
+    from phase3.http_request import BadRequest, read_request
+except ImportError:
+    from http_request import BadRequest, read_request
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+MODELS_PATH = "/openai/v1/models"
+
+class MockGroqServer:
+    """
+    Local stand-in for the Groq chat-completions API, for offline load tests.
+    Speaks the endpoint the `groq` client calls (JSON and `stream=True` SSE), with
+    - lognormal response latency (`latency_median` seconds, `latency_sigma` spread)
+    - streamed tokens paced at `tokens_per_second`
+    - a share of 500 errors (`error_rate`) and 429 rate-limit responses (`rate_limit_rate`)
+    Replies are deterministic text built from the restaurants in the prompt.
+    Point an engine at it with `RecommendationEngine(base_url=server.base_url)` or GROQ_BASE_URL.
+    """
+
+    def __init__(self, latency_median=0.3, latency_sigma=0.5, tokens_per_second=200.0,
+                 error_rate=0.0, rate_limit_rate=0.0, seed=None):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0, "connections": 0}
+        self.base_url = None
+        self.loop = None
+        self.server = None
+        self.connections = set()
+
+    def sample_latency(self):
+        if self.latency_median <= 0:
+            return 0.0
+        return self.random.lognormvariate(0.0, self.latency_sigma) * self.latency_median
+
+    @staticmethod
+    def reply_for(messages, json_mode=False):
+        """Deterministic completion text naming the restaurants listed in the prompt table."""
+        prompt = messages[-1]["content"] if messages else ""
+        lines = prompt.split("\n")
+        names = []
+        # The prompt table is "Restaurants:" (or "Restaurant:"), a header line, then one row per restaurant
+        starts = [i for i, line in enumerate(lines) if line in ("Restaurants:", "Restaurant:")]
+        if starts:
+            for line in lines[starts[0] + 2:]:
+                if line.startswith("Task:") or "|" not in line:
+                    break
+                names.append(line.split("|")[0])
+        if json_mode:
+            name = names[0] if names else "This restaurant"
+            return json.dumps({"tagline": f"{name} is a local favourite for its signature dishes.", "best_for": "Casual dinners"})
+        if not names:
+            return "Here are some great options that match your preferences."
+        picks = [f"{i}. {name}: a strong match for your preferences, with consistently good reviews." for i, name in enumerate(names[:3], start=1)]
+        return "Here are my top picks:\n" + "\n".join(picks)
+
+    def _completion(self, model, content, prompt_tokens):
+        completion_tokens = len(content.split())
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop", "logprobs": None}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    async def handle_completion(self, body, writer):
+        self.stats["requests"] += 1
+        try:
+            request = json.loads(body)
+        except json.JSONDecodeError as e:
+            return await self.write_json(writer, 400, {"error": {"message": f"Invalid JSON: {e}", "type": "invalid_request_error"}})
+
+        await asyncio.sleep(self.sample_latency())
+        roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            return await self.write_json(writer, 429, {"error": {"message": "Rate limit reached (mock)", "type": "tokens", "code": "rate_limit_exceeded"}},
+                                         extra_headers={"retry-after": "1"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return await self.write_json(writer, 500, {"error": {"message": "Internal server error (mock)", "type": "internal_server_error"}})
+
+        messages = request.get("messages", [])
+        model = request.get("model", "mock")
+        json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+        content = self.reply_for(messages, json_mode)
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+        if not request.get("stream"):
+            return await self.write_json(writer, 200, self._completion(model, content, prompt_tokens))
+
+        self.stats["streams"] += 1
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: text/event-stream\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1"))
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        delay = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        words = content.split(" ")
+        for i, word in enumerate(words):
+            delta = {"content": word if i == 0 else " " + word}
+            if i == 0:
+                delta["role"] = "assistant"
+            chunk = {"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": None, "logprobs": None}]}
+            writer.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            await writer.drain()
+            if delay:
+                await asyncio.sleep(delay)
+        final = {"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                 "choices": [{"index": 0, "delta": {}, "finish_reason": "stop", "logprobs": None}]}
+        writer.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        await writer.drain()
+        return False
+
+    async def write_json(self, writer, status, payload, extra_headers=None):
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+        data = json.dumps(payload).encode("utf-8")
+        headers = "".join(f"{k}: {v}\r\n" for k, v in (extra_headers or {}).items())
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"{headers}"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+        return True
+
+    async def handle_connection(self, reader, writer):
+        """Minimal HTTP/1.1 handler with keep-alive (streams close the connection when done)."""
+        self.connections.add((asyncio.current_task(), writer))
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as e:
+                    await self.write_json(writer, 400, {"error": {"message": str(e), "type": "invalid_request_error"}})
+                    break
+                if request is None:
+                    break
+                method, path = request.method, request.path
+
+                if method == "POST" and path == COMPLETIONS_PATH:
+                    keep_alive = await self.handle_completion(request.body, writer)
+                elif method == "GET" and path == MODELS_PATH:
+                    keep_alive = await self.write_json(writer, 200, {"object": "list", "data": [
+                        {"id": "llama-3.1-8b-instant", "object": "model", "created": 0, "owned_by": "mock"}]})
+                else:
+                    keep_alive = await self.write_json(writer, 404, {"error": {"message": f"No route for {method} {path}"}})
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            self.connections.discard((asyncio.current_task(), writer))
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8766):
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        self.base_url = f"http://{host}:{self.server.sockets[0].getsockname()[1]}"
+        print(f"Mock Groq API listening on {self.base_url}")
+        async with self.server:
+            await self.server.serve_forever()
+
+    def start_background(self, host="127.0.0.1", port=0):
+        """Runs the server on its own event loop thread (port 0 = any free port); returns base_url."""
+        ready = threading.Event()
+
+        async def run():
+            self.server = await asyncio.start_server(self.handle_connection, host, port)
+            self.base_url = f"http://{host}:{self.server.sockets[0].getsockname()[1]}"
+            ready.set()
+            async with self.server:
+                try:
+                    await self.server.serve_forever()
+                except asyncio.CancelledError:
+                    pass
+            # Let idle keep-alive connections finish before the loop is torn down
+            connections = list(self.connections)
+            for _, writer in connections:
+                writer.close()
+            await asyncio.gather(*(task for task, _ in connections), return_exceptions=True)
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(run(),), daemon=True)
+        self.thread.start()
+        ready.wait(timeout=5)
+        return self.base_url
+
+    def stop(self):
+        if self.loop is not None and self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+            self.thread.join(timeout=5)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Groq-compatible mock LLM server")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-median", type=float, default=0.3, help="median response latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="lognormal spread of the latency")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = MockGroqServer(args.latency_median, args.latency_sigma, args.tokens_per_second, args.error_rate, args.rate_limit_rate)
+    asyncio.run(server.serve(port=args.port))
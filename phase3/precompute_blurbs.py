@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add project root to path to import local modules
+sys.path.append(os.getcwd())
+
+from phase3.blurb_store import BLURB_PATH, BlurbStore
+from phase3.llm_engine import RecommendationEngine
+
+def generate_blurbs(df, engine, store, max_workers=4, limit=None, save_every=200):
+    """
+    Offline batch job: one short LLM description per restaurant (name + area) that does not
+    already have an LLM blurb, most-voted first, with at most `max_workers` calls in flight.
+    The store is saved every `save_every` blurbs so an interrupted run keeps its progress.
+    Returns the number of blurbs written.
+    """
+    columns = ['restaurant name', 'area', 'rate (out of 5)', 'num of ratings', 'avg cost (two people)', 'cuisines type']
+    candidates = df[[c for c in columns if c in df.columns]]
+    if 'num of ratings' in candidates.columns:
+        candidates = candidates.sort_values('num of ratings', ascending=False, kind='stable')
+    candidates = candidates.drop_duplicates(subset=['restaurant name', 'area'])
+    rows = [r for r in candidates.to_dict(orient='records') if store.needs_blurb(r['restaurant name'], r.get('area'))]
+    if limit is not None:
+        rows = rows[:limit]
+
+    written = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(engine.describe_restaurant, row): row for row in rows}
+        for future in as_completed(futures):
+            row = futures[future]
+            store.put(row['restaurant name'], row.get('area'), future.result())
+            written += 1
+            if written % save_every == 0:
+                store.save()
+                print(f"  {written}/{len(rows)} blurbs written")
+    store.save()
+    return written
+
+if __name__ == "__main__":
+    from phase1.data_loader import load_zomato_data
+
+    df = load_zomato_data(fetch_if_missing=False)
+    if df is None:
+        print("Data file not found. Run Phase 1 first.")
+    else:
+        limit = int(sys.argv[1]) if len(sys.argv) > 1 else None
+        store = BlurbStore(os.getenv("BLURB_PATH", BLURB_PATH))
+        start = time.time()
+        written = generate_blurbs(df, RecommendationEngine(cache=False), store,
+                                  max_workers=int(os.getenv("BLURB_WORKERS", "4")), limit=limit)
+        print(f"Wrote {written} blurbs in {time.time() - start:.1f}s -> {store.path} ({store.count()} total)")
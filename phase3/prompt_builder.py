@@ -0,0 +1,138 @@
+import math
+import os
+import re
+import threading
+
+# Prompt column names for the Kaggle schema, in the order they are serialized
+PROMPT_COLUMNS = {
+    'restaurant name': 'name',
+    'area': 'location',
+    'rate (out of 5)': 'rating',
+    'avg cost (two people)': 'cost_for_two',
+    'cuisines type': 'cuisines'
+}
+PROMPT_TOKEN_BUDGET = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "600"))
+
+TASK = (
+    "Task: Based on the user preferences and the restaurants above, provide 3 clear and concise "
+    "recommendations. For each restaurant, give its name and explain why it matches the user's preferences."
+)
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+def estimate_tokens(text):
+    """
+    Approximate BPE token count without a tokenizer download: words cost one token per
+    ~4 letters, numbers one per ~3 digits, and every punctuation mark one token.
+    """
+    count = 0
+    for piece in _TOKEN_PATTERN.findall(text or ""):
+        if piece[0].isalpha():
+            count += math.ceil(len(piece) / 4)
+        elif piece[0].isdigit():
+            count += math.ceil(len(piece) / 3)
+        else:
+            count += 1
+    return count
+
+def _cell(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "-"
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value).replace("|", "/").replace("\n", " ").strip()
+
+def prompt_records(filtered_restaurants, limit=5):
+    """Top rows under the prompt column names (only columns present are kept)."""
+    columns = [c for c in PROMPT_COLUMNS if c in filtered_restaurants.columns]
+    return filtered_restaurants.head(limit)[columns].rename(columns=PROMPT_COLUMNS).to_dict(orient='records')
+
+def format_preferences(user_preferences):
+    """Preference dicts become `key: value` pairs (empty values dropped); text is passed through."""
+    if isinstance(user_preferences, dict):
+        return "; ".join(f"{k}: {v}" for k, v in user_preferences.items() if v not in (None, "", 0, 0.0))
+    return " ".join(str(user_preferences).split())
+
+def format_table(records):
+    """Header line plus one pipe-separated line per row, instead of a repr of dicts."""
+    if not records:
+        return ""
+    header = list(records[0])
+    lines = ["|".join(header)]
+    lines += ["|".join(_cell(row.get(col)) for col in header) for row in records]
+    return "\n".join(lines)
+
+def build_prompt(user_preferences, records, token_budget=PROMPT_TOKEN_BUDGET):
+    """
+    Compact user prompt within `token_budget` estimated tokens.
+    Lowest-ranked rows are dropped first (at least one is kept); if that is not enough the
+    preference text is truncated. The task text and one row are never cut, so budgets below
+    that floor are exceeded. Returns (prompt, records actually included, estimated tokens).
+    """
+    preferences = format_preferences(user_preferences)
+
+    def render(rows, prefs):
+        return f"User preferences: {prefs}\nRestaurants:\n{format_table(rows)}\n{TASK}"
+
+    rows = list(records)
+    prompt = render(rows, preferences)
+    while len(rows) > 1 and estimate_tokens(prompt) > token_budget:
+        rows.pop()
+        prompt = render(rows, preferences)
+
+    overflow = estimate_tokens(prompt) - token_budget
+    while overflow > 0 and preferences:
+        # Cut the preference text in proportion to its share of the overflow, leaving the structure intact
+        pref_tokens = max(1, estimate_tokens(preferences))
+        keep = int(len(preferences) * max(0, pref_tokens - overflow) / pref_tokens)
+        preferences = preferences[:min(keep, len(preferences) - 1)]
+        prompt = render(rows, preferences)
+        overflow = estimate_tokens(prompt) - token_budget
+    return prompt, rows, estimate_tokens(prompt)
+
+BLURB_TASK = (
+    'Task: Write a JSON object describing this restaurant for a listing card, with keys '
+    '"tagline" (at most 15 words, what it is known for) and "best_for" (at most 6 words, the occasion or diner it suits).'
+)
+
+def build_blurb_prompt(record):
+    """Prompt for one restaurant's card description (offline blurb generation)."""
+    return f"Restaurant:\n{format_table([record])}\n{BLURB_TASK}"
+
+class TokenMetrics:
+    """
+    Running prompt/completion token totals for LLM calls. Prompt counts use the provider's
+    usage figures when returned, else the local estimate.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "rows_dropped": 0}
+
+    def record(self, prompt_tokens, completion_tokens):
+        with self.lock:
+            self.totals["calls"] += 1
+            self.totals["prompt_tokens"] += int(prompt_tokens or 0)
+            self.totals["completion_tokens"] += int(completion_tokens or 0)
+
+    def record_dropped(self, rows):
+        """Rows cut from a prompt to fit the token budget."""
+        with self.lock:
+            self.totals["rows_dropped"] += rows
+
+    def record_completion(self, messages, completion_text, usage=None):
+        if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+            prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+        else:
+            prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+            completion_tokens = estimate_tokens(completion_text)
+        self.record(prompt_tokens, completion_tokens)
+
+    def snapshot(self):
+        with self.lock:
+            calls = self.totals["calls"]
+            return {
+                **self.totals,
+                "avg_prompt_tokens": round(self.totals["prompt_tokens"] / calls, 1) if calls else 0.0,
+                "avg_completion_tokens": round(self.totals["completion_tokens"] / calls, 1) if calls else 0.0,
+            }
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import math
+import re
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+EMBED_DIM = 2048
+DEFAULT_THRESHOLD = 0.87
+# Phrasings kept per candidate set; older ones are dropped first
+MAX_PER_CANDIDATES = 32
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def _features(text):
+    """Word unigrams plus character trigrams of each padded word, so 'cafes' is close to 'cafe'."""
+    words = _WORD.findall(str(text).lower())
+    features = [f"w:{w}" for w in words]
+    for w in words:
+        padded = f" {w} "
+        features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return features
+
+def embed(text, dim=EMBED_DIM):
+    """Hashed, sublinearly scaled term-frequency vector (IDF is applied at lookup time)."""
+    counts = {}
+    for feature in _features(text):
+        slot = zlib.crc32(feature.encode("utf-8")) % dim
+        counts[slot] = counts.get(slot, 0) + 1
+    vector = np.zeros(dim, dtype=np.float32)
+    for slot, count in counts.items():
+        vector[slot] = 1.0 + math.log(count)
+    return vector
+
+def candidate_key(records):
+    """Identity of the candidate restaurant set a response was written for."""
+    return hashlib.sha1(json.dumps(records, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class SemanticResponseCache:
+    """
+    In-memory near-duplicate cache for free-text preference queries.
+    Answered queries are embedded locally (hashed word + char-trigram TF-IDF, no model download)
+    and grouped by the candidate restaurant set they were answered for. A new query reuses a
+    response only when its candidate set is identical and its cosine similarity to a previous
+    query clears `threshold`, so paraphrases hit while different shortlists never do.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_entries=5000, dim=EMBED_DIM):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.dim = dim
+        self.lock = threading.Lock()
+        # candidate key -> {"vectors": (n, dim) array, "responses": [...]}, oldest bucket first
+        self.buckets = OrderedDict()
+        self.doc_freq = np.zeros(dim, dtype=np.float32)
+        self.size = 0
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _idf(self):
+        return np.log((1.0 + self.size) / (1.0 + self.doc_freq)) + 1.0
+
+    def lookup(self, query_text, candidates):
+        """(response, similarity) of the closest previous answer, or None below the threshold."""
+        query = embed(query_text, self.dim)
+        with self.lock:
+            bucket = self.buckets.get(candidates)
+            if bucket is None:
+                self.stats["misses"] += 1
+                return None
+            idf = self._idf()
+            weighted_query = query * idf
+            weighted = bucket["vectors"] * idf
+            norms = np.linalg.norm(weighted, axis=1) * (np.linalg.norm(weighted_query) or 1.0)
+            similarity = (weighted @ weighted_query) / np.where(norms == 0, 1.0, norms)
+            best = int(np.argmax(similarity))
+            if similarity[best] < self.threshold:
+                self.stats["misses"] += 1
+                return None
+            self.buckets.move_to_end(candidates)
+            self.stats["hits"] += 1
+            return bucket["responses"][best], float(similarity[best])
+
+    def add(self, query_text, candidates, response):
+        vector = embed(query_text, self.dim)
+        with self.lock:
+            bucket = self.buckets.get(candidates)
+            if bucket is None:
+                bucket = self.buckets[candidates] = {"vectors": np.empty((0, self.dim), dtype=np.float32), "responses": []}
+            if len(bucket["responses"]) >= MAX_PER_CANDIDATES:
+                self.doc_freq -= bucket["vectors"][0] > 0
+                bucket["vectors"] = bucket["vectors"][1:]
+                bucket["responses"].pop(0)
+                self.size -= 1
+            bucket["vectors"] = np.vstack([bucket["vectors"], vector])
+            bucket["responses"].append(response)
+            self.buckets.move_to_end(candidates)
+            self.doc_freq += vector > 0
+            self.size += 1
+            # Evict whole least-recently-used candidate sets
+            while self.size > self.max_entries and len(self.buckets) > 1:
+                _, evicted = self.buckets.popitem(last=False)
+                self.doc_freq -= (evicted["vectors"] > 0).sum(axis=0)
+                self.size -= len(evicted["responses"])
+
+    def snapshot_stats(self):
+        with self.lock:
+            return {**self.stats, "entries": self.size, "candidate_sets": len(self.buckets)}
@@ -0,0 +1,49 @@
+import re
+
+# Kaggle dataset columns (kept local so this module has no pandas/phase1 dependency)
+NAME, AREA, RATE, VOTES, COST, CUISINES = (
+    'restaurant name', 'area', 'rate (out of 5)', 'num of ratings', 'avg cost (two people)', 'cuisines type'
+)
+
+def _words(text):
+    return set(re.findall(r"[a-z]+", str(text).lower()))
+
+def _describe(row, wanted_words):
+    """One deterministic sentence for a ranked row: rating, votes, cost and cuisine match."""
+    name = row.get(NAME) or "This restaurant"
+    area = row.get(AREA)
+    parts = []
+    rating = row.get(RATE)
+    if rating:
+        votes = row.get(VOTES)
+        parts.append(f"rated {float(rating):.1f}/5" + (f" by {int(votes):,} diners" if votes else ""))
+    cost = row.get(COST)
+    if cost:
+        parts.append(f"about ₹{int(float(cost)):,} for two")
+    cuisines = [c.strip() for c in str(row.get(CUISINES) or "").split(",") if c.strip()]
+    matched = [c for c in cuisines if _words(c) and _words(c) <= wanted_words]
+    if matched:
+        parts.append(f"serves {', '.join(matched)} as you asked")
+    elif cuisines:
+        parts.append(f"known for {', '.join(cuisines[:3])}")
+
+    where = f" in {area}" if area else ""
+    return f"{name}{where}: {', '.join(parts)}." if parts else f"{name}{where}."
+
+def describe_locally(row):
+    """Template card blurb for one restaurant row, in the same shape as LLM blurbs."""
+    sentence = _describe(row, set())
+    # The card already shows the name and area, so only the facts after the colon are kept
+    tagline = sentence.split(": ", 1)[1] if ": " in sentence else ""
+    tagline = tagline[:1].upper() + tagline[1:]
+    return {"tagline": tagline, "best_for": "", "text": tagline, "source": "fallback"}
+
+def explain_locally(user_preferences, filtered_restaurants, limit=3):
+    """
+    Deterministic explanation of the ranked rows, used when the LLM is unavailable or out of
+    latency budget. Same inputs always give the same text, and it needs no network.
+    """
+    wanted_words = _words(user_preferences)
+    rows = filtered_restaurants.head(limit).to_dict(orient='records')
+    lines = [f"{i}. {_describe(row, wanted_words)}" for i, row in enumerate(rows, start=1)]
+    return "Top matches for your preferences, ranked by rating and popularity:\n" + "\n".join(lines)
@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+import pandas as pd
+from async_engine import AsyncRecommendationEngine
+from llm_engine import RecommendationEngine
+from fakes import FakeClient
+
+class SlowCompletions:
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, messages, model):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        message = type("Message", (), {"content": f"Insight for {messages[1]['content'].split()[2]}"})
+        return type("Completion", (), {"choices": [type("Choice", (), {"message": message})]})
+
+def make_engine(delay, max_concurrency=8):
+    completions = SlowCompletions(delay)
+    client = FakeClient(completions)
+    engine = AsyncRecommendationEngine(RecommendationEngine(cache=False), max_concurrency=max_concurrency, client=client)
+    return engine, completions
+
+DF = pd.DataFrame([{
+    'restaurant name': 'Test Cafe', 'area': 'Indore', 'cuisines type': 'Cafe',
+    'rate (out of 5)': 4.5, 'avg cost (two people)': 500
+}])
+
+class TestAsyncEngine(unittest.TestCase):
+    def test_identical_requests_share_one_call(self):
+        engine, completions = make_engine(0.05)
+        async def run():
+            return await asyncio.gather(*[engine.get_recommendations("cafe", DF) for _ in range(20)])
+        results = asyncio.run(run())
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(completions.calls, 1)
+        self.assertEqual(engine.stats["coalesced"], 19)
+
+    def test_concurrency_limit(self):
+        engine, completions = make_engine(0.02, max_concurrency=2)
+        async def run():
+            return await asyncio.gather(*[engine.get_recommendations(f"query{i}", DF) for i in range(6)])
+        asyncio.run(run())
+        self.assertEqual(completions.calls, 6)
+        self.assertLessEqual(completions.peak, 2)
+
+    def test_deadline_does_not_cancel_shared_call(self):
+        engine, completions = make_engine(0.2)
+        async def run():
+            impatient = engine.get_recommendations("cafe", DF, timeout=0.01)
+            patient = engine.get_recommendations("cafe", DF, timeout=5)
+            return await asyncio.gather(impatient, patient)
+        impatient, patient = asyncio.run(run())
+        self.assertTrue(impatient.startswith("Top matches"))
+        self.assertFalse(patient.startswith("Error"))
+        self.assertEqual(completions.calls, 1)
+        # Without a per-request timeout, waiters get the engine's own latency budget
+        budgeted = AsyncRecommendationEngine(RecommendationEngine(cache=False, latency_budget=3.0), client=FakeClient(completions))
+        self.assertEqual(budgeted.default_timeout, 3.0)
+        print("Phase 3 Test Passed: Async engine coalescing, limits and deadlines verified.")
+
+if __name__ == "__main__":
+    unittest.main()
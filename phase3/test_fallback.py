@@ -0,0 +1,88 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from llm_engine import RecommendationEngine
+from template_fallback import explain_locally
+from fakes import FakeClient, chunk
+
+class SlowCompletions:
+    """Answers after `delay` seconds; streams one chunk every `delay` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    def create(self, messages, model, stream=False):
+        self.calls += 1
+        if stream:
+            def chunks():
+                for text in ["Slow ", "stream ", "answer"]:
+                    time.sleep(self.delay)
+                    yield chunk(text)
+            return chunks()
+        time.sleep(self.delay)
+        message = type("Message", (), {"content": "Late answer"})
+        return type("Completion", (), {"choices": [type("Choice", (), {"message": message})]})
+
+class FailingCompletions:
+    def create(self, messages, model, stream=False):
+        raise TimeoutError("Request timed out.")
+
+DF = pd.DataFrame([
+    {'restaurant name': 'Meghana Foods', 'area': 'Koramangala', 'cuisines type': 'Biryani, North Indian',
+     'rate (out of 5)': 4.4, 'num of ratings': 2100, 'avg cost (two people)': 600},
+    {'restaurant name': 'Truffles', 'area': 'Koramangala', 'cuisines type': 'Cafe, Burger',
+     'rate (out of 5)': 4.2, 'num of ratings': 1500, 'avg cost (two people)': 900},
+])
+
+class TestFallback(unittest.TestCase):
+    def test_template_is_deterministic(self):
+        prefs = "{'cuisine': 'North Indian', 'location': 'Koramangala'}"
+        text = explain_locally(prefs, DF)
+        self.assertEqual(text, explain_locally(prefs, DF))
+        self.assertIn("1. Meghana Foods in Koramangala: rated 4.4/5 by 2,100 diners, about ₹600 for two, serves North Indian as you asked.", text)
+        self.assertIn("2. Truffles", text)
+
+    def test_failed_llm_serves_fallback_within_budget(self):
+        engine = RecommendationEngine(cache=False, latency_budget=1.5)
+        engine.client = FakeClient(FailingCompletions())
+        result = engine.explain("North Indian", DF)
+        self.assertEqual(result["source"], "fallback")
+        self.assertEqual(result["text"], explain_locally("North Indian", DF))
+        self.assertEqual(engine.client.options, {"timeout": 1.5, "max_retries": 0})
+        self.assertEqual([c["source"] for c in engine.explain_stream("North Indian", DF)], ["fallback"])
+
+    def test_budget_is_a_wall_clock_deadline(self):
+        engine = RecommendationEngine(cache=False, semantic_cache=False, latency_budget=0.2)
+        engine.client = FakeClient(SlowCompletions(0.5))
+        started = time.monotonic()
+        self.assertEqual(engine.explain("North Indian", DF)["source"], "fallback")
+        self.assertLess(time.monotonic() - started, 0.45)
+
+        # Every chunk arrives within the per-read timeout, but the whole stream overruns the budget
+        engine.client = FakeClient(SlowCompletions(0.15))
+        chunks = list(engine.explain_stream("Cafe", DF))
+        self.assertEqual([c["source"] for c in chunks], ["llm", "fallback"])
+
+    def test_abandoned_calls_are_not_sent(self):
+        engine = RecommendationEngine(cache=False, semantic_cache=False, latency_budget=0.1)
+        engine.executor = ThreadPoolExecutor(max_workers=1)
+        engine.client = FakeClient(SlowCompletions(0.6))
+        # Callers that time out while their call waits behind the busy worker leave nothing upstream
+        for _ in range(4):
+            self.assertEqual(engine.explain("North Indian", DF)["source"], "fallback")
+        engine.executor.shutdown(wait=True)
+        self.assertEqual(engine.client.chat.completions.calls, 1)
+        # A call that only reaches a worker after its deadline is skipped
+        self.assertIsNone(engine._complete(engine._prepare("Cafe", DF), 0.1, time.monotonic()))
+        self.assertEqual(engine.client.chat.completions.calls, 1)
+
+    def test_missing_key_serves_fallback(self):
+        engine = RecommendationEngine(cache=False)
+        engine.client = None
+        self.assertEqual(engine.explain("Cafe", DF)["source"], "fallback")
+        print("Phase 3 Test Passed: Latency budget and template fallback verified.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import tempfile
+import pandas as pd
+from llm_cache import LLMResponseCache, make_cache_key
+from llm_engine import RecommendationEngine
+from fakes import FakeClient, FakeCompletions
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "llm.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_is_canonical(self):
+        a = make_cache_key("m", "sys", "prefs", [{"name": "A", "rating": 4.1}])
+        b = make_cache_key("m", "sys", "prefs", [{"rating": 4.1, "name": "A"}])
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, make_cache_key("other-model", "sys", "prefs", [{"name": "A", "rating": 4.1}]))
+
+    def test_ttl_eviction_and_persistence(self):
+        cache = LLMResponseCache(self.path, max_entries=2)
+        for key in ["a", "b", "c"]:
+            cache.put(key, f"text {key}")
+        cache.get("a")
+        cache.purge()
+        self.assertEqual(cache.count(), 2)
+        self.assertIsNone(cache.get("b"))
+        cache.close()
+
+        reopened = LLMResponseCache(self.path, ttl_seconds=-1)
+        self.assertEqual(reopened.get("a"), "text a")
+        reopened.put("d", "expired")
+        self.assertIsNone(reopened.get("d"))
+        reopened.close()
+
+    def test_engine_skips_network_on_repeat(self):
+        cache = LLMResponseCache(self.path)
+        engine = RecommendationEngine(cache=cache)
+        completions = FakeCompletions()
+        engine.client = FakeClient(completions)
+        df = pd.DataFrame([{
+            'restaurant name': 'Test Cafe', 'area': 'Indore', 'cuisines type': 'Cafe',
+            'rate (out of 5)': 4.5, 'avg cost (two people)': 500
+        }])
+        first = engine.get_recommendations("I want a cafe in Indore", df)
+        second = engine.get_recommendations("I want a cafe in Indore", df)
+        self.assertEqual(first, second)
+        self.assertEqual(completions.calls, 1)
+
+        # The stream replays cached text, and a streamed completion is cached once complete
+        self.assertEqual(list(engine.get_recommendations_stream("I want a cafe in Indore", df)), [first])
+        chunks = list(engine.get_recommendations_stream("Any cafe", df))
+        self.assertEqual(chunks, ["Streamed ", "response #2"])
+        self.assertEqual(engine.get_recommendations("Any cafe", df), "Streamed response #2")
+        self.assertEqual(completions.calls, 2)
+        cache.close()
+        print("Phase 3 Test Passed: LLM response cache verified.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import asyncio
+import socket
+import unittest
+import pandas as pd
+from async_engine import AsyncRecommendationEngine
+from llm_engine import RecommendationEngine
+from mock_groq_server import MockGroqServer
+
+DF = pd.DataFrame([
+    {'restaurant name': 'Meghana Foods', 'area': 'Koramangala', 'cuisines type': 'Biryani',
+     'rate (out of 5)': 4.4, 'avg cost (two people)': 600},
+    {'restaurant name': 'Truffles', 'area': 'Koramangala', 'cuisines type': 'Cafe, Burger',
+     'rate (out of 5)': 4.2, 'avg cost (two people)': 900},
+])
+
+class TestMockGroq(unittest.TestCase):
+    """End-to-end through the real `groq` client against the local mock API (no network, no key)."""
+
+    def setUp(self):
+        self.mock = MockGroqServer(latency_median=0.01, tokens_per_second=0, seed=3)
+        self.base_url = self.mock.start_background()
+        self.engine = RecommendationEngine(cache=False, semantic_cache=False, base_url=self.base_url)
+
+    def tearDown(self):
+        self.mock.stop()
+
+    def test_completion_and_stream(self):
+        result = self.engine.explain("Biryani in Koramangala", DF)
+        self.assertEqual(result["source"], "llm")
+        self.assertIn("1. Meghana Foods", result["text"])
+        chunks = list(self.engine.explain_stream("Cafe in Koramangala", DF))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(c["text"] for c in chunks), MockGroqServer.reply_for([{"content": self.engine._prepare("x", DF).messages[1]["content"]}]))
+        self.assertEqual(self.engine.metrics.snapshot()["calls"], 2)
+
+    def test_errors_and_rate_limits_fall_back(self):
+        self.mock.error_rate = 1.0
+        self.assertEqual(self.engine.explain("Biryani", DF)["source"], "fallback")
+        self.mock.error_rate, self.mock.rate_limit_rate = 0.0, 1.0
+        self.assertEqual(self.engine.explain("Biryani", DF)["source"], "fallback")
+        self.assertEqual((self.mock.stats["errors"], self.mock.stats["rate_limited"]), (1, 1))
+
+    def test_malformed_request_gets_400(self):
+        host, port = self.base_url.rsplit("//", 1)[1].split(":")
+        with socket.create_connection((host, int(port)), timeout=5) as sock:
+            sock.sendall(b"POST /openai/v1/chat/completions HTTP/1.1\r\nContent-Length: many\r\n\r\n")
+            self.assertTrue(sock.recv(4096).startswith(b"HTTP/1.1 400 "))
+
+    def test_async_engine_coalesces_against_mock(self):
+        self.mock.latency_median = 0.1
+        engine = AsyncRecommendationEngine(self.engine)
+        async def run():
+            return await asyncio.gather(*[engine.explain("Biryani", DF) for _ in range(10)])
+        results = asyncio.run(run())
+        self.assertTrue(all(r["source"] == "llm" for r in results))
+        self.assertEqual(self.mock.stats["requests"], 1)
+        print("Phase 3 Test Passed: Mock Groq server round trips verified.")
+
+if __name__ == "__main__":
+    unittest.main()
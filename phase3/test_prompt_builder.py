@@ -0,0 +1,47 @@
+import unittest
+import pandas as pd
+from prompt_builder import TokenMetrics, build_prompt, estimate_tokens, prompt_records
+
+DF = pd.DataFrame([
+    {'restaurant name': f'Restaurant {i}', 'area': 'Koramangala', 'cuisines type': 'North Indian, Chinese, Biryani',
+     'rate (out of 5)': 4.5 - i / 10, 'avg cost (two people)': 600 + 100 * i, 'num of ratings': 1000}
+    for i in range(5)
+])
+
+class TestPromptBuilder(unittest.TestCase):
+    def test_compact_table(self):
+        records = prompt_records(DF)
+        prompt, rows, tokens = build_prompt({'cuisine': 'North Indian', 'rating': 0, 'location': 'Koramangala'}, records)
+        self.assertEqual(len(rows), 5)
+        self.assertIn("User preferences: cuisine: North Indian; location: Koramangala\n", prompt)
+        self.assertIn("name|location|rating|cost_for_two|cuisines\nRestaurant 0|Koramangala|4.5|600|North Indian, Chinese, Biryani", prompt)
+        self.assertNotIn("{", prompt)
+        # Smaller than the old repr-of-dicts serialization
+        self.assertLess(tokens, estimate_tokens(f"Available Restaurants:\n{records}"))
+
+    def test_budget_drops_lowest_ranked_rows(self):
+        records = prompt_records(DF)
+        full = build_prompt("North Indian", records)[2]
+        prompt, rows, tokens = build_prompt("North Indian", records, token_budget=full - 10)
+        self.assertLessEqual(tokens, full - 10)
+        self.assertEqual([r['name'] for r in rows], [f'Restaurant {i}' for i in range(len(rows))])
+        self.assertLess(len(rows), 5)
+
+        prompt, rows, tokens = build_prompt("very long preference text " * 50, records, token_budget=130)
+        self.assertEqual(len(rows), 1)
+        self.assertLessEqual(tokens, 130)
+        self.assertIn("User preferences: very long", prompt)
+
+    def test_metrics(self):
+        metrics = TokenMetrics()
+        metrics.record_completion([{"content": "hello world"}], "fine thanks")
+        usage = type("Usage", (), {"prompt_tokens": 120, "completion_tokens": 40})
+        metrics.record_completion([{"content": "ignored"}], "ignored", usage)
+        stats = metrics.snapshot()
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["prompt_tokens"], estimate_tokens("hello world") + 120)
+        self.assertEqual(stats["completion_tokens"], estimate_tokens("fine thanks") + 40)
+        print("Phase 3 Test Passed: Compact token-budgeted prompts verified.")
+
+if __name__ == "__main__":
+    unittest.main()
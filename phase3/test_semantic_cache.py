@@ -0,0 +1,33 @@
+import unittest
+import pandas as pd
+from llm_engine import RecommendationEngine
+from semantic_cache import SemanticResponseCache, candidate_key
+from fakes import FakeClient, FakeCompletions
+
+DF = pd.DataFrame([{
+    'restaurant name': 'Third Wave Coffee', 'area': 'BTM', 'cuisines type': 'Cafe',
+    'rate (out of 5)': 4.3, 'avg cost (two people)': 800
+}])
+
+class TestSemanticCache(unittest.TestCase):
+    def test_paraphrase_hits_only_for_same_candidates(self):
+        cache = SemanticResponseCache(threshold=0.87)
+        shortlist = candidate_key([{"name": "Third Wave Coffee"}])
+        cache.add("I'm looking for Cafe food in BTM with a Mid budget.", shortlist, "Try Third Wave.")
+        self.assertEqual(cache.lookup("Looking for cafe food in BTM, mid budget", shortlist)[0], "Try Third Wave.")
+        self.assertIsNone(cache.lookup("What are the hottest trending restaurants?", shortlist))
+        self.assertIsNone(cache.lookup("I'm looking for Cafe food in BTM with a Mid budget.", candidate_key([{"name": "Other"}])))
+
+    def test_engine_reuses_paraphrased_answer(self):
+        completions = FakeCompletions()
+        engine = RecommendationEngine(cache=False, semantic_cache=SemanticResponseCache(threshold=0.87))
+        engine.client = FakeClient(completions)
+        first = engine.explain("I'm looking for Cafe food in BTM with a Mid budget.", DF)
+        second = engine.explain("Looking for cafe food in BTM, mid budget", DF)
+        self.assertEqual((first["source"], second["source"]), ("llm", "semantic"))
+        self.assertEqual(second["text"], first["text"])
+        self.assertEqual(completions.calls, 1)
+        print("Phase 3 Test Passed: Semantic near-duplicate cache verified.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import threading
+import unittest
+import pandas as pd
+import llm_engine
+from llm_engine import LLM_POOL_SIZE, RecommendationEngine, connection_limits, get_shared_engine
+from mock_groq_server import MockGroqServer
+
+DF = pd.DataFrame([
+    {'restaurant name': 'Meghana Foods', 'area': 'Koramangala', 'cuisines type': 'Biryani',
+     'rate (out of 5)': 4.4, 'avg cost (two people)': 600},
+])
+
+class TestSharedEngine(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockGroqServer(latency_median=0.0, tokens_per_second=0, seed=1)
+        self.base_url = self.mock.start_background()
+
+    def tearDown(self):
+        self.mock.stop()
+        llm_engine._shared_engine = None
+
+    def test_shared_engine_is_a_singleton(self):
+        llm_engine._shared_engine = None
+        engines = []
+        threads = [threading.Thread(target=lambda: engines.append(get_shared_engine(warm_up=False))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(all(e is engines[0] for e in engines))
+
+    def test_pool_limits(self):
+        limits = connection_limits()
+        self.assertEqual(limits.max_connections, LLM_POOL_SIZE)
+        self.assertEqual(limits.max_keepalive_connections, LLM_POOL_SIZE)
+
+    def test_warm_up_connection_is_reused(self):
+        engine = RecommendationEngine(cache=False, semantic_cache=False, base_url=self.base_url)
+        self.assertTrue(engine.warm_up())
+        for query in ("Biryani", "Biryani in Koramangala", "Cheap biryani"):
+            self.assertEqual(engine.explain(query, DF)["source"], "llm")
+        # Warm-up and all three completions went over one kept-alive connection
+        self.assertEqual(self.mock.stats["connections"], 1)
+        self.assertEqual(self.mock.stats["requests"], 3)
+
+    def test_warm_up_failure_is_not_fatal(self):
+        self.mock.stop()
+        engine = RecommendationEngine(cache=False, semantic_cache=False, base_url=self.base_url)
+        self.assertFalse(engine.warm_up(timeout=0.5))
+        print("Phase 3 Test Passed: Shared engine and connection pooling verified.")
+
+if __name__ == '__main__':
+    unittest.main()
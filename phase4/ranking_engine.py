@@ -1,33 +1,80 @@
-import pandas as pd
-import os
+import numpy as np
+from phase2.result_set import as_result_set
 
-def rank_restaurants(filtered_df):
+def compute_scores(ratings, votes):
     """
-    Ranks filtered restaurants based on a combination of rating and popularity (votes).
+    Scoring formula: 70% rating + 30% normalized votes.
+    Returns (normalized_votes, score) arrays.
     """
-    if filtered_df.empty:
-        return filtered_df
+    ratings = np.asarray(ratings, dtype=float)
+    votes = np.asarray(votes, dtype=float)
 
-    # Scoring formula: 70% rating + 30% normalized votes
     # Normalize 'num of ratings' (votes) to 0-5 scale
-    max_votes = filtered_df['num of ratings'].max()
+    max_votes = votes.max() if len(votes) else 0
     if max_votes > 0:
-        filtered_df['normalized_votes'] = (filtered_df['num of ratings'] / max_votes) * 5
+        normalized_votes = (votes / max_votes) * 5
     else:
-        filtered_df['normalized_votes'] = 0
+        normalized_votes = np.zeros(len(votes))
+
+    return normalized_votes, (ratings * 0.7) + (normalized_votes * 0.3)
+
+def rank_restaurants(filtered_df):
+    """
+    Ranks filtered restaurants based on a combination of rating and popularity (votes).
+    Returns a new frame with `normalized_votes` and `score` columns; the input is not modified.
+    """
+    if filtered_df.empty:
+        return filtered_df
 
-    filtered_df['score'] = (filtered_df['rate (out of 5)'] * 0.7) + (filtered_df['normalized_votes'] * 0.3)
+    normalized_votes, score = compute_scores(filtered_df['rate (out of 5)'], filtered_df['num of ratings'])
+    ranked_df = filtered_df.assign(normalized_votes=normalized_votes, score=score)
     
     # Sort by score descending
-    ranked_df = filtered_df.sort_values(by='score', ascending=False)
+    ranked_df = ranked_df.sort_values(by='score', ascending=False)
     
     return ranked_df
 
+def rank_result_set(result_set):
+    """
+    Copy-free ranking: computes score arrays for a ResultSet (or DataFrame)
+    and returns a ResultSet ordered by score descending.
+    """
+    result_set = as_result_set(result_set)
+    normalized_votes, score = compute_scores(result_set.column('rate (out of 5)'), result_set.column('num of ratings'))
+    # Ties are broken by row id so the order is deterministic
+    order = np.lexsort((result_set.row_ids, -score))
+    return result_set.with_arrays(normalized_votes=normalized_votes, score=score).take(order)
+
+def rank_top_k(result_set, k):
+    """
+    Top-k ranking in O(N): scores are computed as arrays, `argpartition` selects the
+    k winners and only those k are sorted (score descending, then row id ascending).
+    Returns a ResultSet of at most k rows; callers that only render k rows should use this.
+    """
+    result_set = as_result_set(result_set)
+    if k <= 0:
+        return result_set.take(np.empty(0, dtype=int))
+    if k >= len(result_set):
+        return rank_result_set(result_set)
+
+    normalized_votes, score = compute_scores(result_set.column('rate (out of 5)'), result_set.column('num of ratings'))
+    kth_score = score[np.argpartition(-score, k - 1)[k - 1]]
+
+    # Everything strictly above the k-th score wins; ties at the boundary go to the lowest row ids
+    above = np.flatnonzero(score > kth_score)
+    tied = np.flatnonzero(score == kth_score)
+    tied = tied[np.argsort(result_set.row_ids[tied], kind='stable')][:k - len(above)]
+    winners = np.concatenate([above, tied])
+
+    order = winners[np.lexsort((result_set.row_ids[winners], -score[winners]))]
+    return result_set.with_arrays(normalized_votes=normalized_votes, score=score).take(order)
+
 if __name__ == "__main__":
+    from phase1.data_loader import load_zomato_data
     from phase2.recommender_core import filter_restaurants
-    
-    if os.path.exists("zomato_data.csv"):
-        df = pd.read_csv("zomato_data.csv")
+
+    df = load_zomato_data(fetch_if_missing=False)
+    if df is not None:
         filtered = filter_restaurants(df, place="Bellandur", rating=3.5)
         ranked = rank_restaurants(filtered)
         print("Top 5 Ranked Restaurants in Bellandur:")
@@ -0,0 +1,165 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+
+# Add project root to path to import local modules
+sys.path.append(os.getcwd())
+
+from phase1.normalize import COL_RATE, PRICE_BUCKETS, normalize_dataset
+from phase2.indexes import ROW_ID_DTYPE, get_cuisine_index, get_location_index, get_price_bucket_index, get_sorted_index, normalize_token
+from phase2.query_planner import price_bucket_bounds
+from phase2.recommender_core import query_restaurants
+from phase2.result_set import ResultSet
+from phase4.ranking_engine import rank_top_k
+
+CUBE_DIR = "zomato_cube"
+CUBE_K = 5
+# The finite choices offered by the UI dropdowns (None = "Any Budget"), plus 0.0 for API calls without a rating
+CUBE_BUDGETS = [None] + PRICE_BUCKETS
+CUBE_RATINGS = [0.0, 3.0, 3.5, 4.0, 4.5]
+
+class ResultCube:
+    """
+    Precomputed ranked top-k row ids for every area x cuisine x budget x rating combination.
+    Cells are laid out densely, so a lookup is one linear-index computation plus two array reads;
+    arrays are memory-mapped from disk.
+    """
+
+    def __init__(self, base, meta, offsets, row_ids, scores):
+        self.base = base
+        self.meta = meta
+        self.offsets = offsets
+        self.row_ids = row_ids
+        self.scores = scores
+        # Slot 0 of the area/cuisine axes is "any"
+        self.area_slots = {normalize_token(a): i + 1 for i, a in enumerate(meta["areas"])}
+        self.cuisine_slots = {normalize_token(c): i + 1 for i, c in enumerate(meta["cuisines"])}
+        self.budget_slots = {b: i for i, b in enumerate(meta["budgets"])}
+        self.rating_slots = {r: i for i, r in enumerate(meta["ratings"])}
+        self.shape = (len(meta["areas"]) + 1, len(meta["cuisines"]) + 1, len(meta["budgets"]), len(meta["ratings"]))
+
+    def _cell(self, place, cuisine, price, rating):
+        area_slot = self.area_slots.get(normalize_token(place)) if place else 0
+        cuisine_slot = self.cuisine_slots.get(normalize_token(cuisine)) if cuisine else 0
+        budget_slot = self.budget_slots.get(price.lower() if price else None)
+        rating_slot = self.rating_slots.get(float(rating or 0.0))
+        if None in (area_slot, cuisine_slot, budget_slot, rating_slot):
+            return None
+        return np.ravel_multi_index((area_slot, cuisine_slot, budget_slot, rating_slot), self.shape)
+
+    def lookup(self, price=None, place=None, rating=0.0, cuisine=None, k=CUBE_K):
+        """
+        Ranked top-k ResultSet for a query, or None if the query is outside the cube
+        (free-form place/cuisine text, other rating thresholds, k larger than stored).
+        """
+        if k > self.meta["k"] or not isinstance(cuisine, (str, type(None))):
+            return None
+        cell = self._cell(place, cuisine, price, rating)
+        if cell is None:
+            return None
+        start, stop = self.offsets[cell], self.offsets[cell + 1]
+        stop = min(stop, start + k)
+        return ResultSet(self.base, self.row_ids[start:stop], {"score": np.asarray(self.scores[start:stop])})
+
+def top_k_restaurants(df, k, price=None, place=None, rating=0.0, cuisine=None, cube=None):
+    """
+    Ranked top-k ResultSet: an O(1) cube lookup for dropdown combinations,
+    falling back to the live filter/rank path for free-form input.
+    """
+    if cube is not None:
+        result = cube.lookup(price=price, place=place, rating=rating, cuisine=cuisine, k=k)
+        if result is not None:
+            return result
+    return rank_top_k(query_restaurants(df, price=price, place=place, rating=rating, cuisine=cuisine), k)
+
+def build_result_cube(df, cube_dir=CUBE_DIR, k=CUBE_K):
+    """
+    Offline build step: ranks every non-empty dropdown combination once and writes the
+    dense cell offsets, row ids and scores as `.npy` files plus a JSON manifest.
+    """
+    base_df = normalize_dataset(df)
+    location_index = get_location_index(base_df)
+    cuisine_index = get_cuisine_index(base_df)
+    rate_index = get_sorted_index(base_df, COL_RATE)
+    bucket_index = get_price_bucket_index(base_df)
+
+    areas = list(location_index.areas)
+    cuisines = [cuisine_index.display_names[t] for t in cuisine_index.postings]
+    area_rows = [np.arange(len(base_df), dtype=ROW_ID_DTYPE)] + list(location_index.area_rows)
+    # Same substring resolution as the live filter ("Chinese" includes "Indo Chinese")
+    cuisine_rows = [None] + [cuisine_index.rows(t) for t in cuisine_index.postings]
+    shape = (len(areas) + 1, len(cuisines) + 1, len(CUBE_BUDGETS), len(CUBE_RATINGS))
+
+    counts = np.zeros(int(np.prod(shape)), dtype=np.int64)
+    cell_rows, cell_scores = {}, {}
+    for a, rows_a in enumerate(area_rows):
+        for c, rows_c in enumerate(cuisine_rows):
+            rows = rows_a if rows_c is None else np.intersect1d(rows_a, rows_c, assume_unique=True)
+            if len(rows) == 0:
+                continue
+            for b, budget in enumerate(CUBE_BUDGETS):
+                rows_b = rows if budget is None else bucket_index.probe(rows, **price_bucket_bounds(budget))
+                for r, rating in enumerate(CUBE_RATINGS):
+                    rows_r = rate_index.probe(rows_b, low=rating) if rating > 0 else rows_b
+                    if len(rows_r) == 0:
+                        break  # Higher thresholds can only be emptier
+                    top = rank_top_k(ResultSet(base_df, rows_r), k)
+                    cell = np.ravel_multi_index((a, c, b, r), shape)
+                    counts[cell] = len(top)
+                    cell_rows[cell] = top.row_ids
+                    cell_scores[cell] = top.column("score")
+
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    row_ids = np.empty(offsets[-1], dtype=ROW_ID_DTYPE)
+    scores = np.empty(offsets[-1], dtype=np.float64)
+    for cell, rows in cell_rows.items():
+        row_ids[offsets[cell]:offsets[cell + 1]] = rows
+        scores[offsets[cell]:offsets[cell + 1]] = cell_scores[cell]
+
+    os.makedirs(cube_dir, exist_ok=True)
+    np.save(os.path.join(cube_dir, "offsets.npy"), offsets)
+    np.save(os.path.join(cube_dir, "row_ids.npy"), row_ids)
+    np.save(os.path.join(cube_dir, "scores.npy"), scores)
+    meta = {
+        "k": k,
+        "dataset_version": base_df.attrs.get("dataset_version"),
+        "areas": [str(a) for a in areas],
+        "cuisines": cuisines,
+        "budgets": CUBE_BUDGETS,
+        "ratings": CUBE_RATINGS,
+        "cells": len(cell_rows),
+    }
+    with open(os.path.join(cube_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return meta
+
+def load_result_cube(df, cube_dir=CUBE_DIR):
+    """
+    Loads the cube for `df` (memory-mapped), or returns None if it is missing or was
+    built from a different dataset version.
+    """
+    meta_path = os.path.join(cube_dir, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    base_df = normalize_dataset(df)
+    version = base_df.attrs.get("dataset_version")
+    if version is None or meta.get("dataset_version") != version:
+        return None
+    arrays = [np.load(os.path.join(cube_dir, name), mmap_mode="r") for name in ("offsets.npy", "row_ids.npy", "scores.npy")]
+    return ResultCube(base_df, meta, *arrays)
+
+if __name__ == "__main__":
+    from phase1.data_loader import load_zomato_data
+
+    df = load_zomato_data(fetch_if_missing=False)
+    if df is None:
+        print("Data file not found. Run Phase 1 first.")
+    else:
+        start = time.time()
+        meta = build_result_cube(df)
+        print(f"Result cube built: {meta['cells']} non-empty combinations in {time.time() - start:.1f}s -> {CUBE_DIR}/")
@@ -1,7 +1,8 @@
 import unittest
 import pandas as pd
 import os
-from ranking_engine import rank_restaurants
+import numpy as np
+from ranking_engine import rank_restaurants, rank_result_set, rank_top_k
 
 class TestPhase4(unittest.TestCase):
     def test_ranking_logic(self):
@@ -18,5 +19,34 @@ class TestPhase4(unittest.TestCase):
         self.assertEqual(ranked.iloc[0]['restaurant name'], 'Mid Rating High Votes')
         print("Phase 4 Test Passed: Ranking logic verified.")
 
+    def test_result_set_ranking_is_copy_free(self):
+        """Ranking a ResultSet adds score arrays without touching the base table."""
+        dummy_data = pd.DataFrame([
+            {'restaurant name': 'A', 'rate (out of 5)': 3.0, 'num of ratings': 10},
+            {'restaurant name': 'B', 'rate (out of 5)': 5.0, 'num of ratings': 10},
+            {'restaurant name': 'C', 'rate (out of 5)': 4.0, 'num of ratings': 1000},
+        ])
+        ranked = rank_result_set(dummy_data)
+        self.assertEqual(ranked.row_ids.tolist(), [2, 1, 0])
+        self.assertNotIn('score', dummy_data.columns)
+        top = ranked.head(1).to_frame()
+        self.assertEqual(top['restaurant name'].tolist(), ['C'])
+        self.assertAlmostEqual(top['score'].iloc[0], 4.3)
+        self.assertEqual(rank_restaurants(dummy_data)['restaurant name'].tolist(), ['C', 'B', 'A'])
+        self.assertNotIn('score', dummy_data.columns)
+
+    def test_top_k_matches_full_sort(self):
+        """argpartition top-k returns the same rows as a full sort, with ties broken by row id."""
+        rng = np.random.default_rng(7)
+        dummy_data = pd.DataFrame({
+            'rate (out of 5)': rng.choice([3.5, 4.0, 4.5], 500),
+            'num of ratings': rng.choice([100, 1000], 500),
+        })
+        full = rank_result_set(dummy_data)
+        for k in [1, 3, 5, 50, 500, 600]:
+            top = rank_top_k(dummy_data, k)
+            self.assertEqual(top.row_ids.tolist(), full.row_ids[:k].tolist())
+            self.assertEqual(top.column('score').tolist(), full.column('score')[:k].tolist())
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import itertools
+import tempfile
+import numpy as np
+import pandas as pd
+from result_cube import build_result_cube, load_result_cube, top_k_restaurants
+from ranking_engine import rank_top_k
+from phase1.normalize import normalize_dataset
+from phase2.recommender_core import query_restaurants
+
+class TestResultCube(unittest.TestCase):
+    def test_cube_matches_live_path(self):
+        """Every cube cell must equal the live filter + rank result."""
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame({
+            'restaurant name': [f'R{i}' for i in range(300)],
+            'area': rng.choice(['BTM', 'Indiranagar', 'Koramangala 5th Block'], 300),
+            'cuisines type': rng.choice(['Cafe', 'North Indian, Chinese', 'Biryani, North Indian'], 300),
+            'rate (out of 5)': rng.choice([2.9, 3.2, 3.7, 4.1, 4.6], 300),
+            'num of ratings': rng.integers(0, 2000, 300),
+            'avg cost (two people)': rng.choice([300, 500, 900, 1500, 2000], 300),
+        })
+        df = normalize_dataset(df)
+        df.attrs['dataset_version'] = 'test'
+
+        with tempfile.TemporaryDirectory() as cube_dir:
+            build_result_cube(df, cube_dir, k=5)
+            cube = load_result_cube(df, cube_dir)
+            self.assertIsNotNone(cube)
+
+            options = itertools.product([None, 'BTM', 'Indiranagar'], [None, 'Cafe', 'North Indian'],
+                                        [None, 'budget', 'mid', 'premium'], [0.0, 3.5, 4.5])
+            for place, cuisine, price, rating in options:
+                cached = cube.lookup(price=price, place=place, rating=rating, cuisine=cuisine, k=3)
+                live = rank_top_k(query_restaurants(df, price=price, place=place, rating=rating, cuisine=cuisine), 3)
+                self.assertEqual(cached.row_ids.tolist(), live.row_ids.tolist())
+
+            # Free-form input falls back to the live path
+            self.assertIsNone(cube.lookup(place='Koramangala'))
+            self.assertEqual(len(top_k_restaurants(df, 3, place='Koramangala', cube=cube)), 3)
+
+            # A cube built for another dataset version is ignored
+            other = df.copy()
+            other.attrs['dataset_version'] = 'other'
+            self.assertIsNone(load_result_cube(other, cube_dir))
+        print("Phase 4 Test Passed: Result cube verified.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import argparse
+import glob
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+try:
+    from phase5.shadow_kpt import ShadowKPTEstimator
+except ImportError:
+    from shadow_kpt import ShadowKPTEstimator
+
+# Order log columns (one row per delivered order)
+RESTAURANT, ORDER_START, RIDER_ARRIVAL, RIDER_PICKUP, MANUAL_READY = (
+    'restaurant_id', 'order_start_time', 'rider_arrival_time', 'rider_pickup_time', 'manual_ready_time'
+)
+TIME_COLUMNS = [ORDER_START, RIDER_ARRIVAL, RIDER_PICKUP, MANUAL_READY]
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+BIAS_PATH = "merchant_bias.npz"
+CHUNK_BYTES = 64 * 1024 * 1024
+
+def _epoch_ns(column):
+    """Timestamps (strings or datetimes) as int64 epoch nanoseconds; unparseable values become NaT."""
+    return pd.to_datetime(column, errors="coerce", utc=True).to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+def _byte_ranges(path, chunk_bytes):
+    """(header, [(start, end), ...]): line-aligned byte ranges of the CSV body, about `chunk_bytes` each."""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()  # Finish the current line so no row is split
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+def _process_range(path, header, start, end, chunk_id, n_partitions, spill_dir):
+    """
+    Worker: parses one byte range of the order log, computes Shadow KPT and marking bias with
+    int64 epoch arithmetic, and spills each restaurant partition to its own file.
+    Returns the number of valid orders.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    chunk = pd.read_csv(io.BytesIO(header + data), usecols=[RESTAURANT] + TIME_COLUMNS, dtype={RESTAURANT: str})
+    ids = chunk[RESTAURANT].fillna("").to_numpy(dtype=str)
+    start_ns, arrival_ns, pickup_ns, manual_ns = (_epoch_ns(chunk[c]) for c in TIME_COLUMNS)
+    nat = np.iinfo(np.int64).min
+    valid = (start_ns != nat) & (arrival_ns != nat) & (pickup_ns != nat) & (manual_ns != nat)
+    ids, start_ns, arrival_ns, pickup_ns, manual_ns = ids[valid], start_ns[valid], arrival_ns[valid], pickup_ns[valid], manual_ns[valid]
+
+    estimator = ShadowKPTEstimator()
+    shadow = estimator.estimate_true_kpt_batch(start_ns, arrival_ns, pickup_ns)
+    bias = estimator.detect_marking_bias_batch(manual_ns, shadow, start_ns)
+    # Stable across processes, so every order of a restaurant lands in the same partition
+    partition = pd.util.hash_array(ids.astype(object)) % n_partitions
+    for p in np.unique(partition):
+        rows = partition == p
+        np.savez(os.path.join(spill_dir, f"p{p}-c{chunk_id}.npz"), ids=ids[rows], shadow=shadow[rows], bias=bias[rows])
+    return int(valid.sum())
+
+def _group_quantiles(codes, values, quantiles):
+    """Linear-interpolated quantiles of `values` per group code, all groups at once."""
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    result = np.empty((len(starts), len(quantiles)))
+    for j, q in enumerate(quantiles):
+        position = starts + q * (counts - 1)
+        lo = np.floor(position).astype(np.int64)
+        hi = np.ceil(position).astype(np.int64)
+        result[:, j] = values[lo] + (values[hi] - values[lo]) * (position - lo)
+    return result
+
+def _summarize_partition(spill_dir, partition, quantiles):
+    """Worker: per-restaurant order count, mean Shadow KPT, mean and quantiles of marking bias."""
+    ids, shadow, bias = [], [], []
+    for spill in glob.glob(os.path.join(spill_dir, f"p{partition}-c*.npz")):
+        with np.load(spill, allow_pickle=False) as data:
+            ids.append(data["ids"])
+            shadow.append(data["shadow"])
+            bias.append(data["bias"])
+    if not ids:
+        return None
+    ids, shadow, bias = np.concatenate(ids), np.concatenate(shadow), np.concatenate(bias)
+    codes, restaurants = pd.factorize(ids, sort=True)
+    orders = np.bincount(codes)
+    return {
+        "restaurant_ids": np.asarray(restaurants, dtype=str),
+        "orders": orders,
+        "shadow_kpt_mean": np.bincount(codes, weights=shadow) / orders,
+        "bias_mean": np.bincount(codes, weights=bias) / orders,
+        "bias_quantiles": _group_quantiles(codes, bias, quantiles),
+    }
+
+def backfill(path, output_path=BIAS_PATH, chunk_bytes=CHUNK_BYTES, workers=None, n_partitions=None,
+             quantiles=QUANTILES, spill_dir=None):
+    """
+    Shadow KPT and marking bias for a whole historical order log.
+    The CSV is split into line-aligned byte ranges (rows must not contain quoted newlines); each
+    worker process parses its range, computes the signals with int64 epoch arithmetic and spills
+    them to per-restaurant-partition files. Partitions are then summarized in parallel, so no
+    process holds more than one range or one partition, and the per-merchant bias distributions
+    are written to one compressed .npz file. Returns the number of orders processed.
+    """
+    workers = workers or os.cpu_count() or 1
+    n_partitions = n_partitions or workers * 4
+    header, ranges = _byte_ranges(path, chunk_bytes)
+
+    with tempfile.TemporaryDirectory(dir=spill_dir, prefix="kpt_backfill_") as spill, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        processed = sum(pool.map(_process_range, *zip(*[
+            (path, header, start, end, chunk_id, n_partitions, spill) for chunk_id, (start, end) in enumerate(ranges)
+        ]))) if ranges else 0
+        summaries = [s for s in pool.map(_summarize_partition, [spill] * n_partitions, range(n_partitions),
+                                         [quantiles] * n_partitions) if s is not None]
+
+    if summaries:
+        result = {key: np.concatenate([s[key] for s in summaries]) for key in summaries[0]}
+    else:
+        result = {"restaurant_ids": np.empty(0, dtype=str), "orders": np.empty(0, dtype=np.int64),
+                  "shadow_kpt_mean": np.empty(0), "bias_mean": np.empty(0), "bias_quantiles": np.empty((0, len(quantiles)))}
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, quantiles=np.asarray(quantiles), **result)
+    os.replace(tmp_path, output_path)
+    return processed
+
+def load_merchant_bias(path=BIAS_PATH):
+    """Backfill output as a DataFrame indexed by restaurant id (one column per bias quantile)."""
+    with np.load(path, allow_pickle=False) as data:
+        frame = pd.DataFrame({
+            "orders": data["orders"],
+            "shadow_kpt_mean": data["shadow_kpt_mean"],
+            "bias_mean": data["bias_mean"],
+        }, index=pd.Index(data["restaurant_ids"], name=RESTAURANT))
+        for j, q in enumerate(data["quantiles"]):
+            frame[f"bias_p{int(round(q * 100))}"] = data["bias_quantiles"][:, j]
+    return frame
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill Shadow KPT and per-merchant marking bias from an order log CSV")
+    parser.add_argument("orders_csv")
+    parser.add_argument("--output", default=BIAS_PATH)
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_BYTES // (1024 * 1024), help="CSV bytes parsed per task")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--spill-dir", default=None, help="where per-partition intermediate files go (default: system temp)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    n = backfill(args.orders_csv, args.output, chunk_bytes=args.chunk_mb * 1024 * 1024, workers=args.workers, spill_dir=args.spill_dir)
+    print(f"Backfilled {n:,} orders in {time.perf_counter() - started:.1f}s -> {args.output}")
@@ -0,0 +1,176 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_METERS = 6371008.8
+METERS_PER_DEGREE_LAT = 111320.0
+# Pings closer than this to a geofence boundary cross it on GPS noise alone; shorter dwells are dropped
+MIN_DWELL_SECONDS = 30.0
+
+DwellEvent = namedtuple("DwellEvent", ["rider_id", "restaurant_id", "arrival_time", "pickup_time"])
+
+def haversine_meters(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters, elementwise over arrays of degrees."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(1.0, a)))
+
+class RestaurantGrid:
+    """
+    Uniform grid over restaurant coordinates. Cells are at least `cell_size_meters` wide in both
+    directions, so every restaurant within that distance of a point lies in the point's 3x3 block
+    of cells. Restaurants are stored sorted by cell key; a cell is a contiguous slice.
+    """
+
+    def __init__(self, restaurant_ids, lats, lons, cell_size_meters=100.0):
+        self.cell_size = cell_size_meters
+        self.restaurant_ids = list(restaurant_ids)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        max_lat = float(np.max(np.abs(self.lats))) if len(self.lats) else 0.0
+        self.cell_lat = cell_size_meters / METERS_PER_DEGREE_LAT
+        # Longitude degrees shrink towards the poles; size cells for the widest-latitude restaurant
+        self.cell_lon = cell_size_meters / (METERS_PER_DEGREE_LAT * max(np.cos(np.radians(min(max_lat + 1.0, 89.0))), 1e-6))
+
+        keys = self._keys(*self._cells(self.lats, self.lons))
+        self.order = np.argsort(keys, kind="stable")
+        self.cell_keys, self.cell_starts, self.cell_counts = np.unique(keys[self.order], return_index=True, return_counts=True)
+
+    def _cells(self, lats, lons):
+        return np.floor(lats / self.cell_lat).astype(np.int64), np.floor(lons / self.cell_lon).astype(np.int64)
+
+    @staticmethod
+    def _keys(rows, cols):
+        return (rows << 32) + (cols & 0xFFFFFFFF)
+
+    def candidates(self, lats, lons):
+        """(ping index, restaurant index) pairs for every restaurant in each point's 3x3 cell block."""
+        rows, cols = self._cells(lats, lons)
+        ping_parts, restaurant_parts = [], []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                keys = self._keys(rows + dr, cols + dc)
+                pos = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+                hit = self.cell_keys[pos] == keys
+                counts = np.where(hit, self.cell_counts[pos], 0)
+                total = int(counts.sum())
+                if not total:
+                    continue
+                pings = np.repeat(np.arange(len(keys)), counts)
+                # Offset of each pair inside its cell's slice
+                within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                ping_parts.append(pings)
+                restaurant_parts.append(self.order[self.cell_starts[pos[pings]] + within])
+        if not ping_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(ping_parts), np.concatenate(restaurant_parts)
+
+    def nearest_within(self, lats, lons, radius_meters):
+        """Index of the nearest restaurant within `radius_meters` of each point, or -1."""
+        lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+        nearest = np.full(len(lats), -1, dtype=np.int64)
+        if not len(self.cell_keys):
+            return nearest
+        pings, restaurants = self.candidates(lats, lons)
+        distance = haversine_meters(lats[pings], lons[pings], self.lats[restaurants], self.lons[restaurants])
+        inside = distance <= radius_meters
+        pings, restaurants, distance = pings[inside], restaurants[inside], distance[inside]
+        # Closest first within each ping, then keep the first pair per ping
+        by_distance = np.lexsort((distance, pings))
+        pings, restaurants = pings[by_distance], restaurants[by_distance]
+        first = np.ones(len(pings), dtype=bool)
+        first[1:] = pings[1:] != pings[:-1]
+        nearest[pings[first]] = restaurants[first]
+        return nearest
+
+class GeofenceDwellDetector:
+    """
+    Streaming dwell detection over raw rider GPS pings.
+    Each `ingest` call takes a batch of pings (rider ids, coordinates, epoch-second timestamps),
+    resolves which restaurant geofence each ping is inside with one vectorized grid lookup, and
+    compares it with the rider's previous ping (carried across batches in array-backed state).
+    Entering a geofence marks the arrival; the last ping inside before leaving marks the pickup.
+    """
+
+    def __init__(self, grid, radius_meters=100.0, min_dwell_seconds=MIN_DWELL_SECONDS, capacity=1024):
+        if radius_meters > grid.cell_size:
+            # Only the 3x3 block of cells around a ping is searched
+            raise ValueError(f"Geofence radius {radius_meters}m exceeds the grid cell size {grid.cell_size}m")
+        self.grid = grid
+        self.radius = radius_meters
+        self.min_dwell_seconds = min_dwell_seconds
+        self.rider_ids = []
+        self.rider_index = {}
+        # Per rider row: geofence currently inside (-1 for none), when it was entered, last ping time
+        self.inside = np.full(capacity, -1, dtype=np.int64)
+        self.entered_at = np.zeros(capacity, dtype=np.float64)
+        self.last_seen = np.zeros(capacity, dtype=np.float64)
+        self.stats = {"pings": 0, "arrivals": 0, "dwells": 0, "short_dwells": 0}
+
+    def _rows(self, rider_ids):
+        unique, inverse = np.unique(np.asarray(rider_ids), return_inverse=True)
+        rows = np.empty(len(unique), dtype=np.int64)
+        for i, rider in enumerate(unique.tolist()):
+            row = self.rider_index.get(rider)
+            if row is None:
+                row = self.rider_index[rider] = len(self.rider_ids)
+                self.rider_ids.append(rider)
+            rows[i] = row
+        if len(self.rider_ids) > len(self.inside):
+            grow = max(len(self.rider_ids), 2 * len(self.inside)) - len(self.inside)
+            self.inside = np.concatenate([self.inside, np.full(grow, -1, dtype=np.int64)])
+            self.entered_at = np.concatenate([self.entered_at, np.zeros(grow)])
+            self.last_seen = np.concatenate([self.last_seen, np.zeros(grow)])
+        return rows[inverse.reshape(-1)]
+
+    def ingest(self, rider_ids, lats, lons, timestamps):
+        """Processes one batch of pings; returns the DwellEvents completed in it (rider left the geofence)."""
+        if not len(timestamps):
+            return []
+        rows = self._rows(rider_ids)
+        times = np.asarray(timestamps, dtype=np.float64)
+        fence = self.grid.nearest_within(lats, lons, self.radius)
+        self.stats["pings"] += len(times)
+
+        # Each rider's pings in time order, riders one after another
+        order = np.lexsort((times, rows))
+        rows, times, fence = rows[order], times[order], fence[order]
+        n = len(rows)
+        first = np.ones(n, dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        prev_fence = np.where(first, self.inside[rows], np.roll(fence, 1))
+        prev_time = np.where(first, self.last_seen[rows], np.roll(times, 1))
+        changed = fence != prev_fence
+
+        # Start time of the geofence stay each ping belongs to: the latest change in this rider's
+        # pings, or the stay carried over from earlier batches
+        group_start = np.maximum.accumulate(np.where(first, np.arange(n), 0))
+        last_change = np.maximum.accumulate(np.where(changed, np.arange(n), -1))
+        carried = last_change < group_start
+        stay_start = np.where(carried, self.entered_at[rows], times[np.maximum(last_change, 0)])
+        prev_stay_start = np.where(first, self.entered_at[rows], np.roll(stay_start, 1))
+
+        self.stats["arrivals"] += int((changed & (fence >= 0)).sum())
+        exits = np.flatnonzero(changed & (prev_fence >= 0))
+        dwell = prev_time[exits] - prev_stay_start[exits]
+        long_enough = dwell >= self.min_dwell_seconds
+        self.stats["short_dwells"] += int((~long_enough).sum())
+        exits = exits[long_enough]
+        self.stats["dwells"] += len(exits)
+
+        last = np.ones(n, dtype=bool)
+        last[:-1] = rows[1:] != rows[:-1]
+        self.inside[rows[last]] = fence[last]
+        self.entered_at[rows[last]] = stay_start[last]
+        self.last_seen[rows[last]] = times[last]
+
+        arrivals = pd.to_datetime(prev_stay_start[exits], unit="s")
+        pickups = pd.to_datetime(prev_time[exits], unit="s")
+        return [
+            DwellEvent(self.rider_ids[rows[i]], self.grid.restaurant_ids[prev_fence[i]], arrival, pickup)
+            for i, arrival, pickup in zip(exits.tolist(), arrivals, pickups)
+        ]
+
+    def snapshot_stats(self):
+        return {**self.stats, "riders": len(self.rider_ids), "riders_inside": int((self.inside[:len(self.rider_ids)] >= 0).sum())}
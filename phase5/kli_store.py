@@ -0,0 +1,111 @@
+import os
+import numpy as np
+
+try:
+    from phase5.kpt_engine import COMPLEXITY_LEVELS, KPTEngine
+except ImportError:
+    from kpt_engine import COMPLEXITY_LEVELS, KPTEngine
+
+class KitchenLoadStore:
+    """
+    Event-driven Kitchen Load Index for every restaurant.
+    Restaurant ids are interned to rows of flat NumPy arrays (active order counts per complexity
+    level, rush factor, current KLI). Each order-placed / order-picked-up event updates one row in
+    O(1), so reading a kitchen's load is a single array lookup instead of re-summing its orders.
+    KLI values are identical to `KPTEngine.calculate_kli` over the same open orders.
+    """
+
+    def __init__(self, capacity=1024, complexity_weights=None):
+        self.weights = np.array([(complexity_weights or KPTEngine().complexity_weights)[level] for level in COMPLEXITY_LEVELS])
+        self.default_level = COMPLEXITY_LEVELS.index('Medium')
+        self.ids = []
+        self.index = {}
+        self.counts = np.zeros((capacity, len(COMPLEXITY_LEVELS)), dtype=np.int32)
+        self.rush_factors = np.ones(capacity, dtype=np.float64)
+        self.kli = np.zeros(capacity, dtype=np.float64)
+        # order id -> (row, complexity level) for orders not yet picked up
+        self.open_orders = {}
+
+    def _row(self, restaurant_id):
+        row = self.index.get(restaurant_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self.kli):
+                self._grow()
+            self.index[restaurant_id] = row
+            self.ids.append(restaurant_id)
+        return row
+
+    def _grow(self):
+        capacity = max(1, len(self.kli)) * 2
+        self.counts = np.concatenate([self.counts, np.zeros((capacity - len(self.counts), self.counts.shape[1]), dtype=np.int32)])
+        self.rush_factors = np.concatenate([self.rush_factors, np.ones(capacity - len(self.rush_factors))])
+        self.kli = np.concatenate([self.kli, np.zeros(capacity - len(self.kli))])
+
+    def _refresh(self, row):
+        # Same arithmetic as calculate_kli: summed weights times the rush factor, rounded
+        total = float(self.counts[row] @ self.weights)
+        self.kli[row] = round(total * float(self.rush_factors[row]), 2)
+
+    def order_placed(self, restaurant_id, order_id, complexity='Medium'):
+        if order_id in self.open_orders:
+            return
+        row = self._row(restaurant_id)
+        level = COMPLEXITY_LEVELS.index(complexity) if complexity in COMPLEXITY_LEVELS else self.default_level
+        self.open_orders[order_id] = (row, level)
+        self.counts[row, level] += 1
+        self._refresh(row)
+
+    def order_picked_up(self, order_id):
+        """Removes a picked-up order from its kitchen's load; False for unknown or repeated events."""
+        entry = self.open_orders.pop(order_id, None)
+        if entry is None:
+            return False
+        row, level = entry
+        self.counts[row, level] -= 1
+        self._refresh(row)
+        return True
+
+    def set_rush_factor(self, restaurant_id, factor):
+        row = self._row(restaurant_id)
+        self.rush_factors[row] = factor
+        self._refresh(row)
+
+    def get_kli(self, restaurant_id):
+        row = self.index.get(restaurant_id)
+        return 0.0 if row is None else float(self.kli[row])
+
+    def kli_array(self):
+        """Current KLI of every known restaurant, aligned with `self.ids` (a view, not a copy)."""
+        return self.kli[:len(self.ids)]
+
+    def active_orders(self, restaurant_id):
+        row = self.index.get(restaurant_id)
+        return 0 if row is None else int(self.counts[row].sum())
+
+    def snapshot(self, path):
+        """Writes the full state to an .npz file atomically (ids must be ints or strings)."""
+        n = len(self.ids)
+        order_ids = list(self.open_orders)
+        order_rows = np.array([self.open_orders[o] for o in order_ids], dtype=np.int64).reshape(-1, 2)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, ids=np.asarray(self.ids), counts=self.counts[:n], rush_factors=self.rush_factors[:n],
+                     weights=self.weights, order_ids=np.asarray(order_ids), order_rows=order_rows)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def restore(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            weights = data["weights"]
+            store = cls(capacity=max(1, len(data["ids"])),
+                        complexity_weights=dict(zip(COMPLEXITY_LEVELS, weights.tolist())))
+            store.ids = data["ids"].tolist()
+            store.index = {rid: row for row, rid in enumerate(store.ids)}
+            n = len(store.ids)
+            store.counts[:n] = data["counts"]
+            store.rush_factors[:n] = data["rush_factors"]
+            store.open_orders = {o: (int(row), int(level)) for o, (row, level) in zip(data["order_ids"].tolist(), data["order_rows"])}
+        for row in range(n):
+            store._refresh(row)
+        return store
@@ -2,13 +2,40 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+# Column order of the complexity-count arrays taken by the batch functions
+COMPLEXITY_LEVELS = ('Simple', 'Medium', 'Complex')
+# Confidence codes returned by get_kpt_confidence_batch index into this
+CONFIDENCE_LABELS = np.array(["Low", "Medium", "High"])
+CONFIDENCE_LOW, CONFIDENCE_MEDIUM, CONFIDENCE_HIGH = 0, 1, 2
+
+def round_like_python(values, decimals=2):
+    """
+    Vectorized `round(x, decimals)` with Python's exact result. np.round scales by 10**decimals
+    first, which can tip values sitting next to a .5 boundary; those few are rounded by Python.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 10.0 ** decimals
+    result = np.atleast_1d(np.round(scaled) / 10.0 ** decimals)
+    near_tie = np.atleast_1d(np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+    result[near_tie] = [round(float(v), decimals) for v in np.atleast_1d(values)[near_tie]]
+    return result.reshape(values.shape)
+
+def _minutes_between(start, end):
+    """Elementwise (end - start) in minutes for datetime64 arrays or epoch-second numbers."""
+    start, end = np.asarray(start), np.asarray(end)
+    if np.issubdtype(start.dtype, np.datetime64) or np.issubdtype(end.dtype, np.datetime64):
+        return ((end - start) / np.timedelta64(1, 's')) / 60.0
+    return (end.astype(np.float64) - start.astype(np.float64)) / 60.0
+
 class KPTEngine:
     """
     Electronic Engine for predicting Kitchen Prep Time (KPT) using multi-signal inputs.
     Reduces reliance on manual 'Food Ready' (FOR) signals.
     """
     
-    def __init__(self):
+    def __init__(self, mpbs_store=None):
+        # Live per-merchant MPBS (phase5.mpbs_store), read when predictions pass a merchant id
+        self.mpbs_store = mpbs_store
         # Coefficients based on historical Zomato data patterns
         self.complexity_weights = {
             'Simple': 1.0,     # e.g., Beverages, Snacks
@@ -44,11 +71,19 @@ class KPTEngine:
         reliability = max(0, 1 - (abs(delta) / 30.0))
         return round(reliability, 2)
 
-    def predict_kpt(self, base_prep_time, kli, mpbs):
+    def _live_mpbs(self):
+        if self.mpbs_store is None:
+            raise ValueError("Pass mpbs explicitly, or build KPTEngine(mpbs_store=...) to read live merchant scores")
+        return self.mpbs_store
+
+    def predict_kpt(self, base_prep_time, kli, mpbs=None, merchant_id=None):
         """
         Predicts the finalized KPT using signals.
         Predicted KPT = Base + (KLI adjustment) + (Merchant Bias adjustment)
+        Without an explicit `mpbs`, the merchant's live score is read from `mpbs_store`.
         """
+        if mpbs is None:
+            mpbs = self._live_mpbs().get(merchant_id)
         # Load impact: +2 mins per KLI unit above 5.0
         load_adjustment = max(0, (kli - 5.0) * 2.0)
         
@@ -58,6 +93,37 @@ class KPTEngine:
         final_kpt = base_prep_time + load_adjustment + bias_adjustment
         return round(final_kpt, 2)
 
+    # --- Batch counterparts: one call per dispatch tick for thousands of kitchens ---
+
+    def calculate_kli_batch(self, complexity_counts, historical_rush_factors=1.0):
+        """
+        KLI for many kitchens. `complexity_counts` is an (n, 3) array of active orders per
+        COMPLEXITY_LEVELS column; `historical_rush_factors` a scalar or (n,) array.
+        Matches `calculate_kli` elementwise (a kitchen with no orders scores 0.0).
+        """
+        weights = np.array([self.complexity_weights[level] for level in COMPLEXITY_LEVELS])
+        total_complexity = np.asarray(complexity_counts, dtype=np.float64) @ weights
+        return round_like_python(total_complexity * np.asarray(historical_rush_factors, dtype=np.float64))
+
+    def calculate_mpbs_batch(self, manual_ready_times, actual_pickup_times):
+        """
+        MPBS for many orders. Timestamps are datetime64 arrays or epoch seconds.
+        Matches `calculate_mpbs` elementwise.
+        """
+        delta = _minutes_between(manual_ready_times, actual_pickup_times)
+        return round_like_python(np.maximum(0, 1 - (np.abs(delta) / 30.0)))
+
+    def predict_kpt_batch(self, base_prep_times, kli, mpbs=None, merchant_ids=None):
+        """
+        Predicted KPT for arrays of base prep times, KLI and MPBS (matches `predict_kpt`).
+        Without `mpbs`, live scores for `merchant_ids` are read from `mpbs_store`.
+        """
+        if mpbs is None:
+            mpbs = self._live_mpbs().scores_for(merchant_ids)
+        load_adjustment = np.maximum(0, (np.asarray(kli, dtype=np.float64) - 5.0) * 2.0)
+        bias_adjustment = (1 - np.asarray(mpbs, dtype=np.float64)) * 10.0
+        return round_like_python(np.asarray(base_prep_times, dtype=np.float64) + load_adjustment + bias_adjustment)
+
 # Global helper for signal confidence
 def get_kpt_confidence(mpbs, kli):
     if mpbs > 0.8 and kli < 10:
@@ -65,3 +131,13 @@ def get_kpt_confidence(mpbs, kli):
     elif mpbs < 0.5 or kli > 20:
         return "Low"
     return "Medium"
+
+def get_kpt_confidence_batch(mpbs, kli):
+    """
+    Confidence codes (CONFIDENCE_LOW/MEDIUM/HIGH) for arrays of MPBS and KLI, same rules as
+    `get_kpt_confidence`; CONFIDENCE_LABELS[codes] gives the strings.
+    """
+    mpbs, kli = np.asarray(mpbs), np.asarray(kli)
+    high = (mpbs > 0.8) & (kli < 10)
+    low = (mpbs < 0.5) | (kli > 20)
+    return np.where(high, CONFIDENCE_HIGH, np.where(low, CONFIDENCE_LOW, CONFIDENCE_MEDIUM)).astype(np.int8)
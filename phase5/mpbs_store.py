@@ -0,0 +1,106 @@
+import os
+import threading
+import numpy as np
+
+try:
+    from phase5.kpt_engine import KPTEngine, round_like_python
+except ImportError:
+    from kpt_engine import KPTEngine, round_like_python
+
+MPBS_PATH = "merchant_mpbs.npz"
+# Score for merchants with no completed orders yet
+DEFAULT_MPBS = 0.8
+# Orders after which an old observation's weight has halved
+DEFAULT_HALF_LIFE = 20
+
+class MerchantReliabilityStore:
+    """
+    Online Merchant Reliability Score (MPBS) per merchant.
+    Every completed order's ready/pickup gap is scored like `KPTEngine.calculate_mpbs` and folded
+    into an exponentially weighted average in O(1). Merchant ids are interned to rows of
+    preallocated NumPy arrays, so reading live MPBS, one merchant or thousands, never scans
+    history. With a `path`, the state is saved every `persist_every` updates.
+    Safe to share between threads (e.g. every Streamlit session).
+    """
+
+    def __init__(self, capacity=1024, half_life=DEFAULT_HALF_LIFE, prior=DEFAULT_MPBS, path=None, persist_every=1000):
+        self.alpha = 1 - 0.5 ** (1 / half_life)
+        self.half_life = half_life
+        self.prior = prior
+        self.path = path
+        self.persist_every = persist_every
+        self.updates = 0
+        self.engine = KPTEngine()
+        self.lock = threading.Lock()
+        # Serializes writers of the shared temp file; state is copied under `lock` first
+        self.save_lock = threading.Lock()
+        self.ids = []
+        self.index = {}
+        self.scores = np.full(capacity, prior, dtype=np.float64)
+        self.orders = np.zeros(capacity, dtype=np.int64)
+
+    def _row(self, merchant_id):
+        # Caller holds self.lock
+        row = self.index.get(merchant_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self.scores):
+                grow = max(1, len(self.scores))
+                self.scores = np.concatenate([self.scores, np.full(grow, self.prior)])
+                self.orders = np.concatenate([self.orders, np.zeros(grow, dtype=np.int64)])
+            self.index[merchant_id] = row
+            self.ids.append(merchant_id)
+        return row
+
+    def record_reliability(self, merchant_id, reliability):
+        """Folds one order's reliability (0 to 1) into the merchant's weighted score."""
+        with self.lock:
+            row = self._row(merchant_id)
+            self.scores[row] += self.alpha * (reliability - self.scores[row])
+            self.orders[row] += 1
+            self.updates += 1
+            due = self.path and self.updates % self.persist_every == 0
+        if due:
+            self.save()
+
+    def record_order(self, merchant_id, manual_ready_time, actual_pickup_time):
+        self.record_reliability(merchant_id, self.engine.calculate_mpbs(manual_ready_time, actual_pickup_time))
+
+    def get(self, merchant_id):
+        with self.lock:
+            row = self.index.get(merchant_id)
+            return self.prior if row is None else round(float(self.scores[row]), 2)
+
+    def scores_for(self, merchant_ids):
+        """Live MPBS for a sequence of merchant ids (the prior for unknown ones), as an array."""
+        with self.lock:
+            rows = np.array([self.index.get(m, -1) for m in merchant_ids], dtype=np.int64)
+            scores = np.where(rows >= 0, self.scores[rows], self.prior)
+        return round_like_python(scores)
+
+    def save(self, path=None):
+        path = path or self.path
+        with self.lock:
+            n = len(self.ids)
+            ids, scores, orders = np.asarray(self.ids), self.scores[:n].copy(), self.orders[:n].copy()
+        tmp_path = f"{path}.tmp"
+        with self.save_lock:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, ids=ids, scores=scores, orders=orders, half_life=self.half_life, prior=self.prior)
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, persist_every=1000):
+        with np.load(path, allow_pickle=False) as data:
+            ids = data["ids"].tolist()
+            store = cls(capacity=max(1, len(ids)), half_life=float(data["half_life"]), prior=float(data["prior"]),
+                        path=path, persist_every=persist_every)
+            store.ids = ids
+            store.index = {m: row for row, m in enumerate(ids)}
+            store.scores[:len(ids)] = data["scores"]
+            store.orders[:len(ids)] = data["orders"]
+        return store
+
+def load_mpbs_store(path=MPBS_PATH):
+    """Persisted store if one exists, else an empty store that will save to `path`."""
+    return MerchantReliabilityStore.load(path) if os.path.exists(path) else MerchantReliabilityStore(path=path)
@@ -1,6 +1,18 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+try:
+    from phase5.geofence import GeofenceDwellDetector, RestaurantGrid
+    from phase5.kpt_engine import round_like_python
+except ImportError:
+    from geofence import GeofenceDwellDetector, RestaurantGrid
+    from kpt_engine import round_like_python
+
+NS_PER_MINUTE = 60 * 10**9
+# Expected pickups with no matching dwell this long after the order started are dropped
+PENDING_ORDER_TTL_MINUTES = 180
+
 class ShadowKPTEstimator:
     """
     Shadow KPT Estimation Engine.
@@ -8,8 +20,50 @@ class ShadowKPTEstimator:
     the actual 'Ground Truth' prep time, bypassing manual FOR marking bias.
     """
     
-    def __init__(self, geofence_radius_meters=100):
+    def __init__(self, geofence_radius_meters=100, pending_ttl_minutes=PENDING_ORDER_TTL_MINUTES):
         self.geofence_radius = geofence_radius_meters
+        self.pending_ttl = pd.Timedelta(minutes=pending_ttl_minutes)
+        self.dwell_detector = None
+        # (rider id, restaurant id) -> order start time, for pickups we are waiting to observe
+        self.pending_orders = {}
+
+    def attach_geofences(self, restaurant_ids, lats, lons):
+        """Indexes restaurant locations so raw rider GPS pings can be fed to `ingest_pings`."""
+        grid = RestaurantGrid(restaurant_ids, lats, lons, cell_size_meters=self.geofence_radius)
+        self.dwell_detector = GeofenceDwellDetector(grid, radius_meters=self.geofence_radius)
+        return self.dwell_detector
+
+    def expect_pickup(self, rider_id, restaurant_id, order_start_time):
+        self.pending_orders[(rider_id, restaurant_id)] = pd.Timestamp(order_start_time)
+
+    def ingest_pings(self, rider_ids, lats, lons, timestamps):
+        """
+        Feeds a batch of GPS pings (epoch-second timestamps) through the geofence detector.
+        Every completed dwell at a restaurant with an expected pickup yields its Shadow KPT:
+        returns a list of {rider_id, restaurant_id, arrival_time, pickup_time, shadow_kpt}.
+        """
+        if self.dwell_detector is None:
+            raise ValueError("Call attach_geofences() before ingesting GPS pings")
+        results = []
+        for event in self.dwell_detector.ingest(rider_ids, lats, lons, timestamps):
+            order_start_time = self.pending_orders.pop((event.rider_id, event.restaurant_id), None)
+            if order_start_time is None:
+                continue
+            results.append({
+                **event._asdict(),
+                "shadow_kpt": self.estimate_true_kpt(order_start_time, event.arrival_time, event.pickup_time),
+            })
+        if len(timestamps):
+            self.expire_pending(pd.to_datetime(float(np.max(timestamps)), unit="s"))
+        return results
+
+    def expire_pending(self, now):
+        """Drops expected pickups whose order started more than the TTL before `now`; returns how many."""
+        cutoff = pd.Timestamp(now) - self.pending_ttl
+        expired = [key for key, started in self.pending_orders.items() if started < cutoff]
+        for key in expired:
+            del self.pending_orders[key]
+        return len(expired)
 
     def estimate_true_kpt(self, order_start_time, rider_arrival_time, rider_pickup_time):
         """
@@ -43,6 +97,20 @@ class ShadowKPTEstimator:
         bias_minutes = (manual_ready_time - actual_ready_time).total_seconds() / 60.0
         return round(bias_minutes, 2)
 
+    # --- Batch counterparts over int64 epoch-nanosecond arrays (historical backfills) ---
+
+    def estimate_true_kpt_batch(self, order_start_ns, rider_arrival_ns, rider_pickup_ns):
+        """`estimate_true_kpt` for arrays of int64 epoch nanoseconds; returns minutes."""
+        order_start_ns, rider_arrival_ns, rider_pickup_ns = (np.asarray(v, dtype=np.int64) for v in (order_start_ns, rider_arrival_ns, rider_pickup_ns))
+        prep_ongoing_duration = np.maximum(0, (rider_arrival_ns - order_start_ns) / 1e9 / 60.0)
+        wait_time = np.maximum(0, (rider_pickup_ns - rider_arrival_ns) / 1e9 / 60.0)
+        return round_like_python(prep_ongoing_duration + wait_time)
+
+    def detect_marking_bias_batch(self, manual_ready_ns, shadow_kpt, order_start_ns):
+        """`detect_marking_bias` for arrays of int64 epoch nanoseconds and Shadow KPT minutes."""
+        actual_ready_ns = np.asarray(order_start_ns, dtype=np.int64) + np.rint(np.asarray(shadow_kpt) * NS_PER_MINUTE).astype(np.int64)
+        return round_like_python((np.asarray(manual_ready_ns, dtype=np.int64) - actual_ready_ns) / 1e9 / 60.0)
+
 # Example helper function for signal fusion
 def fuse_kpt_signals(predicted_kpt, shadow_kpt, confidence_weight=0.5):
     """
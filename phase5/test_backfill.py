@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from backfill_shadow_kpt import QUANTILES, backfill, load_merchant_bias
+from shadow_kpt import ShadowKPTEstimator
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        n = 2000
+        start = [datetime(2024, 1, 1) + timedelta(seconds=int(s)) for s in rng.integers(0, 30 * 86400, n)]
+        arrival = [s + timedelta(seconds=int(d)) for s, d in zip(start, rng.integers(-120, 1800, n))]
+        pickup = [a + timedelta(seconds=int(d)) for a, d in zip(arrival, rng.integers(0, 900, n))]
+        manual = [s + timedelta(seconds=int(d)) for s, d in zip(start, rng.integers(300, 2400, n))]
+        self.orders = pd.DataFrame({
+            'restaurant_id': [f"m{i}" for i in rng.integers(0, 25, n)],
+            'order_start_time': start, 'rider_arrival_time': arrival,
+            'rider_pickup_time': pickup, 'manual_ready_time': manual,
+        })
+        self.orders.loc[7, 'rider_pickup_time'] = None  # Incomplete rows are skipped
+
+    def test_batch_matches_scalar(self):
+        estimator = ShadowKPTEstimator()
+        rows = self.orders.drop(index=7)
+        ns = {c: rows[c].to_numpy(dtype="datetime64[ns]").view(np.int64) for c in rows.columns[1:]}
+        shadow = estimator.estimate_true_kpt_batch(ns['order_start_time'], ns['rider_arrival_time'], ns['rider_pickup_time'])
+        bias = estimator.detect_marking_bias_batch(ns['manual_ready_time'], shadow, ns['order_start_time'])
+        for i, row in enumerate(rows.itertuples(index=False)):
+            expected = estimator.estimate_true_kpt(row.order_start_time, row.rider_arrival_time, row.rider_pickup_time)
+            self.assertEqual(shadow[i], expected)
+            self.assertEqual(bias[i], estimator.detect_marking_bias(row.manual_ready_time, expected, row.order_start_time))
+
+    def test_parallel_backfill_per_merchant(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path, out_path = os.path.join(tmp, "orders.csv"), os.path.join(tmp, "bias.npz")
+            self.orders.to_csv(csv_path, index=False)
+            processed = backfill(csv_path, out_path, chunk_bytes=20_000, workers=2, n_partitions=5)
+            table = load_merchant_bias(out_path)
+
+        estimator = ShadowKPTEstimator()
+        rows = self.orders.drop(index=7).copy()
+        rows['shadow'] = [estimator.estimate_true_kpt(r.order_start_time, r.rider_arrival_time, r.rider_pickup_time) for r in rows.itertuples()]
+        rows['bias'] = [estimator.detect_marking_bias(r.manual_ready_time, r.shadow, r.order_start_time) for r in rows.itertuples()]
+        grouped = rows.groupby('restaurant_id')
+
+        self.assertEqual(processed, len(rows))
+        self.assertEqual(sorted(table.index), sorted(grouped.groups))
+        table = table.loc[sorted(grouped.groups)]
+        np.testing.assert_array_equal(table['orders'], grouped.size())
+        np.testing.assert_allclose(table['bias_mean'], grouped['bias'].mean())
+        np.testing.assert_allclose(table['shadow_kpt_mean'], grouped['shadow'].mean())
+        for q in QUANTILES:
+            np.testing.assert_allclose(table[f"bias_p{int(round(q * 100))}"], grouped['bias'].quantile(q))
+        print("Phase 5 Test Passed: Parallel Shadow KPT backfill verified.")
+
+if __name__ == '__main__':
+    unittest.main()
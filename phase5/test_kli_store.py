@@ -0,0 +1,58 @@
+import os
+import random
+import tempfile
+import unittest
+from kli_store import KitchenLoadStore
+from kpt_engine import COMPLEXITY_LEVELS, KPTEngine
+
+class TestKitchenLoadStore(unittest.TestCase):
+    def setUp(self):
+        self.engine = KPTEngine()
+        self.store = KitchenLoadStore(capacity=4)  # Small, so the arrays have to grow
+        self.rng = random.Random(5)
+        self.open = {}  # restaurant -> {order id: complexity}, the reference state
+
+    def replay(self, n_events=5000, n_restaurants=50):
+        for order_id in range(n_events):
+            if self.rng.random() < 0.6 or not any(self.open.values()):
+                rid = f"r{self.rng.randrange(n_restaurants)}"
+                complexity = self.rng.choice(COMPLEXITY_LEVELS + ('Unknown',))
+                self.store.order_placed(rid, order_id, complexity)
+                self.open.setdefault(rid, {})[order_id] = complexity
+            else:
+                rid = self.rng.choice([r for r, orders in self.open.items() if orders])
+                picked = self.rng.choice(list(self.open[rid]))
+                self.assertTrue(self.store.order_picked_up(picked))
+                del self.open[rid][picked]
+            if order_id % 500 == 0:
+                self.store.set_rush_factor(rid, self.rng.uniform(0.8, 1.4))
+
+    def assert_matches_engine(self, store):
+        for rid, orders in self.open.items():
+            row = store.index[rid]
+            expected = self.engine.calculate_kli([{'complexity': c} for c in orders.values()], store.rush_factors[row])
+            self.assertEqual(store.get_kli(rid), expected)
+            self.assertEqual(store.active_orders(rid), len(orders))
+
+    def test_incremental_kli_matches_full_recompute(self):
+        self.replay()
+        self.assert_matches_engine(self.store)
+        self.assertEqual(len(self.store.kli_array()), len(self.open))
+        self.assertFalse(self.store.order_picked_up("never-placed"))
+        self.assertEqual(self.store.get_kli("unknown"), 0.0)
+
+    def test_snapshot_and_restore(self):
+        self.replay(2000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "kli.npz")
+            self.store.snapshot(path)
+            restored = KitchenLoadStore.restore(path)
+        self.assert_matches_engine(restored)
+        # Restored state keeps consuming events
+        rid, orders = next((r, o) for r, o in self.open.items() if o)
+        self.assertTrue(restored.order_picked_up(next(iter(orders))))
+        self.assertEqual(restored.active_orders(rid), len(orders) - 1)
+        print("Phase 5 Test Passed: Incremental KLI store verified.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from datetime import datetime, timedelta
+import numpy as np
+from kpt_engine import (COMPLEXITY_LEVELS, CONFIDENCE_LABELS, KPTEngine, get_kpt_confidence,
+                        get_kpt_confidence_batch, round_like_python)
+
+class TestKPTBatch(unittest.TestCase):
+    """Batch KPT functions must agree exactly with the per-restaurant scalar ones."""
+
+    def setUp(self):
+        self.engine = KPTEngine()
+        self.rng = np.random.default_rng(11)
+        self.n = 2000
+
+    def test_kli_matches_scalar(self):
+        counts = self.rng.integers(0, 6, size=(self.n, len(COMPLEXITY_LEVELS)))
+        counts[:5] = 0  # Idle kitchens
+        rush = self.rng.uniform(0.8, 1.4, self.n)
+        batch = self.engine.calculate_kli_batch(counts, rush)
+        for i in range(self.n):
+            orders = [{'complexity': level} for level, c in zip(COMPLEXITY_LEVELS, counts[i]) for _ in range(c)]
+            self.assertEqual(batch[i], self.engine.calculate_kli(orders, rush[i]))
+
+    def test_mpbs_matches_scalar(self):
+        now = datetime(2024, 3, 10, 20, 0)
+        ready = [now + timedelta(seconds=int(s)) for s in self.rng.integers(0, 3600, self.n)]
+        pickup = [r + timedelta(seconds=int(s)) for r, s in zip(ready, self.rng.integers(-900, 2700, self.n))]
+        batch = self.engine.calculate_mpbs_batch(np.array(ready, dtype='datetime64[us]'), np.array(pickup, dtype='datetime64[us]'))
+        expected = [self.engine.calculate_mpbs(r, p) for r, p in zip(ready, pickup)]
+        np.testing.assert_array_equal(batch, expected)
+        # Epoch seconds give the same scores
+        epoch = self.engine.calculate_mpbs_batch([r.timestamp() for r in ready], [p.timestamp() for p in pickup])
+        np.testing.assert_array_equal(epoch, expected)
+
+    def test_kpt_and_confidence_match_scalar(self):
+        base = np.round(self.rng.uniform(10, 40, self.n), 1)
+        kli = round_like_python(self.rng.uniform(0, 30, self.n))
+        mpbs = round_like_python(self.rng.uniform(0, 1, self.n))
+        kpt = self.engine.predict_kpt_batch(base, kli, mpbs)
+        codes = get_kpt_confidence_batch(mpbs, kli)
+        for i in range(self.n):
+            self.assertEqual(kpt[i], self.engine.predict_kpt(base[i], kli[i], mpbs[i]))
+            self.assertEqual(CONFIDENCE_LABELS[codes[i]], get_kpt_confidence(mpbs[i], kli[i]))
+        print("Phase 5 Test Passed: Batch KPT functions match the scalar ones.")
+
+if __name__ == '__main__':
+    unittest.main()
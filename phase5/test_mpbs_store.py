@@ -0,0 +1,85 @@
+import os
+import random
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+import numpy as np
+from kpt_engine import KPTEngine
+from mpbs_store import DEFAULT_MPBS, MerchantReliabilityStore
+
+class TestMerchantReliabilityStore(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(4)
+        self.store = MerchantReliabilityStore(capacity=2, half_life=10)
+        self.engine = KPTEngine(mpbs_store=self.store)
+
+    def replay(self, n_orders=3000, n_merchants=40):
+        """Feeds random orders and returns the reference EWMA computed with plain Python."""
+        alpha = 1 - 0.5 ** (1 / 10)
+        expected = {}
+        now = datetime(2024, 5, 1, 19, 0)
+        for _ in range(n_orders):
+            merchant = f"m{self.rng.randrange(n_merchants)}"
+            pickup = now + timedelta(seconds=self.rng.randint(-300, 1500))
+            self.store.record_order(merchant, now, pickup)
+            score = expected.get(merchant, DEFAULT_MPBS)
+            expected[merchant] = score + alpha * (self.engine.calculate_mpbs(now, pickup) - score)
+        return expected
+
+    def test_ewma_matches_reference(self):
+        expected = self.replay()
+        for merchant, score in expected.items():
+            self.assertEqual(self.store.get(merchant), round(score, 2))
+        self.assertEqual(self.store.get("never-seen"), DEFAULT_MPBS)
+        self.assertEqual(int(self.store.orders[:len(self.store.ids)].sum()), 3000)
+
+    def test_predictions_read_live_mpbs(self):
+        self.replay(500)
+        merchants = self.store.ids + ["never-seen"]
+        base = np.full(len(merchants), 20.0)
+        kli = np.linspace(0, 25, len(merchants)).round(2)
+        batch = self.engine.predict_kpt_batch(base, kli, merchant_ids=merchants)
+        for i, merchant in enumerate(merchants):
+            self.assertEqual(batch[i], self.engine.predict_kpt(20.0, kli[i], merchant_id=merchant))
+            self.assertEqual(batch[i], self.engine.predict_kpt(20.0, kli[i], self.store.get(merchant)))
+        with self.assertRaises(ValueError):
+            KPTEngine().predict_kpt(20.0, 5.0, merchant_id="m1")
+        with self.assertRaises(ValueError):
+            KPTEngine().predict_kpt_batch(base, kli, merchant_ids=merchants)
+
+    def test_periodic_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mpbs.npz")
+            self.store.path, self.store.persist_every = path, 100
+            self.replay(250)
+            saved = MerchantReliabilityStore.load(path)  # Written at update 200
+            self.assertEqual(int(saved.orders[:len(saved.ids)].sum()), 200)
+            self.store.save()
+            restored = MerchantReliabilityStore.load(path)
+        np.testing.assert_array_equal(restored.scores_for(self.store.ids), self.store.scores_for(self.store.ids))
+        self.assertEqual(restored.alpha, self.store.alpha)
+
+    def test_concurrent_sessions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.store.path, self.store.persist_every = os.path.join(tmp, "mpbs.npz"), 50
+            now = datetime(2024, 5, 1, 19, 0)
+
+            def session(n):
+                for i in range(500):
+                    self.store.record_order(f"t{n}-m{i % 97}", now, now + timedelta(minutes=i % 15))
+                    self.store.scores_for([f"t{n}-m{i % 97}", "never-seen"])
+
+            threads = [threading.Thread(target=session, args=(n,)) for n in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(len(self.store.ids), 8 * 97)
+            self.assertEqual(int(self.store.orders[:len(self.store.ids)].sum()), 8 * 500)
+            saved = MerchantReliabilityStore.load(self.store.path)
+            self.assertEqual(len(saved.ids), len(set(saved.ids)))
+        print("Phase 5 Test Passed: Online MPBS store verified.")
+
+if __name__ == '__main__':
+    unittest.main()
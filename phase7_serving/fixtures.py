@@ -0,0 +1,13 @@
+# Small normalized dataset shared by the phase 7 server tests
+import pandas as pd
+from phase1.normalize import normalize_dataset
+
+def sample_df():
+    return normalize_dataset(pd.DataFrame({
+        'restaurant name': ['Cafe Mocha', 'Truffles', 'Meghana Foods'],
+        'rate (out of 5)': [4.5, 4.2, 4.4],
+        'num of ratings': [900, 1500, 2000],
+        'avg cost (two people)': [700, 900, 600],
+        'cuisines type': ['Cafe', 'Cafe, Burger', 'Biryani'],
+        'area': ['Indiranagar', 'Koramangala', 'Indiranagar'],
+    }))
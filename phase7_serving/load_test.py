@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+# Add project root to path to import local modules
+sys.path.append(os.getcwd())
+
+from main_recommender import load_dataset
+from phase1.normalize import COL_AREA, PRICE_BUCKETS
+from phase2.indexes import get_cuisine_index
+from phase3.async_engine import AsyncRecommendationEngine
+from phase3.llm_engine import RecommendationEngine
+from phase3.mock_groq_server import MockGroqServer
+from phase7_serving.query_cache import QueryResultCache
+from phase7_serving.recommend_server import RecommendServer
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def sample_preferences(df, rng, n, popular_share=0.8, popular_queries=20):
+    """
+    Query mix with a popular head: `popular_share` of requests repeat one of `popular_queries`
+    combinations, the rest are drawn uniformly, like real dropdown traffic.
+    """
+    areas = df[COL_AREA].dropna().unique().tolist()
+    cuisines = get_cuisine_index(df).vocabulary
+
+    def draw():
+        return {
+            "location": rng.choice(areas),
+            "cuisine": rng.choice(cuisines),
+            "price": rng.choice(PRICE_BUCKETS + [""]),
+            "rating": rng.choice([0, 3.5, 4.0]),
+        }
+
+    head = [draw() for _ in range(popular_queries)]
+    return [rng.choice(head) if rng.random() < popular_share else draw() for _ in range(n)]
+
+async def http_post(reader, writer, path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(f"POST {path} HTTP/1.1\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def run_load(server, queries, concurrency):
+    """Drives /recommend over keep-alive connections, one per virtual user; returns per-request results."""
+    srv = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    pending = list(enumerate(queries))
+    results = []
+
+    async def user():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        while pending:
+            _, preferences = pending.pop()
+            start = time.perf_counter()
+            status, payload = await http_post(reader, writer, "/recommend", preferences)
+            results.append((time.perf_counter() - start, status, payload.get("ai_source", "none")))
+        writer.close()
+
+    await asyncio.gather(*[user() for _ in range(concurrency)])
+    srv.close()
+    await srv.wait_closed()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test of the recommend path against the mock Groq API")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=2.0, help="per-request LLM deadline in seconds")
+    parser.add_argument("--latency-median", type=float, default=0.3)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.02)
+    parser.add_argument("--no-cache", action="store_true", help="disable the query, LLM and semantic caches")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    df = load_dataset()
+    if df is None:
+        print("Data file not found. Run Phase 1 first.")
+        return
+
+    mock = MockGroqServer(args.latency_median, args.latency_sigma, error_rate=args.error_rate,
+                          rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    base_url = mock.start_background()
+    engine = RecommendationEngine(cache=False, semantic_cache=False if args.no_cache else None, base_url=base_url)
+    server = RecommendServer(
+        df=df,
+        engine=engine,
+        cache=QueryResultCache(max_entries=0 if args.no_cache else 1024),
+        async_engine=AsyncRecommendationEngine(engine, max_concurrency=args.llm_concurrency, default_timeout=args.timeout),
+    )
+
+    queries = sample_preferences(df, random.Random(args.seed), args.requests)
+    start = time.perf_counter()
+    results = asyncio.run(run_load(server, queries, args.concurrency))
+    elapsed = time.perf_counter() - start
+    mock.stop()
+
+    latencies = sorted(r[0] * 1000 for r in results)
+    print(f"{len(results)} requests, concurrency {args.concurrency}, {elapsed:.2f}s -> {len(results) / elapsed:.1f} req/s")
+    print(f"latency ms: p50 {percentile(latencies, 0.5):.1f}  p90 {percentile(latencies, 0.9):.1f}  "
+          f"p99 {percentile(latencies, 0.99):.1f}  max {latencies[-1]:.1f}")
+    print(f"status: {dict(Counter(r[1] for r in results))}  ai_source: {dict(Counter(r[2] for r in results))}")
+    print(f"mock upstream: {mock.stats}  engine: {server.async_engine.snapshot_stats()}")
+
+if __name__ == "__main__":
+    main()
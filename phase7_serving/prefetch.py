@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class PrefetchWorker:
+    """
+    Speculative background computation for the filter bar.
+    Every `prefetch(key, job)` bumps a generation counter and starts `job(is_stale)` on a worker
+    thread; earlier jobs become stale. Jobs poll `is_stale()` between steps (e.g. between LLM
+    chunks) and stop early, and a stale job's result is discarded rather than published.
+    `result(key)` returns the prefetched value only if it was computed for that exact key.
+    """
+
+    def __init__(self, max_workers=2, executor=None):
+        # Pass a shared executor to keep one thread pool per process however many workers exist
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.key = None
+        self.future = None
+        self.stats = {"started": 0, "hits": 0, "misses": 0, "discarded": 0}
+
+    def prefetch(self, key, job):
+        """
+        Starts `job` for `key` unless a job for that key is still running or succeeded (a failed
+        or empty result is retried); returns the job's future.
+        """
+        with self.lock:
+            if key == self.key and self.future is not None and self._reusable(self.future):
+                return self.future
+            self.generation += 1
+            generation = self.generation
+            self.key = key
+            self.stats["started"] += 1
+
+            def is_stale():
+                return self.generation != generation
+
+            def run():
+                if is_stale():
+                    return None
+                value = job(is_stale)
+                if is_stale():
+                    with self.lock:
+                        self.stats["discarded"] += 1
+                    return None
+                return value
+
+            self.future = self.executor.submit(run)
+            return self.future
+
+    @staticmethod
+    def _reusable(future):
+        if not future.done():
+            return True
+        return not future.cancelled() and future.exception() is None and future.result() is not None
+
+    def result(self, key, timeout=None):
+        """
+        Prefetched value for `key`, waiting up to `timeout` seconds if it is still in flight.
+        None when nothing was prefetched for `key`, it is not ready in time, or the job failed.
+        """
+        with self.lock:
+            future = self.future if key == self.key else None
+        value = None
+        if future is not None:
+            try:
+                value = future.result(timeout=timeout)
+            except Exception:
+                value = None
+        with self.lock:
+            self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def cancel(self):
+        """Marks any in-flight job stale (it stops at its next check)."""
+        with self.lock:
+            self.generation += 1
+            self.key = None
+            self.future = None
+
+    def snapshot_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def shutdown(self):
+        self.cancel()
+        if self.owns_executor:
+            self.executor.shutdown(wait=False)
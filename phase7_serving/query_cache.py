@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from phase1.normalize import PRICE_BUCKETS
+from phase2.indexes import normalize_token
+
+class QueryResultCache:
+    """
+    Versioned cache for the recommend pipeline.
+    Keyed on normalized preferences (price, location, cuisine, rating) plus the dataset version;
+    stores the ranked row ids and the rendered response. Memory is bounded by entry count with
+    LRU eviction and per-entry TTLs; an optional on-disk tier lets several workers share entries.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=600, disk_dir=None, max_disk_entries=10000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self.entries = OrderedDict()
+        self.disk_writes = 0
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(preferences, dataset_version):
+        price = str(preferences.get('price') or '').lower()
+        cuisine = preferences.get('cuisine') or ''
+        if isinstance(cuisine, str):
+            cuisine = cuisine.split(',')
+        normalized = {
+            "price": price if price in PRICE_BUCKETS else None,
+            "location": normalize_token(preferences.get('location') or ''),
+            "cuisine": sorted(normalize_token(c) for c in cuisine if c.strip()),
+            "rating": round(float(preferences.get('rating', 0) or 0), 2),
+            "version": dataset_version,
+        }
+        return hashlib.sha1(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key):
+        """Returns {"row_ids": [...], "response": {...}} or None."""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry["expires_at"] > now:
+                    self.entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry
+                del self.entries[key]
+                self.stats["expirations"] += 1
+
+        entry = self._disk_get(key, now)
+        with self.lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+            self._insert(key, entry)
+        return entry
+
+    def put(self, key, row_ids, response):
+        entry = {
+            "expires_at": time.time() + self.ttl_seconds,
+            "row_ids": [int(r) for r in row_ids],
+            "response": response,
+        }
+        with self.lock:
+            self._insert(key, entry)
+        self._disk_put(key, entry)
+
+    def _insert(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _disk_get(self, key, now):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("expires_at", 0) > now else None
+
+    def _disk_put(self, key, entry):
+        if not self.disk_dir:
+            return
+        # Write-then-rename so concurrent workers never read a partial file
+        tmp_path = f"{self._disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError:
+            return
+        self.disk_writes += 1
+        if self.disk_writes % 100 == 0:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Drops expired files and, above the size limit, the oldest ones."""
+        now = time.time()
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+                if mtime + self.ttl_seconds < now:
+                    os.remove(path)
+                else:
+                    files.append((mtime, path))
+            except OSError:
+                continue  # Another worker got there first
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def snapshot_stats(self):
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self.entries),
+                "hit_rate": round((self.stats["hits"] + self.stats["disk_hits"]) / lookups, 3) if lookups else 0.0,
+            }
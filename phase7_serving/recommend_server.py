@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path to import local modules
+sys.path.append(os.getcwd())
+
+from main_recommender import load_dataset, recommend, recommend_async, recommend_stream
+from phase3.async_engine import AsyncRecommendationEngine
+from phase3.blurb_store import load_blurb_store
+from phase3.http_request import BadRequest, read_request
+from phase3.llm_engine import get_shared_engine
+from phase4.result_cube import load_result_cube
+from phase7_serving.query_cache import QueryResultCache
+
+DEFAULT_HOST = os.getenv("RECOMMENDER_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.getenv("RECOMMENDER_PORT", "8765"))
+
+class RecommendServer:
+    """
+    Long-lived recommendation service.
+    Keeps the dataset, the filter/rank pipeline and the Groq client warm in memory
+    and answers the same JSON contract as `main_recommender.main()` over HTTP.
+    """
+
+    def __init__(self, df=None, engine=None, max_workers=4, cache=None, async_engine=None):
+        self.df = df if df is not None else load_dataset()
+        if engine is None:
+            engine = get_shared_engine()
+            # /recommend awaits Groq on the event loop: bounded concurrency, coalesced duplicates,
+            # each request within the engine's LLM_LATENCY_BUDGET
+            async_engine = async_engine or AsyncRecommendationEngine(
+                engine,
+                max_concurrency=int(os.getenv("RECOMMEND_LLM_CONCURRENCY", "8")),
+            )
+        self.engine = engine
+        self.async_engine = async_engine
+        self.cube = load_result_cube(self.df) if self.df is not None else None
+        self.blurbs = load_blurb_store()
+        self.cache = cache if cache is not None else QueryResultCache(
+            max_entries=int(os.getenv("RECOMMEND_CACHE_ENTRIES", "1024")),
+            ttl_seconds=float(os.getenv("RECOMMEND_CACHE_TTL", "600")),
+            disk_dir=os.getenv("RECOMMEND_CACHE_DIR"),
+        )
+        # Filtering and the Groq call are blocking, so they run off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.started_at = time.time()
+        self.requests_served = 0
+
+    async def handle_recommend(self, body):
+        preferences, error = self._parse_preferences(body)
+        if error:
+            return 400, {"error": error}
+
+        loop = asyncio.get_running_loop()
+        try:
+            if self.async_engine is not None:
+                result = await recommend_async(preferences, self.df, self.async_engine, self.cube, self.cache, self.blurbs)
+            else:
+                result = await loop.run_in_executor(self.executor, recommend, preferences, self.df, self.engine, self.cube, self.cache, self.blurbs)
+        except Exception as e:
+            return 500, {"error": str(e)}
+        self.requests_served += 1
+        return (500 if "error" in result else 200), result
+
+    def _parse_preferences(self, body):
+        try:
+            preferences = json.loads(body) if body else None
+        except json.JSONDecodeError as e:
+            return None, f"Invalid JSON: {e}"
+        if not preferences:
+            return None, "No input data received"
+        return preferences, None
+
+    async def handle_recommend_stream(self, body, writer):
+        """
+        Server-Sent Events version of /recommend: the ranked cards first, then every LLM chunk
+        as it arrives, then the complete response. The connection is closed at the end.
+        """
+        preferences, error = self._parse_preferences(body)
+        if error:
+            await self.write_response(writer, 400, {"error": error}, keep_alive=False)
+            return
+
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: text/event-stream\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1"))
+        await writer.drain()
+
+        # The generator blocks on Groq, so it is drained on a worker thread into an asyncio queue
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def produce():
+            try:
+                for item in recommend_stream(preferences, self.df, self.engine, self.cube, self.cache, self.blurbs):
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, ("error", {"error": str(e)}))
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        producer = loop.run_in_executor(self.executor, produce)
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            event, data = item
+            writer.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+            await writer.drain()
+        await producer
+        self.requests_served += 1
+
+    def handle_health(self):
+        return 200, {
+            "status": "ok",
+            "dataset_loaded": self.df is not None,
+            "rows": 0 if self.df is None else len(self.df),
+            "result_cube": self.cube is not None,
+            "blurbs": 0 if self.blurbs is None else self.blurbs.count(),
+            "cache": self.cache.snapshot_stats(),
+            "llm": self.async_engine.snapshot_stats() if self.async_engine is not None else None,
+            "tokens": self.engine.metrics.snapshot() if hasattr(self.engine, "metrics") else None,
+            "semantic_cache": self.engine.semantic_cache.snapshot_stats() if getattr(self.engine, "semantic_cache", None) is not None else None,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "requests_served": self.requests_served,
+        }
+
+    async def route(self, method, path, body):
+        if method == "POST" and path == "/recommend":
+            return await self.handle_recommend(body)
+        if method == "GET" and path == "/health":
+            return self.handle_health()
+        return 404, {"error": f"No route for {method} {path}"}
+
+    async def handle_connection(self, reader, writer):
+        """
+        Minimal HTTP/1.1 handler with keep-alive, enough for the Next.js route to POST JSON.
+        """
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as e:
+                    await self.write_response(writer, 400, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                if request.method == "POST" and request.path == "/recommend/stream":
+                    await self.handle_recommend_stream(request.body, writer)
+                    break
+
+                keep_alive = request.headers.get("connection", "").lower() != "close" and request.version == "HTTP/1.1"
+                status, payload = await self.route(request.method, request.path, request.body)
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def write_response(self, writer, status, payload, keep_alive=True):
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+        data = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        if self.async_engine is not None:
+            # Handshake with Groq now rather than on the first user's request
+            await self.async_engine.warm_up()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Recommender server listening on http://{host}:{port} ({self.handle_health()[1]['rows']} rows warm)")
+        async with server:
+            await server.serve_forever()
+
+if __name__ == "__main__":
+    asyncio.run(RecommendServer().serve())
@@ -0,0 +1,65 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from phase7_serving.prefetch import PrefetchWorker
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.worker = PrefetchWorker()
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def test_result_for_current_key(self):
+        self.worker.prefetch(("BTM", "Cafe"), lambda is_stale: "ready")
+        self.assertEqual(self.worker.result(("BTM", "Cafe"), timeout=2), "ready")
+        self.assertIsNone(self.worker.result(("BTM", "Pizza"), timeout=2))
+        # The same key again reuses the finished job instead of recomputing
+        calls = []
+        self.worker.prefetch(("BTM", "Cafe"), lambda is_stale: calls.append(1))
+        self.assertEqual(calls, [])
+
+    def test_stale_job_stops_and_is_discarded(self):
+        release = threading.Event()
+        chunks = []
+
+        def slow(is_stale):
+            for i in range(50):
+                release.wait(2)
+                if is_stale():
+                    return "partial"
+                chunks.append(i)
+            return "done"
+
+        first = self.worker.prefetch("a", slow)
+        self.worker.prefetch("b", lambda is_stale: "fresh")
+        release.set()
+        self.assertIsNone(first.result(timeout=2))
+        self.assertEqual(chunks, [])
+        self.assertEqual(self.worker.result("b", timeout=2), "fresh")
+        self.assertIsNone(self.worker.result("a", timeout=2))
+        self.assertEqual(self.worker.snapshot_stats()["discarded"], 1)
+
+    def test_failed_job_is_a_miss(self):
+        def boom(is_stale):
+            raise RuntimeError("ranking failed")
+        self.worker.prefetch("x", boom)
+        self.assertIsNone(self.worker.result("x", timeout=2))
+        self.assertEqual(self.worker.snapshot_stats()["misses"], 1)
+        # Same filters again: the failure is retried instead of being served forever
+        self.worker.prefetch("x", lambda is_stale: "recovered")
+        self.assertEqual(self.worker.result("x", timeout=2), "recovered")
+
+    def test_shared_executor_outlives_workers(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        sessions = [PrefetchWorker(executor=executor) for _ in range(3)]
+        for n, session in enumerate(sessions):
+            session.prefetch("k", lambda is_stale, n=n: n)
+        self.assertEqual([s.result("k", timeout=2) for s in sessions], [0, 1, 2])
+        sessions[0].shutdown()
+        self.assertEqual(executor.submit(lambda: "alive").result(timeout=2), "alive")
+        executor.shutdown()
+        print("Phase 7 Test Passed: Speculative prefetch verified.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import tempfile
+from phase7_serving.query_cache import QueryResultCache
+
+class TestQueryCache(unittest.TestCase):
+    def test_key_normalization(self):
+        a = QueryResultCache.make_key({'location': ' btm ', 'cuisine': 'Cafe, North Indian', 'rating': '4', 'price': 'MID'}, 'v1')
+        b = QueryResultCache.make_key({'location': 'BTM', 'cuisine': 'north indian,cafe', 'rating': 4.0, 'price': 'mid'}, 'v1')
+        c = QueryResultCache.make_key({'location': 'BTM', 'cuisine': 'north indian,cafe', 'rating': 4.0, 'price': 'mid'}, 'v2')
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_lru_and_ttl(self):
+        cache = QueryResultCache(max_entries=2, ttl_seconds=60)
+        cache.put('a', [1], {'n': 1})
+        cache.put('b', [2], {'n': 2})
+        cache.get('a')
+        cache.put('c', [3], {'n': 3})  # Evicts 'b', the least recently used
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a')['response'], {'n': 1})
+
+        cache.ttl_seconds = -1
+        cache.put('d', [4], {'n': 4})
+        self.assertIsNone(cache.get('d'))
+        stats = cache.snapshot_stats()
+        self.assertEqual((stats['evictions'], stats['expirations']), (2, 1))
+
+    def test_disk_tier_is_shared(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            QueryResultCache(disk_dir=disk_dir).put('k', [5, 6], {'ok': True})
+            other_worker = QueryResultCache(disk_dir=disk_dir)
+            entry = other_worker.get('k')
+            self.assertEqual(entry['row_ids'], [5, 6])
+            self.assertEqual(other_worker.snapshot_stats()['disk_hits'], 1)
+        print("Phase 7 Test Passed: Query result cache verified.")
+
+if __name__ == "__main__":
+    unittest.main()
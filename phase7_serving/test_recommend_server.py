@@ -0,0 +1,84 @@
+import asyncio
+import json
+import unittest
+from phase7_serving.fixtures import sample_df
+from phase7_serving.query_cache import QueryResultCache
+from phase7_serving.recommend_server import RecommendServer
+
+class TemplateEngine:
+    def explain(self, user_preferences, filtered_restaurants):
+        return {"text": f"Try {filtered_restaurants.iloc[0]['restaurant name']}.", "source": "template"}
+
+class TestRecommendServer(unittest.TestCase):
+    def exchange(self, server, requests):
+        """Sends (method, path, body) requests over one keep-alive connection; returns (status, payload) pairs."""
+        async def run():
+            srv = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+            port = srv.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for method, path, body in requests:
+                data = body.encode("utf-8")
+                writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+                status = int(head.split()[1])
+                length = int(head.lower().split("content-length:")[1].split("\r\n")[0])
+                responses.append((status, json.loads(await reader.readexactly(length))))
+            writer.close()
+            srv.close()
+            await srv.wait_closed()
+            return responses
+        return asyncio.run(run())
+
+    def raw(self, server, request):
+        """Sends raw request bytes and returns everything the server answers before closing."""
+        async def run():
+            srv = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+            reader, writer = await asyncio.open_connection("127.0.0.1", srv.sockets[0].getsockname()[1])
+            writer.write(request)
+            await writer.drain()
+            raw = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            srv.close()
+            await srv.wait_closed()
+            return raw.decode("utf-8")
+        return asyncio.run(run())
+
+    def test_recommend_health_and_errors(self):
+        server = RecommendServer(df=sample_df(), engine=TemplateEngine(), cache=QueryResultCache())
+        responses = self.exchange(server, [
+            ("POST", "/recommend", json.dumps({'cuisine': 'Cafe', 'rating': 4.0})),
+            ("POST", "/recommend", "{not json"),
+            ("POST", "/recommend", ""),
+            ("GET", "/health", ""),
+            ("GET", "/missing", ""),
+        ])
+
+        status, payload = responses[0]
+        self.assertEqual(status, 200)
+        self.assertEqual({r["name"] for r in payload["recommendations"]}, {"Cafe Mocha", "Truffles"})
+        self.assertEqual(payload["ai_source"], "template")
+
+        # Malformed and empty bodies are rejected without touching the pipeline, and the connection stays usable
+        self.assertEqual(responses[1][0], 400)
+        self.assertIn("Invalid JSON", responses[1][1]["error"])
+        self.assertEqual(responses[2], (400, {"error": "No input data received"}))
+
+        status, health = responses[3]
+        self.assertEqual(status, 200)
+        self.assertEqual(health["status"], "ok")
+        self.assertEqual(health["rows"], 3)
+        self.assertEqual(health["requests_served"], 1)
+        self.assertEqual(responses[4][0], 404)
+
+        # A bad Content-Length is answered with a 400 and the connection is closed
+        for length in ("abc", "-5"):
+            raw = self.raw(server, f"POST /recommend HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode("latin-1"))
+            self.assertTrue(raw.startswith("HTTP/1.1 400 "))
+            self.assertIn("Invalid Content-Length", raw)
+        server.executor.shutdown()
+        print("Phase 7 Test Passed: /recommend and /health routes verified.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import asyncio
+import json
+import unittest
+from phase7_serving.fixtures import sample_df
+from phase7_serving.query_cache import QueryResultCache
+from phase7_serving.recommend_server import RecommendServer
+
+class ChunkEngine:
+    def explain_stream(self, user_preferences, filtered_restaurants):
+        for chunk in ["Try ", "Cafe ", "Mocha."]:
+            yield {"text": chunk, "source": "llm"}
+
+class TestStreaming(unittest.TestCase):
+    def stream(self, server, preferences):
+        async def run():
+            srv = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+            port = srv.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = json.dumps(preferences).encode("utf-8")
+            writer.write(f"POST /recommend/stream HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+            raw = await reader.read()
+            writer.close()
+            srv.close()
+            await srv.wait_closed()
+            return raw.decode("utf-8")
+        raw = asyncio.run(run())
+        head, _, stream = raw.partition("\r\n\r\n")
+        self.assertIn("text/event-stream", head)
+        events = []
+        for block in stream.strip().split("\n\n"):
+            event, data = block.split("\n")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+        return events
+
+    def test_sse_events_in_order(self):
+        server = RecommendServer(df=sample_df(), engine=ChunkEngine(), cache=QueryResultCache())
+        events = self.stream(server, {'cuisine': 'Cafe', 'rating': 4.0})
+        names = [e for e, _ in events]
+        self.assertEqual(names, ["recommendations", "token", "token", "token", "done"])
+        self.assertEqual({r["name"] for r in events[0][1]["recommendations"]}, {"Cafe Mocha", "Truffles"})
+        self.assertEqual(events[-1][1]["ai_insight"], "Try Cafe Mocha.")
+
+        # A repeat is served from the result cache as a single token
+        repeat = self.stream(server, {'cuisine': 'Cafe', 'rating': 4.0})
+        self.assertEqual([e for e, _ in repeat], ["recommendations", "token", "done"])
+        self.assertEqual(repeat[-1][1], events[-1][1])
+        server.executor.shutdown()
+        print("Phase 7 Test Passed: SSE recommendation stream verified.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,20 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
-from phase2.recommender_core import filter_restaurants, get_trending_restaurants
-from phase4.ranking_engine import rank_restaurants
-from phase3.llm_engine import RecommendationEngine
+from concurrent.futures import ThreadPoolExecutor
+from phase2.recommender_core import get_trending_restaurants
+from phase2.indexes import get_cuisine_index
+from phase4.result_cube import load_result_cube, top_k_restaurants
+from phase3.llm_engine import get_shared_engine
+from phase3.blurb_store import load_blurb_store, restaurant_key
+from phase7_serving.prefetch import PrefetchWorker
 from dotenv import load_dotenv
 import streamlit.components.v1 as components
 import json
 import base64
-from phase5.kpt_engine import KPTEngine, get_kpt_confidence
+from phase5.kpt_engine import CONFIDENCE_LABELS, KPTEngine, get_kpt_confidence_batch
+from phase5.mpbs_store import MerchantReliabilityStore
 from phase5.shadow_kpt import ShadowKPTEstimator, fuse_kpt_signals
 import random
 from phase6_csao.csao_engine import CSAOEngine
@@ -403,8 +409,14 @@ st.markdown(f"""
 cols = st.columns([1, 4, 1.5], gap="large")
 
 # 0.5 Initialize KPT Engines
+@st.cache_resource
+def load_mpbs():
+    # Demo-only merchant reliability, shared by every session: the orders the cards simulate are
+    # random, so they stay in memory and never reach the persisted merchant_mpbs.npz
+    return MerchantReliabilityStore(path=None)
+
 if 'kpt_engine' not in st.session_state:
-    st.session_state.kpt_engine = KPTEngine()
+    st.session_state.kpt_engine = KPTEngine(mpbs_store=load_mpbs())
 if 'shadow_estimator' not in st.session_state:
     st.session_state.shadow_estimator = ShadowKPTEstimator()
 if 'csao_engine' not in st.session_state:
@@ -464,7 +476,19 @@ def render_csao_rail():
 
 # Initialize Recommendation Engine
 if 'ai_engine' not in st.session_state:
-    st.session_state.ai_engine = RecommendationEngine()
+    # One engine (and Groq connection pool) per process, shared by every session
+    st.session_state.ai_engine = get_shared_engine()
+
+@st.cache_resource
+def prefetch_executor():
+    # One prefetch thread pool per process; each session only keeps its own generation counter
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="prefetch")
+
+# How long the button waits for an in-flight prefetch before streaming the answer itself
+PREFETCH_GRACE_SECONDS = 0.5
+
+if 'prefetcher' not in st.session_state:
+    st.session_state.prefetcher = PrefetchWorker(executor=prefetch_executor())
 
 # Load and encode logo for header
 with open("assets/zomato_logo.png", "rb") as f:
@@ -578,35 +602,28 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # 4. SEARCH PILL
-@st.cache_data
+@st.cache_resource
 def load_data():
-    csv_path = "zomato_data.csv"
-    if not os.path.exists(csv_path):
-        try:
-            from phase1.data_loader import load_zomato_data_kaggle
-            return load_zomato_data_kaggle()
-        except: return None
-    # Use encoding='utf-8' or 'latin-1' and handle errors to fix the garbage text
+    # Memory-mapped snapshot first, CSV parse only on first run, Kaggle as last resort
     try:
-        return pd.read_csv(csv_path, encoding='utf-8')
-    except UnicodeDecodeError:
-        return pd.read_csv(csv_path, encoding='latin-1')
+        from phase1.data_loader import load_zomato_data
+        return load_zomato_data()
+    except: return None
 
-df = load_data()
+@st.cache_resource
+def load_cube(_df):
+    # Precomputed top-k for every dropdown combination (python -m phase4.result_cube)
+    return load_result_cube(_df)
 
-# Data Cleaning for display
-if df is not None:
-    # Fix the garbage characters like CafÃ© and other encoding artifacts
-    for col in ['restaurant name', 'cuisines type']:
-        if col in df.columns:
-            def clean_text(text):
-                if not isinstance(text, str): return text
-                try:
-                    if 'Ã' in text:
-                        return text.encode('latin-1').decode('utf-8')
-                except: pass
-                return text.replace('ï¿½', '').strip()
-            df[col] = df[col].apply(clean_text)
+@st.cache_resource
+def load_blurbs():
+    # Per-restaurant card descriptions (python phase3/precompute_blurbs.py)
+    return load_blurb_store()
+
+# Text repair and numeric coercion already happened once at ingest (phase1.normalize)
+df = load_data()
+result_cube = load_cube(df) if df is not None else None
+blurbs = load_blurbs()
 
 # Category Selection Logic
 if 'selected_category' not in st.session_state:
@@ -625,9 +642,7 @@ if df is not None:
     
     with s_cols[2]:
         # Dynamic Cuisine Discovery
-        all_cuisines = set()
-        df['cuisines type'].dropna().apply(lambda x: [all_cuisines.add(c.strip()) for c in x.split(',')])
-        sorted_cuisines = sorted(list(all_cuisines))
+        sorted_cuisines = get_cuisine_index(df).vocabulary
         
         # Override if category selected
         default_cuisine_idx = 0
@@ -646,6 +661,26 @@ if df is not None:
         rating_num = float(rating_val.replace("+", ""))
     
     st.markdown('</div>', unsafe_allow_html=True)
+
+    # Speculative prefetch: every filter change reruns the script, so start ranking and the LLM
+    # call for the current filters now; stale jobs stop at their next chunk and are discarded
+    prefetch_key = (location, cuisine, price_val, rating_num)
+    if st.session_state.logged_in and st.session_state.selected_category != "Trending":
+        def prefetch_job(is_stale, engine=st.session_state.ai_engine):
+            c_filter = None if cuisine == "All Cuisines" else cuisine
+            loc_query = None if location == "Any Location" else location
+            ranked = top_k_restaurants(df, 3, price=price_val, place=loc_query, rating=rating_num, cuisine=c_filter, cube=result_cube).to_frame()
+            if ranked.empty:
+                return {"ranked": ranked, "text": None}
+            text = ""
+            stream = engine.get_recommendations_stream(f"I'm looking for {cuisine} food in {location} with a {budget_label} budget.", ranked)
+            for chunk in stream:
+                if is_stale():
+                    stream.close()
+                    return None
+                text += chunk
+            return {"ranked": ranked, "text": text}
+        st.session_state.prefetcher.prefetch(prefetch_key, prefetch_job)
     
     st.markdown('<br>', unsafe_allow_html=True)
     btn_cols = st.columns([4, 1])
@@ -726,24 +761,36 @@ if df is not None:
         # Check if we should use cached results or run new ones
         if submit or st.session_state.selected_category == "Trending":
             with st.spinner("Zomato AI is analyzing the best matches for you..."):
+                prefetched = None
                 if st.session_state.selected_category == "Trending":
                     ranked_results = get_trending_restaurants(df, top_n=3)
                     filtered_df = ranked_results # To bypass empty check
                     user_query = "What are the hottest, highest-rated trending restaurants in Bangalore right now?"
                 else:
-                    c_filter = None if cuisine == "All Cuisines" else cuisine
-                    loc_query = None if location == "Any Location" else location
-                    
-                    filtered_df = filter_restaurants(df, price=price_val, place=loc_query, rating=rating_num, cuisine=c_filter)
-                    ranked_results = rank_restaurants(filtered_df).head(3)
+                    # Usually ready (or nearly) from the prefetch started when the filters changed
+                    prefetched = st.session_state.prefetcher.result(prefetch_key, timeout=PREFETCH_GRACE_SECONDS)
+                    if prefetched is not None:
+                        ranked_results = prefetched["ranked"]
+                    else:
+                        # Stop the still-running prefetch so the live stream below is the only LLM call
+                        st.session_state.prefetcher.cancel()
+                        c_filter = None if cuisine == "All Cuisines" else cuisine
+                        loc_query = None if location == "Any Location" else location
+                        ranked_results = top_k_restaurants(df, 3, price=price_val, place=loc_query, rating=rating_num, cuisine=c_filter, cube=result_cube).to_frame()
+                    filtered_df = ranked_results # Empty exactly when there are no matches
                     user_query = f"I'm looking for {cuisine} food in {location} with a {budget_label} budget."
                 
-                if not filtered_df.empty:
-                    # GET REAL AI INSIGHTS
-                    ai_expert_content = st.session_state.ai_engine.get_recommendations(user_query, ranked_results)
+                if not filtered_df.empty and prefetched is not None:
+                    ai_expert_content = prefetched["text"]
+                    st.session_state.last_ai_content = ai_expert_content
+                    st.session_state.last_results = ranked_results
+                    st.session_state.last_query_title = "Expert AI Match Score"
+                elif not filtered_df.empty:
+                    # GET REAL AI INSIGHTS (streamed into the insight box below as tokens arrive)
+                    ai_stream = st.session_state.ai_engine.get_recommendations_stream(user_query, ranked_results)
+                    ai_expert_content = None
                     # PERSIST FOR RERUNS (Add to Cart logic)
                     st.session_state.last_results = ranked_results
-                    st.session_state.last_ai_content = ai_expert_content
                     st.session_state.last_query_title = "🔥 Trending Now" if st.session_state.selected_category == "Trending" else "Expert AI Match Score"
         else:
             # Load from Session State
@@ -762,15 +809,30 @@ if df is not None:
             
             _, ai_box_col, _ = st.columns([0.1, 5, 0.1])
             with ai_box_col:
-                st.markdown(f"""
+                def ai_box_html(text):
+                    return f"""
                 <div style="background: {'rgba(255, 87, 34, 0.1)' if is_dark else '#f0f7ff'}; 
                             padding: 30px; border-radius: 20px; border: 1px solid var(--border-color); 
                             border-left: 8px solid var(--zomato-red); margin-bottom: 40px;">
                     <span style="font-size: 24px; margin-right: 15px;">🤖</span> 
                     <span style="color: var(--text-main); font-weight: 700; font-size: 18px;">{'AI Trend Analysis:' if st.session_state.selected_category == 'Trending' else 'Personalized Concierge Insight:'}</span>
-                    <p style="color: var(--text-main); line-height: 1.6; margin-top: 15px; font-size: 16px;">{ai_expert_content[:450]}...</p>
+                    <p style="color: var(--text-main); line-height: 1.6; margin-top: 15px; font-size: 16px;">{text[:450]}...</p>
                 </div>
-                """, unsafe_allow_html=True)
+                """
+
+                ai_box = st.empty()
+                if ai_expert_content is None:
+                    # Time-to-first-token is what the user waits for; the rest fills in live
+                    ai_expert_content = ""
+                    for chunk in ai_stream:
+                        ai_expert_content += chunk
+                        ai_box.markdown(ai_box_html(ai_expert_content), unsafe_allow_html=True)
+                        if len(ai_expert_content) > 450:
+                            # Only the first 450 characters are shown; finish the stream without redrawing
+                            ai_expert_content += "".join(ai_stream)
+                            break
+                    st.session_state.last_ai_content = ai_expert_content
+                ai_box.markdown(ai_box_html(ai_expert_content), unsafe_allow_html=True)
                 
                 res_cols = st.columns(3, gap="medium")
                 # Verified high-quality food photography IDs from Unsplash
@@ -782,24 +844,34 @@ if df is not None:
                     "photo-1565299624946-b28f40a0ae38", # Pizza
                     "photo-1482049016688-2d3e1b311543"  # Sandwich
                 ]
+
+                # --- PHASE 5: KPT SIGNAL SIMULATION (all cards in one batch call) ---
+                # Simulate real-time kitchen stress: 2-8 active orders of random complexity per restaurant
+                n_cards = len(ranked_results)
+                kpt_engine = st.session_state.kpt_engine
+                complexity_counts = np.array([np.bincount([random.randrange(3) for _ in range(random.randint(2, 8))], minlength=3)
+                                              for _ in range(n_cards)])
+                card_kli = kpt_engine.calculate_kli_batch(complexity_counts, [random.uniform(0.8, 1.4) for _ in range(n_cards)])
+                # On a fresh search, simulate one completed order per merchant (rider picks up 2 min before
+                # to 12 min after the manual 'Ready' mark); redisplays (e.g. Add to Cart) only read the live,
+                # exponentially weighted MPBS back
+                merchant_ids = [restaurant_key(name, area) for name, area in zip(ranked_results['restaurant name'], ranked_results['area'])]
+                if submit:
+                    now = pd.Timestamp.now()
+                    for merchant_id in merchant_ids:
+                        kpt_engine.mpbs_store.record_order(merchant_id, now, now + pd.Timedelta(minutes=random.uniform(-2, 12)))
+                card_mpbs = kpt_engine.mpbs_store.scores_for(merchant_ids)
+                # Predict KPT from a 20 minute base prep time
+                card_kpt = kpt_engine.predict_kpt_batch(np.full(n_cards, 20.0), card_kli, merchant_ids=merchant_ids)
+                card_confidence = CONFIDENCE_LABELS[get_kpt_confidence_batch(card_mpbs, card_kli)]
                 
                 for idx, (_, row) in enumerate(ranked_results.iterrows()):
                     # Create a robust URL with auto-formatting and compression
                     photo_id = food_photo_ids[idx % len(food_photo_ids)]
                     img_url = f"https://images.unsplash.com/{photo_id}?auto=format&fit=crop&w=600&h=400&q=80"
                     
-                    # --- PHASE 5: KPT SIGNAL SIMULATION ---
-                    # Simulate real-time kitchen stress for this restaurant
-                    mock_orders = [{'complexity': random.choice(['Simple', 'Medium', 'Complex'])} for _ in range(random.randint(2, 8))]
-                    kli = st.session_state.kpt_engine.calculate_kli(mock_orders, historical_rush_factor=random.uniform(0.8, 1.4))
-                    
-                    # Simulate merchant reliability (0.6 - 1.0)
-                    mpbs = random.uniform(0.65, 0.95)
-                    
-                    # Predict KPT
-                    base_prep = 20.0
-                    predicted_kpt = st.session_state.kpt_engine.predict_kpt(base_prep, kli, mpbs)
-                    confidence = get_kpt_confidence(mpbs, kli)
+                    kli, mpbs, predicted_kpt = float(card_kli[idx]), float(card_mpbs[idx]), float(card_kpt[idx])
+                    confidence = card_confidence[idx]
                     
                     # Shadow Ground Truth simulation
                     shadow_bias = random.uniform(-5, 2) # Minutes
@@ -813,6 +885,9 @@ if df is not None:
                     dot_class = "dot-green" if kli < 8 else ("dot-amber" if kli < 15 else "dot-red")
                     health_status = "Good" if kli < 8 else ("Busy" if kli < 15 else "Stressed")
 
+                    blurb = blurbs.get(row['restaurant name'], row['area']) if blurbs is not None else None
+                    blurb_html = f'<div style="color: var(--text-main); font-size: 14px; line-height: 1.5; margin-bottom: 16px;">{blurb["text"]}</div>' if blurb else ""
+
                     with res_cols[idx]:
                         st.markdown(f"""
 <div class="res-card">
@@ -827,6 +902,7 @@ if df is not None:
     <div style="color: var(--text-sub); font-size: 13px;">{row['area']} • ₹{row['avg cost (two people)']} for two</div>
     <a href="https://www.google.com/maps/search/?api=1&query={row['restaurant name'].replace(' ', '+')}+{row['area'].replace(' ', '+')}" target="_blank" style="color: #4285F4; text-decoration: none; font-size: 12px; font-weight: 600;">📍 View on Maps</a>
 </div>
+{blurb_html}
 <div class="kpt-badge {health_class}">
 <span class="signal-dot {dot_class}"></span>
 Kitchen Status: {health_status}
@@ -1,35 +1,59 @@
 import { NextResponse } from 'next/server';
-import { execSync } from 'child_process';
+import { execFile } from 'child_process';
 import path from 'path';
 
+// Warm Python service (python -m phase7_serving.recommend_server)
+const RECOMMENDER_URL = process.env.RECOMMENDER_URL || 'http://127.0.0.1:8765';
+
+async function recommendViaServer(body) {
+    const res = await fetch(`${RECOMMENDER_URL}/recommend`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body),
+    });
+    return res.json();
+}
+
+// Fallback: spawn the master recommender script without blocking the event loop
+function recommendViaScript(body) {
+    const cwd = path.join(process.cwd(), '..');
+    return new Promise((resolve, reject) => {
+        const child = execFile('python', ['main_recommender.py'], { cwd: cwd, encoding: 'utf-8' }, (error, stdout) => {
+            if (error) return reject(error);
+            try {
+                resolve(JSON.parse(stdout));
+            } catch (parseError) {
+                reject(parseError);
+            }
+        });
+        child.stdin.end(JSON.stringify(body));
+    });
+}
+
 export async function POST(request) {
     const body = await request.json();
 
     try {
-        // Path to the master recommender script
-        const scriptPath = path.join(process.cwd(), '..', 'main_recommender.py');
-        const cwd = path.join(process.cwd(), '..');
-
-        // Execute the Python script and pass preferences as JSON via stdin
-        const inputJson = JSON.stringify(body);
-        const output = execSync(`python main_recommender.py`, {
-            cwd: cwd,
-            input: inputJson,
-            encoding: 'utf-8'
-        });
-
-        const result = JSON.parse(output);
+        let result;
+        try {
+            result = await recommendViaServer(body);
+        } catch (serverError) {
+            console.warn("Recommender server unreachable, falling back to script:", serverError.message);
+            result = await recommendViaScript(body);
+        }
 
         if (result.error) {
             return NextResponse.json({ error: result.error }, { status: 500 });
         }
 
-        // Map AI insight to individual recommendations for better UI display
-        if (result.ai_insight && !result.ai_insight.startsWith("Error")) {
-            result.recommendations = result.recommendations.map(res => ({
-                ...res,
-                description: result.ai_insight.slice(0, 200) + "..." // Simplified mapping for now
-            }));
+        // Cards carry precomputed per-restaurant blurbs; only cards without one fall back to the overall insight.
+        // `ai_source` ("llm" | "cache" | "semantic" | "fallback") says which path served the insight.
+        if (result.ai_insight) {
+            result.recommendations = result.recommendations.map(res => (
+                res.description_source === 'placeholder'
+                    ? { ...res, description: result.ai_insight.slice(0, 200) + "..." }
+                    : res
+            ));
         }
 
         return NextResponse.json(result);
@@ -0,0 +1,32 @@
+import { NextResponse } from 'next/server';
+
+// Warm Python service (python -m phase7_serving.recommend_server)
+const RECOMMENDER_URL = process.env.RECOMMENDER_URL || 'http://127.0.0.1:8765';
+
+// Proxies the server's Server-Sent Events stream: `recommendations`, then `token` chunks, then `done`
+export async function POST(request) {
+    const body = await request.json();
+
+    try {
+        const res = await fetch(`${RECOMMENDER_URL}/recommend/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body),
+        });
+        if (!res.ok) {
+            return NextResponse.json(await res.json(), { status: res.status });
+        }
+        return new Response(res.body, {
+            headers: {
+                'Content-Type': 'text/event-stream',
+                'Cache-Control': 'no-cache',
+            },
+        });
+    } catch (error) {
+        console.error("Streaming Backend Error:", error);
+        return NextResponse.json({
+            error: "Streaming requires the recommender server; use /api/recommend instead.",
+            details: error.message
+        }, { status: 503 });
+    }
+}